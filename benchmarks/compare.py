@@ -0,0 +1,57 @@
+import argparse
+import json
+
+# Side-by-side medians of two benchmark result files
+#
+#   python -m benchmarks.compare benchmarks/results/old.json benchmarks/results/new.json
+
+
+def flatten(scenarios, prefix=''):
+    # Nested results (search terms, grid stages) become "search.nik_prefix"
+    medians = {}
+    for name, result in scenarios.items():
+        if not isinstance(result, dict):
+            continue
+        if 'median' in result:
+            medians[prefix + name] = result['median']
+        else:
+            medians.update(flatten(result, f"{prefix}{name}."))
+    return medians
+
+
+def milliseconds(seconds):
+    return "-" if seconds is None else f"{seconds * 1000:.2f}ms"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare two benchmark runs")
+    parser.add_argument('baseline')
+    parser.add_argument('candidate')
+    parser.add_argument('--threshold', type=float, default=10.0,
+                        help="percent change reported as faster/slower")
+    args = parser.parse_args()
+
+    with open(args.baseline, encoding='utf-8') as file:
+        baseline = json.load(file)
+    with open(args.candidate, encoding='utf-8') as file:
+        candidate = json.load(file)
+
+    old = flatten(baseline['scenarios'])
+    new = flatten(candidate['scenarios'])
+    width = max((len(name) for name in old.keys() | new.keys()), default=10)
+
+    print(f"{'scenario':<{width}}  {'baseline':>12}  {'candidate':>12}  {'change':>8}")
+    for name in sorted(old.keys() | new.keys()):
+        line = f"{name:<{width}}  {milliseconds(old.get(name)):>12}  {milliseconds(new.get(name)):>12}"
+        if name in old and name in new and old[name]:
+            change = (new[name] - old[name]) / old[name] * 100
+            line += f"  {change:>+7.1f}%"
+            if change <= -args.threshold:
+                line += "  faster"
+            elif change >= args.threshold:
+                line += "  SLOWER"
+        print(line)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+import argparse
+import csv
+import random
+from datetime import date, timedelta
+
+# Synthetic customers in the import CSV format (nik;name;born;active;salary).
+# The same size and seed always produce the same file.
+#
+#   python -m benchmarks.generate --size 1m --output customers-1m.csv
+
+SIZES = {
+    '10k': 10_000,
+    '1m': 1_000_000,
+    '10m': 10_000_000,
+}
+DEFAULT_SEED = 42
+
+FIRST_NAMES = [
+    'Budi', 'Siti', 'Agus', 'Dewi', 'Rangga', 'Putri', 'Andi', 'Rina', 'Joko', 'Wati',
+    'Bambang', 'Sri', 'Eko', 'Lestari', 'Hendra', 'Maya', 'Rudi', 'Indah', 'Fajar', 'Ayu',
+]
+LAST_NAMES = [
+    'Santoso', 'Wijaya', 'Saputra', 'Pratama', 'Hidayat', 'Kusuma', 'Nugroho', 'Setiawan',
+    'Siregar', 'Lubis', 'Hasibuan', 'Simanjuntak', 'Gunawan', 'Halim', 'Sutanto', 'Wibowo',
+]
+BORN_FROM = date(1950, 1, 1)
+BORN_DAYS = 365 * 55
+
+
+def parse_size(size):
+    if size.lower() in SIZES:
+        return SIZES[size.lower()]
+    return int(size)
+
+
+def generate_rows(count, seed=DEFAULT_SEED):
+    rng = random.Random(seed)
+    for i in range(count):
+        yield (
+            f"{i % 1_000_000:06d}",
+            f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+            (BORN_FROM + timedelta(days=rng.randrange(BORN_DAYS))).isoformat(),
+            1 if rng.random() < 0.8 else 0,
+            rng.randrange(3_000_000, 50_000_000, 1000),
+        )
+
+
+def write_csv(file_path, count, seed=DEFAULT_SEED):
+    with open(file_path, 'w', encoding='utf-8', newline='') as file:
+        csv_writer = csv.writer(file, delimiter=';')
+        csv_writer.writerow(['nik', 'name', 'born', 'active', 'salary'])
+        csv_writer.writerows(generate_rows(count, seed))
+    return count
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic customer CSV")
+    parser.add_argument('--size', default='10k', help="10k, 1m, 10m or a row count")
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED)
+    parser.add_argument('--output', required=True)
+    args = parser.parse_args()
+
+    count = write_csv(args.output, parse_size(args.size), args.seed)
+    print(f"Wrote {count} customers to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,293 @@
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+from benchmarks.generate import DEFAULT_SEED, parse_size, write_csv
+from config.database import DatabaseConfig
+from config.instrumentation import instrumentation
+from models.customer import Customer, PAGE_FIRST, PAGE_LAST
+from models.customer_import import IMPORT_BATCHED, IMPORT_PIPELINE, IMPORT_LOAD_DATA
+from models.customer_snapshot import SORT_COLUMNS
+from models.import_checkpoint import CheckpointStore
+
+# Timed scenarios against a scratch database. Point DB_HOST, DB_PORT,
+# DB_NAME, DB_USER and DB_PASSWORD at a local MySQL-compatible server, or set
+# DB_BACKEND=sqlite and DB_PATH to a file; the customer table there is dropped
+# and recreated, so the database name or path must contain "bench" unless
+# --force is given.
+#
+#   DB_NAME=customer_bench python -m benchmarks.run --size 1m
+#   DB_BACKEND=sqlite DB_PATH=/tmp/bench.db python -m benchmarks.run --size 1m
+#   python -m benchmarks.compare old.json new.json
+
+SCENARIOS = [
+    'import_batched', 'import_pipeline', 'import_load_data',
+    'page_shallow_offset', 'page_deep_offset', 'page_shallow_keyset', 'page_deep_keyset',
+    'search', 'export_csv', 'export_csv_gz', 'grid_render', 'snapshot',
+]
+IMPORT_METHODS = {
+    'import_batched': IMPORT_BATCHED,
+    'import_pipeline': IMPORT_PIPELINE,
+    'import_load_data': IMPORT_LOAD_DATA,
+}
+SEARCH_TERMS = {
+    'nik_prefix': 'nik:12345',
+    'name_fulltext': 'budi santoso',
+    'born_year': 'born:1990',
+    'salary_range': 'salary:10000000..12000000',
+    'combined': 'name:siti active:1 born>1980',
+}
+GRID_ROWS = 1000
+PER_PAGE = 10
+
+
+def summarize(runs):
+    ordered = sorted(runs)
+    return {
+        'runs': runs,
+        'min': ordered[0],
+        'median': statistics.median(ordered),
+        'mean': statistics.fmean(ordered),
+        'p95': ordered[min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))],
+        'max': ordered[-1],
+    }
+
+
+def timed(fn, repeat, setup=None):
+    runs = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        fn()
+        runs.append(time.perf_counter() - start)
+    return summarize(runs)
+
+
+def execute(db_config, *statements):
+    connection = db_config.get_connection()
+    if not connection:
+        raise SystemExit("No database connection; check the DB_* environment variables")
+    cursor = connection.cursor()
+    try:
+        for statement in statements:
+            cursor.execute(statement)
+        connection.commit()
+    finally:
+        cursor.close()
+        db_config.release_connection(connection)
+
+
+def reset_table(customer):
+    execute(customer.db_config, "DROP TABLE IF EXISTS customer", customer.backend.customer_table)
+    customer.query_cache.invalidate()
+
+
+def seed(customer, csv_path):
+    reset_table(customer)
+    result = customer.import_from_csv(csv_path, method=IMPORT_LOAD_DATA)
+    customer.create_search_indexes()
+    return result
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def grid_render(customer, repeat):
+    # Formatting every cell through the model, and painting a window-sized
+    # view offscreen, for the first GRID_ROWS customers
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    try:
+        from PyQt6.QtCore import Qt
+        from PyQt6.QtWidgets import QApplication, QTableView
+    except ImportError:
+        return {'skipped': "PyQt6 not installed"}
+    from views.customer_table_model import CustomerTableModel
+
+    app = QApplication.instance() or QApplication([])
+    rows = []
+    for record in customer.iter_customers():
+        rows.append(record)
+        if len(rows) >= GRID_ROWS:
+            break
+
+    model = CustomerTableModel()
+    view = QTableView()
+    view.setModel(model)
+    view.resize(1200, 700)
+
+    def format_cells():
+        for row in range(model.rowCount()):
+            for column in range(model.columnCount()):
+                model.data(model.index(row, column), Qt.ItemDataRole.DisplayRole)
+
+    def paint():
+        view.grab()
+        app.processEvents()
+
+    return {
+        'set_rows': timed(lambda: model.set_rows(rows), repeat),
+        'format_cells': timed(format_cells, repeat),
+        'paint': timed(paint, repeat),
+        'rows': len(rows),
+    }
+
+
+def snapshot_queries(customer, repeat):
+    # Snapshot mode: one full load, each column's first sort (an argsort) and
+    # later sorts from the kept order, and the search terms as in-memory filters
+    if not customer.snapshot.available:
+        return {'skipped': "NumPy not installed"}
+    snapshot = customer.snapshot
+
+    def first_page(search_term="", sort_column='idx'):
+        return customer.get_snapshot_rows(0, PER_PAGE, search_term, sort_column)
+
+    results = {
+        'load': timed(customer.load_snapshot, 1, setup=customer.drop_snapshot),
+        'sort_first': {column: timed(lambda column=column: first_page("", column), 1)
+                       for column in SORT_COLUMNS},
+        'sort_cached': {column: timed(lambda column=column: first_page("", column), repeat,
+                                      setup=snapshot.clear_views)
+                        for column in SORT_COLUMNS},
+        'search': {label: timed(lambda term=term: first_page(term), repeat, setup=snapshot.clear_views)
+                   for label, term in SEARCH_TERMS.items()},
+        'memory_mb': snapshot.stats()['memory_mb'],
+    }
+    customer.drop_snapshot()
+    return results
+
+
+def run_scenarios(customer, names, csv_path, repeat, import_repeat, work_dir):
+    results = {}
+    clear_cache = customer.query_cache.invalidate
+
+    for name in names:
+        if name not in IMPORT_METHODS:
+            continue
+        print(f"Running {name}...")
+        method = IMPORT_METHODS[name]
+        results[name] = timed(
+            lambda: customer.import_from_csv(csv_path, method=method),
+            import_repeat, setup=lambda: reset_table(customer)
+        )
+
+    # Everything else runs against a freshly loaded, indexed table
+    print("Seeding table...")
+    seed(customer, csv_path)
+    total = customer.get_all_customers(1, PER_PAGE)[1]
+    last_page = max(1, -(-total // PER_PAGE))
+
+    scenarios = {
+        'page_shallow_offset': lambda: customer.get_all_customers(1, PER_PAGE),
+        'page_deep_offset': lambda: customer.get_all_customers(last_page, PER_PAGE),
+        'page_shallow_keyset': lambda: customer.get_customers_keyset(PER_PAGE, "", PAGE_FIRST),
+        'page_deep_keyset': lambda: customer.get_customers_keyset(PER_PAGE, "", PAGE_LAST),
+        'export_csv': lambda: customer.export_to_file(os.path.join(work_dir, 'export.csv'), 'csv'),
+        'export_csv_gz': lambda: customer.export_to_file(os.path.join(work_dir, 'export.csv.gz'), 'csv.gz'),
+    }
+    for name in names:
+        if name in scenarios:
+            print(f"Running {name}...")
+            results[name] = timed(scenarios[name], repeat, setup=clear_cache)
+        elif name == 'search':
+            print("Running search...")
+            results[name] = {
+                label: timed(lambda term=term: customer.get_all_customers(1, PER_PAGE, term),
+                             repeat, setup=clear_cache)
+                for label, term in SEARCH_TERMS.items()
+            }
+        elif name == 'grid_render':
+            print("Running grid_render...")
+            results[name] = grid_render(customer, repeat)
+        elif name == 'snapshot':
+            print("Running snapshot...")
+            results[name] = snapshot_queries(customer, repeat)
+    return results, total
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Customer app performance benchmarks")
+    parser.add_argument('--size', default='10k', help="10k, 1m, 10m or a row count")
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED)
+    parser.add_argument('--scenarios', default=','.join(SCENARIOS),
+                        help="comma separated subset of: " + ', '.join(SCENARIOS))
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--import-repeat', type=int, default=1)
+    parser.add_argument('--data-dir', default=tempfile.gettempdir(),
+                        help="where generated CSV files are kept and reused")
+    parser.add_argument('--output', help="JSON results file (default: benchmarks/results/...)")
+    parser.add_argument('--force', action='store_true',
+                        help="run even if the database name or path does not contain 'bench'")
+    args = parser.parse_args()
+
+    names = [name.strip() for name in args.scenarios.split(',') if name.strip()]
+    unknown = set(names) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+
+    db_config = DatabaseConfig()
+    if 'bench' not in db_config.describe().lower() and not args.force:
+        parser.error(f"refusing to drop the customer table in '{db_config.describe()}'; "
+                     "point DB_NAME or DB_PATH at a scratch database or pass --force")
+
+    count = parse_size(args.size)
+    csv_path = os.path.join(args.data_dir, f"customers-{count}-{args.seed}.csv")
+    if not os.path.exists(csv_path):
+        print(f"Generating {count} customers into {csv_path}...")
+        write_csv(csv_path, count, args.seed)
+
+    customer = Customer()
+    with tempfile.TemporaryDirectory() as work_dir:
+        # Keep benchmark checkpoints out of the user's checkpoint directory
+        customer.checkpoints = CheckpointStore(work_dir)
+        results, total = run_scenarios(customer, names, csv_path, args.repeat, args.import_repeat, work_dir)
+
+    started = datetime.now()
+    report = {
+        'meta': {
+            'timestamp': started.isoformat(timespec='seconds'),
+            'size': args.size,
+            'rows': count,
+            'rows_in_table': total,
+            'seed': args.seed,
+            'repeat': args.repeat,
+            'import_repeat': args.import_repeat,
+            'git_commit': git_commit(),
+            'python': sys.version.split()[0],
+            'platform': platform.platform(),
+            'database': db_config.describe(),
+            'pool': customer.pool_stats(),
+            'cache': customer.cache_stats(),
+            'statements': customer.statement_stats(),
+            'instrumentation': instrumentation.snapshot(),
+        },
+        'scenarios': results,
+    }
+
+    output = args.output or os.path.join(
+        os.path.dirname(os.path.abspath(__file__)), 'results',
+        f"{started:%Y%m%d-%H%M%S}-{args.size}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as file:
+        json.dump(report, file, indent=2, default=str)
+    print(f"Results written to {output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,257 @@
+import os
+import re
+import sqlite3
+from datetime import date
+from functools import lru_cache
+
+try:
+    import mysql.connector
+    from mysql.connector import Error as MySQLError
+except ImportError:  # Only the MySQL backend needs the connector
+    mysql = None
+    MySQLError = None
+
+# Catch this instead of a driver's own error class
+DatabaseError = (sqlite3.Error,) if MySQLError is None else (MySQLError, sqlite3.Error)
+
+DEFAULT_SQLITE_PATH = os.path.join(os.path.expanduser('~'), '.customer_app', 'customers.db')
+
+# A backend covers connecting and the few statements that differ between
+# databases. The models write MySQL-flavoured SQL with %s placeholders; the
+# SQLite backend's cursors translate it.
+
+
+class MySQLBackend:
+    name = 'mysql'
+    supports_fulltext = True
+    supports_load_data = True
+
+    # Birth date as text, for the substring LIKE search
+    born_text = "DATE_FORMAT(born, '%Y-%m-%d')"
+    born_year = "YEAR(born)"
+    # Needs the unique NIK index to update instead of insert
+    upsert_suffix = """
+        ON DUPLICATE KEY UPDATE
+            name = VALUES(name), born = VALUES(born),
+            active = VALUES(active), salary = VALUES(salary)
+    """
+    search_indexes = [
+        "CREATE INDEX idx_customer_nik ON customer (nik)",
+        "CREATE INDEX idx_customer_name ON customer (name)",
+        "CREATE INDEX idx_customer_born ON customer (born)",
+        "CREATE INDEX idx_customer_salary ON customer (salary)",
+        "CREATE FULLTEXT INDEX ft_customer_name ON customer (name)",
+    ]
+    unique_nik_index = "CREATE UNIQUE INDEX uq_customer_nik ON customer (nik)"
+    customer_table = """
+        CREATE TABLE IF NOT EXISTS customer (
+            idx INT NOT NULL AUTO_INCREMENT PRIMARY KEY,
+            nik VARCHAR(6) NOT NULL,
+            name VARCHAR(50) NOT NULL,
+            born DATE NULL,
+            active TINYINT NOT NULL DEFAULT 0,
+            salary INT NOT NULL DEFAULT 0
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+    """
+    # LOAD DATA target for bulk imports. No secondary indexes: LIKE customer
+    # would copy the FULLTEXT index, which temporary tables reject, and the
+    # unique NIK index, which would drop duplicates before the merge's rules.
+    staging_table = """
+        CREATE TEMPORARY TABLE customer_staging (
+            idx INT NOT NULL AUTO_INCREMENT PRIMARY KEY,
+            nik VARCHAR(6) NOT NULL,
+            name VARCHAR(50) NOT NULL,
+            born DATE NULL,
+            active TINYINT NOT NULL DEFAULT 0,
+            salary INT NOT NULL DEFAULT 0
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+    """
+
+    def describe(self, config):
+        return f"mysql://{config.user}@{config.host}:{config.port}/{config.database}"
+
+    def connect(self, config):
+        if mysql is None:
+            raise RuntimeError("mysql-connector-python is not installed")
+
+        options = dict(
+            host=config.host,
+            database=config.database,
+            user=config.user,
+            password=config.password,
+            port=config.port
+        )
+        if config.local_infile_dir:
+            options['allow_local_infile_in_path'] = config.local_infile_dir
+
+        try:
+            return mysql.connector.connect(**options)
+        except AttributeError:
+            # Connector older than 8.0.22 without allow_local_infile_in_path
+            if 'allow_local_infile_in_path' not in options:
+                raise
+            config.local_infile_dir = None
+            del options['allow_local_infile_in_path']
+            return mysql.connector.connect(**options)
+
+    @staticmethod
+    def prepared_cursor(connection):
+        # Server-side prepared statement, re-executed with new parameters
+        return connection.cursor(prepared=True)
+
+    @staticmethod
+    def ping(connection):
+        try:
+            connection.ping(reconnect=False)
+            return True
+        except MySQLError:
+            return False
+
+    @staticmethod
+    def has_unique_nik_index(cursor):
+        # Any unique index on exactly (nik); composite ones do not stop duplicates
+        cursor.execute("SHOW INDEX FROM customer WHERE Non_unique = 0")
+        columns = {}
+        for row in cursor.fetchall():
+            # Key_name and Column_name are the third and fifth columns
+            columns.setdefault(row[2], []).append(row[4])
+        return ['nik'] in columns.values()
+
+    @staticmethod
+    def is_duplicate_key(error):
+        # ER_DUP_ENTRY: a unique index rejected the row
+        return getattr(error, 'errno', None) == 1062
+
+
+_LIKE_PARAM_RE = re.compile(r'LIKE\s+%s', re.IGNORECASE)
+
+
+@lru_cache(maxsize=512)
+def sqlite_query(query):
+    # ? placeholders, and an explicit escape character for LIKE since SQLite
+    # has none by default (the models escape patterns with a backslash)
+    return _LIKE_PARAM_RE.sub(r"LIKE ? ESCAPE '\\'", query).replace('%s', '?')
+
+
+class SQLiteCursor(sqlite3.Cursor):
+    def execute(self, query, params=()):
+        return super().execute(sqlite_query(query), params)
+
+    def executemany(self, query, seq_of_params):
+        return super().executemany(sqlite_query(query), seq_of_params)
+
+
+class SQLiteConnection(sqlite3.Connection):
+    def cursor(self, factory=SQLiteCursor):
+        return super().cursor(factory)
+
+    def is_connected(self):
+        # The pool's liveness check, named as in mysql.connector
+        try:
+            self.total_changes
+            return True
+        except sqlite3.ProgrammingError:
+            return False
+
+
+# DATE columns come back as datetime.date, as they do from MySQL
+sqlite3.register_adapter(date, date.isoformat)
+sqlite3.register_converter('DATE', lambda value: date.fromisoformat(value.decode()))
+
+
+class SQLiteBackend:
+    # An embedded local store: no server, same paging, search, import and
+    # export. Names are searched with LIKE (no FULLTEXT) and imports use
+    # batched inserts (no LOAD DATA).
+    name = 'sqlite'
+    supports_fulltext = False
+    supports_load_data = False
+
+    born_text = "born"  # Stored as YYYY-MM-DD text already
+    born_year = "CAST(strftime('%Y', born) AS INTEGER)"
+    upsert_suffix = """
+        ON CONFLICT (nik) DO UPDATE SET
+            name = excluded.name, born = excluded.born,
+            active = excluded.active, salary = excluded.salary
+    """
+    search_indexes = [
+        "CREATE INDEX IF NOT EXISTS idx_customer_nik ON customer (nik)",
+        "CREATE INDEX IF NOT EXISTS idx_customer_name ON customer (name)",
+        "CREATE INDEX IF NOT EXISTS idx_customer_born ON customer (born)",
+        "CREATE INDEX IF NOT EXISTS idx_customer_salary ON customer (salary)",
+    ]
+    unique_nik_index = "CREATE UNIQUE INDEX IF NOT EXISTS uq_customer_nik ON customer (nik)"
+    customer_table = """
+        CREATE TABLE IF NOT EXISTS customer (
+            idx INTEGER PRIMARY KEY AUTOINCREMENT,
+            nik VARCHAR(6) NOT NULL,
+            name VARCHAR(50) NOT NULL,
+            born DATE NULL,
+            active INTEGER NOT NULL DEFAULT 0,
+            salary INTEGER NOT NULL DEFAULT 0
+        )
+    """
+
+    def describe(self, config):
+        return f"sqlite:///{os.path.abspath(config.sqlite_path)}"
+
+    def connect(self, config):
+        directory = os.path.dirname(os.path.abspath(config.sqlite_path))
+        os.makedirs(directory, exist_ok=True)
+
+        # Pooled connections move between threads, one thread at a time
+        connection = sqlite3.connect(
+            config.sqlite_path,
+            timeout=config.pool_timeout,
+            detect_types=sqlite3.PARSE_DECLTYPES,
+            check_same_thread=False,
+            factory=SQLiteConnection
+        )
+        # WAL lets the grid read while an import writes
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.execute(self.customer_table)
+        connection.commit()
+        return connection
+
+    @staticmethod
+    def prepared_cursor(connection):
+        # sqlite3 keeps compiled statements per connection already; a reused
+        # cursor just skips creating a new one
+        return connection.cursor()
+
+    @staticmethod
+    def ping(connection):
+        try:
+            connection.execute("SELECT 1")
+            return True
+        except sqlite3.Error:
+            return False
+
+    @staticmethod
+    def has_unique_nik_index(cursor):
+        cursor.execute("PRAGMA index_list(customer)")
+        unique = [row[1] for row in cursor.fetchall() if row[2]]
+        for name in unique:
+            cursor.execute(f"PRAGMA index_info('{name}')")
+            if [row[2] for row in cursor.fetchall()] == ['nik']:
+                return True
+        return False
+
+    @staticmethod
+    def is_duplicate_key(error):
+        return isinstance(error, sqlite3.IntegrityError) and 'UNIQUE' in str(error)
+
+
+BACKENDS = {
+    MySQLBackend.name: MySQLBackend,
+    SQLiteBackend.name: SQLiteBackend,
+}
+DEFAULT_BACKEND = MySQLBackend.name
+
+
+def get_backend(name):
+    try:
+        return BACKENDS[name.lower()]()
+    except KeyError:
+        raise ValueError(f"unknown database backend: {name}") from None
@@ -1,24 +1,296 @@
-import mysql.connector
-from mysql.connector import Error
+import os
+import tempfile
+import threading
+import time
+from collections import deque
+
+from config.backends import DEFAULT_BACKEND, DEFAULT_SQLITE_PATH, DatabaseError, get_backend
+from config.instrumentation import (
+    DEFAULT_SLOW_QUERY_LOG, DEFAULT_SLOW_QUERY_THRESHOLD, InstrumentedConnection, instrumentation
+)
+
+
+class PoolTimeoutError(Exception):
+    pass
+
+
+class ConnectionPool:
+    def __init__(self, connect, max_size=5, timeout=10, idle_timeout=300,
+                 health_check_interval=30, validate=None):
+        self._connect = connect
+        self._validate = validate
+        self.max_size = max_size
+        self.timeout = timeout
+        self.idle_timeout = idle_timeout
+        self.health_check_interval = health_check_interval
+
+        self._lock = threading.Condition()
+        self._idle = deque()  # (connection, last_used) pairs, most recently used on the right
+        self._checked_out = 0
+        self._closed = False
+
+        self._stats = {
+            'checkouts': 0,
+            'returns': 0,
+            'pool_hits': 0,
+            'pool_misses': 0,
+            'waits': 0,
+            'wait_time_total': 0.0,
+            'wait_time_max': 0.0,
+            'timeouts': 0,
+            'created': 0,
+            'connect_errors': 0,
+            'health_checks': 0,
+            'reconnects': 0,
+            'evicted_idle': 0,
+            'discarded': 0,
+        }
+
+    @property
+    def size(self):
+        return len(self._idle) + self._checked_out
+
+    def get_connection(self):
+        start = time.perf_counter()
+        waited = False
+        connection = None
+
+        with self._lock:
+            if self._closed:
+                raise PoolTimeoutError("Connection pool is closed")
+
+            self._evict_idle()
+            deadline = start + self.timeout
+
+            while True:
+                if self._idle:
+                    connection, last_used = self._idle.pop()
+                    break
+
+                if self.size < self.max_size:
+                    # Reserve the slot now, connect outside the lock
+                    break
+
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    self._stats['timeouts'] += 1
+                    self._record_wait(time.perf_counter() - start)
+                    raise PoolTimeoutError(
+                        f"No database connection available after {self.timeout}s "
+                        f"(pool size {self.max_size})"
+                    )
+                waited = True
+                self._lock.wait(remaining)
+
+            self._checked_out += 1
+            self._stats['checkouts'] += 1
+            if connection is not None and not waited:
+                self._stats['pool_hits'] += 1
+            else:
+                self._stats['pool_misses'] += 1
+            if waited:
+                self._record_wait(time.perf_counter() - start)
+
+        if connection is None:
+            return self._open_slot()
+        return self._check_health(connection, last_used)
+
+    def release(self, connection):
+        if connection is None:
+            return
+
+        healthy = True
+        try:
+            if not connection.is_connected():
+                healthy = False
+            elif getattr(connection, 'in_transaction', False):
+                # Never hand out a connection with someone else's open transaction
+                connection.rollback()
+        except Exception:
+            healthy = False
+
+        with self._lock:
+            self._checked_out -= 1
+            self._stats['returns'] += 1
+            if healthy and not self._closed:
+                self._idle.append((connection, time.monotonic()))
+            else:
+                self._stats['discarded'] += 1
+                self._close_quietly(connection)
+            self._lock.notify()
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            stats['size'] = self.size
+            stats['idle'] = len(self._idle)
+            stats['in_use'] = self._checked_out
+            stats['max_size'] = self.max_size
+            waits = stats['waits']
+            stats['wait_time_avg'] = stats['wait_time_total'] / waits if waits else 0.0
+            return stats
+
+    def close(self):
+        with self._lock:
+            self._closed = True
+            while self._idle:
+                connection, _ = self._idle.popleft()
+                self._close_quietly(connection)
+            self._lock.notify_all()
+
+    def _open_slot(self):
+        try:
+            connection = self._connect()
+        except Exception:
+            connection = None
+
+        with self._lock:
+            if connection is None:
+                self._checked_out -= 1
+                self._stats['connect_errors'] += 1
+                self._lock.notify()
+                return None
+            self._stats['created'] += 1
+        return connection
+
+    def _check_health(self, connection, last_used):
+        if time.monotonic() - last_used < self.health_check_interval:
+            return connection
+
+        with self._lock:
+            self._stats['health_checks'] += 1
+
+        if self._is_alive(connection):
+            return connection
+
+        # Stale connection: drop it and open a fresh one in the same slot
+        self._close_quietly(connection)
+        with self._lock:
+            self._stats['reconnects'] += 1
+        return self._open_slot()
+
+    def _is_alive(self, connection):
+        try:
+            if self._validate:
+                return self._validate(connection)
+            return connection.is_connected()
+        except Exception:
+            return False
+
+    def _evict_idle(self):
+        # Called with the lock held; oldest idle connections sit on the left
+        now = time.monotonic()
+        while self._idle and now - self._idle[0][1] > self.idle_timeout:
+            connection, _ = self._idle.popleft()
+            self._stats['evicted_idle'] += 1
+            self._close_quietly(connection)
+
+    def _record_wait(self, elapsed):
+        self._stats['waits'] += 1
+        self._stats['wait_time_total'] += elapsed
+        self._stats['wait_time_max'] = max(self._stats['wait_time_max'], elapsed)
+
+    @staticmethod
+    def _close_quietly(connection):
+        try:
+            connection.close()
+        except Exception:
+            pass
+
 
 class DatabaseConfig:
+    _pools = {}
+    _pools_lock = threading.Lock()
+
     def __init__(self):
-        self.host = 'localhost'
-        self.database = 'testing'
-        self.user = 'rangga'
-        self.password = 'rangga'
-        self.port = 3306
-    
+        # DB_* environment variables override the defaults, e.g. to point the
+        # benchmarks at a scratch database. DB_BACKEND=sqlite switches to the
+        # embedded store at DB_PATH.
+        self.backend = get_backend(os.environ.get('DB_BACKEND', DEFAULT_BACKEND))
+        self.host = os.environ.get('DB_HOST', 'localhost')
+        self.database = os.environ.get('DB_NAME', 'testing')
+        self.user = os.environ.get('DB_USER', 'rangga')
+        self.password = os.environ.get('DB_PASSWORD', 'rangga')
+        self.port = int(os.environ.get('DB_PORT', 3306))
+        self.sqlite_path = os.environ.get('DB_PATH', DEFAULT_SQLITE_PATH)
+
+        # Connection pool settings
+        self.pool_size = 5
+        self.pool_timeout = 10
+        self.pool_idle_timeout = 300
+        self.pool_health_check_interval = 30
+
+        # LOAD DATA LOCAL INFILE may only read files from this directory,
+        # which is where bulk imports write their staging file
+        self.local_infile_dir = tempfile.gettempdir()
+
+        # Statements slower than DB_SLOW_QUERY_MS go to DB_SLOW_QUERY_LOG;
+        # set it empty to turn the log off
+        self.slow_query_log = os.environ.get('DB_SLOW_QUERY_LOG', DEFAULT_SLOW_QUERY_LOG)
+        self.slow_query_threshold = float(
+            os.environ.get('DB_SLOW_QUERY_MS', DEFAULT_SLOW_QUERY_THRESHOLD * 1000)
+        ) / 1000
+        instrumentation.configure_slow_log(self.slow_query_log, self.slow_query_threshold)
+
+    def describe(self):
+        return self.backend.describe(self)
+
+    def connect(self):
+        return self.backend.connect(self)
+
+    def get_pool(self):
+        key = self.describe()
+        with DatabaseConfig._pools_lock:
+            pool = DatabaseConfig._pools.get(key)
+            if pool is None:
+                pool = ConnectionPool(
+                    self._connect_or_log,
+                    max_size=self.pool_size,
+                    timeout=self.pool_timeout,
+                    idle_timeout=self.pool_idle_timeout,
+                    health_check_interval=self.pool_health_check_interval,
+                    validate=self.backend.ping
+                )
+                DatabaseConfig._pools[key] = pool
+            return pool
+
     def get_connection(self):
+        start = time.perf_counter()
         try:
-            connection = mysql.connector.connect(
-                host=self.host,
-                database=self.database,
-                user=self.user,
-                password=self.password,
-                port=self.port
-            )
-            return connection
-        except Error as e:
-            print(f"Error connecting to MySQL: {e}")
-            return None
\ No newline at end of file
+            return self.get_pool().get_connection()
+        except PoolTimeoutError as e:
+            print(f"Error getting connection from pool: {e}")
+            return None
+        finally:
+            instrumentation.record('db.checkout', time.perf_counter() - start)
+
+    def release_connection(self, connection):
+        self.get_pool().release(connection)
+
+    def pool_stats(self):
+        return self.get_pool().stats()
+
+    def create_search_indexes(self, connection):
+        cursor = connection.cursor()
+        try:
+            for statement in self.backend.search_indexes:
+                try:
+                    cursor.execute(statement)
+                except DatabaseError as e:
+                    # ER_DUP_KEYNAME: index already there
+                    if getattr(e, 'errno', None) != 1061:
+                        raise
+            connection.commit()
+        finally:
+            cursor.close()
+
+    def _connect_or_log(self):
+        # Pooled connections hand out timed cursors (see config.instrumentation)
+        start = time.perf_counter()
+        try:
+            return InstrumentedConnection(self.connect())
+        except DatabaseError + (RuntimeError,) as e:
+            print(f"Error connecting to {self.describe()}: {e}")
+            raise
+        finally:
+            instrumentation.record('db.connect', time.perf_counter() - start)
@@ -0,0 +1,291 @@
+import math
+import os
+import re
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from functools import lru_cache
+
+# In-process latency histograms for database calls and GUI stages, plus an
+# optional slow-query log. Recording is a lock and a bucket increment, cheap
+# enough for every execute and fetch.
+
+SECONDS = 's'
+ROWS = 'rows'
+
+# Bucket bounds grow by this factor, so any percentile is off by at most ~9%
+BUCKET_GROWTH = 2 ** (1 / 8)
+
+DEFAULT_SLOW_QUERY_LOG = os.path.join(os.path.expanduser('~'), '.customer_app', 'slow_queries.log')
+DEFAULT_SLOW_QUERY_THRESHOLD = 0.5
+SLOW_QUERY_SQL_LIMIT = 2000
+
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+class Histogram:
+    def __init__(self, unit=SECONDS):
+        self.unit = unit
+        # Smallest value told apart from zero: a microsecond, or one row
+        self.lowest = 1e-6 if unit == SECONDS else 1
+        self._log_growth = math.log(BUCKET_GROWTH)
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._buckets = {}  # bucket index -> count; -1 holds values below lowest
+            self.count = 0
+            self.total = 0.0
+            self.max = 0.0
+
+    def record(self, value):
+        if value < self.lowest:
+            index = -1
+        else:
+            index = int(math.log(value / self.lowest) / self._log_growth)
+        with self._lock:
+            self._buckets[index] = self._buckets.get(index, 0) + 1
+            self.count += 1
+            self.total += value
+            if value > self.max:
+                self.max = value
+
+    def percentiles(self, *fractions):
+        # Upper bound of the bucket holding each percentile, capped at the max
+        with self._lock:
+            buckets = sorted(self._buckets.items())
+            count = self.count
+            largest = self.max
+        if not count:
+            return [None] * len(fractions)
+
+        results = []
+        for fraction in fractions:
+            rank = max(1, math.ceil(fraction * count))
+            seen = 0
+            for index, bucket_count in buckets:
+                seen += bucket_count
+                if seen >= rank:
+                    break
+            upper = 0.0 if index < 0 else self.lowest * BUCKET_GROWTH ** (index + 1)
+            if self.unit == ROWS:
+                upper = math.floor(upper)  # Row counts are whole numbers
+            results.append(min(upper, largest))
+        return results
+
+    def summary(self):
+        p50, p95, p99 = self.percentiles(0.5, 0.95, 0.99)
+        with self._lock:
+            return {
+                'unit': self.unit,
+                'count': self.count,
+                'total': self.total,
+                'mean': self.total / self.count if self.count else None,
+                'p50': p50,
+                'p95': p95,
+                'p99': p99,
+                'max': self.max if self.count else None,
+            }
+
+
+class SlowQueryLog:
+    def __init__(self, path, threshold=DEFAULT_SLOW_QUERY_THRESHOLD):
+        self.path = path
+        self.threshold = threshold
+        self.logged = 0
+        self._lock = threading.Lock()
+
+    def write(self, operation, elapsed, statement, rows=None):
+        sql = _WHITESPACE_RE.sub(' ', statement or '').strip()[:SLOW_QUERY_SQL_LIMIT]
+        line = (f"{datetime.now().isoformat(timespec='milliseconds')}\t{elapsed * 1000:.1f} ms\t"
+                f"{operation}\t{'-' if rows is None else rows}\t{sql}\n")
+        with self._lock:
+            try:
+                os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+                with open(self.path, 'a', encoding='utf-8') as file:
+                    file.write(line)
+                self.logged += 1
+            except OSError as e:
+                print(f"Error writing slow query log: {e}")
+
+
+@lru_cache(maxsize=512)
+def statement_kind(statement):
+    # 'select', 'insert', ... so the histograms split by kind of statement
+    words = statement.split(None, 1)
+    return words[0].lower() if words else 'unknown'
+
+
+class Instrumentation:
+    def __init__(self):
+        self._histograms = {}
+        self._lock = threading.Lock()
+        self.slow_log = None
+        self.enabled = True
+
+    def histogram(self, name, unit=SECONDS):
+        histogram = self._histograms.get(name)
+        if histogram is None:
+            with self._lock:
+                histogram = self._histograms.setdefault(name, Histogram(unit))
+        return histogram
+
+    def record(self, name, value, unit=SECONDS):
+        if self.enabled:
+            self.histogram(name, unit).record(value)
+
+    def record_query(self, operation, elapsed, statement, rows=None):
+        # operation is 'execute', 'executemany', 'fetch' or 'commit'
+        if not self.enabled:
+            return
+        self.histogram(f"db.{operation}").record(elapsed)
+        if statement and operation != 'commit':
+            self.histogram(f"db.{operation}.{statement_kind(statement)}").record(elapsed)
+        if rows is not None:
+            self.histogram('db.rows', ROWS).record(rows)
+
+        slow_log = self.slow_log
+        if slow_log is not None and elapsed >= slow_log.threshold:
+            slow_log.write(operation, elapsed, statement, rows)
+
+    @contextmanager
+    def timer(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def configure_slow_log(self, path, threshold=DEFAULT_SLOW_QUERY_THRESHOLD):
+        # An empty path turns the log off
+        if not path:
+            self.slow_log = None
+        elif (self.slow_log is None or self.slow_log.path != path
+                or self.slow_log.threshold != threshold):
+            self.slow_log = SlowQueryLog(path, threshold)
+
+    def snapshot(self):
+        with self._lock:
+            histograms = dict(self._histograms)
+        return {name: histograms[name].summary() for name in sorted(histograms)}
+
+    def reset(self):
+        with self._lock:
+            histograms = list(self._histograms.values())
+        for histogram in histograms:
+            histogram.reset()
+
+
+instrumentation = Instrumentation()
+
+
+class InstrumentedCursor:
+    # Times execute and fetch calls and counts fetched rows; everything else
+    # goes straight to the driver's cursor
+
+    def __init__(self, cursor):
+        self._cursor = cursor
+        self._statement = None
+
+    def execute(self, statement, *args, **kwargs):
+        self._statement = statement
+        start = time.perf_counter()
+        try:
+            return self._cursor.execute(statement, *args, **kwargs)
+        finally:
+            instrumentation.record_query('execute', time.perf_counter() - start, statement)
+
+    def executemany(self, statement, *args, **kwargs):
+        self._statement = statement
+        start = time.perf_counter()
+        try:
+            return self._cursor.executemany(statement, *args, **kwargs)
+        finally:
+            instrumentation.record_query('executemany', time.perf_counter() - start, statement)
+
+    def fetchone(self):
+        start = time.perf_counter()
+        row = self._cursor.fetchone()
+        instrumentation.record_query('fetch', time.perf_counter() - start, self._statement,
+                                     0 if row is None else 1)
+        return row
+
+    def fetchmany(self, *args, **kwargs):
+        start = time.perf_counter()
+        rows = self._cursor.fetchmany(*args, **kwargs)
+        instrumentation.record_query('fetch', time.perf_counter() - start, self._statement, len(rows))
+        return rows
+
+    def fetchall(self):
+        start = time.perf_counter()
+        rows = self._cursor.fetchall()
+        instrumentation.record_query('fetch', time.perf_counter() - start, self._statement, len(rows))
+        return rows
+
+    def __iter__(self):
+        # One fetch sample for the whole iteration, like fetchall: the time
+        # spent in the driver summed over every row, and the total row count
+        rows = 0
+        elapsed = 0.0
+        iterator = iter(self._cursor)
+        try:
+            while True:
+                start = time.perf_counter()
+                try:
+                    row = next(iterator)
+                except StopIteration:
+                    return
+                finally:
+                    elapsed += time.perf_counter() - start
+                rows += 1
+                yield row
+        finally:
+            instrumentation.record_query('fetch', elapsed, self._statement, rows)
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+
+class InstrumentedConnection:
+    # Wraps a pooled connection so every cursor it hands out is instrumented
+
+    def __init__(self, connection):
+        self.raw = connection
+
+    def cursor(self, *args, **kwargs):
+        return InstrumentedCursor(self.raw.cursor(*args, **kwargs))
+
+    def commit(self):
+        start = time.perf_counter()
+        try:
+            return self.raw.commit()
+        finally:
+            instrumentation.record_query('commit', time.perf_counter() - start, 'COMMIT')
+
+    def __getattr__(self, name):
+        return getattr(self.raw, name)
+
+
+class StartupTimer:
+    # Milestones measured from process start (or whenever started was taken),
+    # each also recorded as a startup.* timing
+
+    def __init__(self, started=None):
+        self.started = time.perf_counter() if started is None else started
+        self.marks = {}
+
+    def mark(self, name):
+        # Only the first occurrence counts; returns whether this was it
+        if name in self.marks:
+            return False
+        elapsed = time.perf_counter() - self.started
+        self.marks[name] = elapsed
+        instrumentation.record(f"startup.{name}", elapsed)
+        return True
+
+    def report(self):
+        return "Startup: " + ", ".join(
+            f"{name} {elapsed * 1000:.0f} ms" for name, elapsed in self.marks.items()
+        )
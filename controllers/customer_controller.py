@@ -1,52 +1,215 @@
-from models.customer import Customer
-from PyQt6.QtWidgets import QMessageBox, QFileDialog
+from models.customer import Customer, PAGE_FIRST, PAGE_NEXT
+from models.customer_import import (
+    DEFAULT_CHUNK_SIZE, DEFAULT_WRITER_THREADS, IMPORT_BATCHED,
+    DUPLICATE_INSERT, DUPLICATE_SKIP, DUPLICATE_OVERWRITE, DUPLICATE_UPDATE_CHANGED, UPSERT_MODES
+)
+from models.customer_export import EXPORT_FORMATS, format_for_path
+from controllers.worker import TaskRunner
+from views.import_progress_dialog import ImportProgressDialog
+from PyQt6.QtWidgets import QMessageBox, QFileDialog, QInputDialog
 from PyQt6.QtCore import QObject, pyqtSignal
+import os
+import threading
+
+# What the import confirmation offers for rows whose NIK is already there;
+# DUPLICATE_INSERT is left out once the unique NIK index exists
+DUPLICATE_CHOICES = [
+    (DUPLICATE_INSERT, "Tetap tambahkan (NIK boleh ganda)"),
+    (DUPLICATE_SKIP, "Lewati data yang NIK-nya sudah ada"),
+    (DUPLICATE_OVERWRITE, "Timpa data yang NIK-nya sudah ada"),
+    (DUPLICATE_UPDATE_CHANGED, "Timpa hanya data yang berubah"),
+]
 
 class CustomerController(QObject):
+    # data_changed means "reload everything" (imports); single-row writes
+    # report the affected row so views can patch it in place
     data_changed = pyqtSignal()
+    customer_created = pyqtSignal(object)
+    customer_updated = pyqtSignal(object)
+    customer_deleted = pyqtSignal(int)
     
     def __init__(self):
         super().__init__()
         self.model = Customer()
+        self.import_chunk_size = DEFAULT_CHUNK_SIZE
+        self.import_method = IMPORT_BATCHED  # or IMPORT_PIPELINE / IMPORT_LOAD_DATA
+        self.import_parse_workers = None  # None: one per CPU core
+        self.import_writer_threads = DEFAULT_WRITER_THREADS
+        self.import_on_duplicate = DUPLICATE_INSERT  # last choice in the import confirmation
+        self.import_fast_parse = True  # memory-mapped, column-wise parsing for unquoted files
+        self.export_threaded_compression = True  # compress on its own thread, overlapping the fetch
+        
+        # Every database call from the GUI goes through here, off the GUI thread
+        self.tasks = TaskRunner(self)
     
     def get_customers(self, page=1, per_page=10, search_term=""):
         return self.model.get_all_customers(page, per_page, search_term)
     
+    def get_customers_keyset(self, per_page=10, search_term="", direction=PAGE_FIRST, anchor_idx=None):
+        return self.model.get_customers_keyset(per_page, search_term, direction, anchor_idx)
+    
     def get_customer(self, idx):
         return self.model.get_customer_by_id(idx)
     
-    def create_customer(self, nik, name, born, active, salary):
-        if self.model.create_customer(nik, name, born, active, salary):
-            self.data_changed.emit()
-            self.show_success_message("Data berhasil disimpan!")
-            return True
-        else:
-            self.show_error_message("Gagal menyimpan data!")
-            return False
+    def load_customers(self, per_page, search_term, direction, anchor_idx, on_result):
+        # A newer load supersedes an older one still in flight (e.g. while typing)
+        return self.tasks.submit(
+            'load', self.model.get_customers_keyset,
+            per_page, search_term, direction, anchor_idx,
+            on_result=on_result
+        )
     
-    def update_customer(self, idx, nik, name, born, active, salary):
-        reply = self.show_confirmation_message("Konfirmasi", "Apakah Anda yakin ingin mengubah data ini?")
-        if reply == QMessageBox.StandardButton.Yes:
-            if self.model.update_customer(idx, nik, name, born, active, salary):
-                self.data_changed.emit()
-                self.show_success_message("Data berhasil diubah!")
-                return True
+    def load_more_customers(self, batch_size, search_term, after_idx, on_result, on_error=None):
+        direction = PAGE_FIRST if after_idx is None else PAGE_NEXT
+        return self.tasks.submit(
+            'scroll', self.model.get_customers_keyset,
+            batch_size, search_term, direction, after_idx,
+            on_result=on_result, on_error=on_error
+        )
+    
+    @property
+    def snapshot_available(self):
+        return self.model.snapshot.available
+    
+    def load_snapshot(self, on_result, on_error=None):
+        # Reads the whole table into memory; on_result gets the row count, or
+        # None when it could not be loaded
+        return self.tasks.submit('snapshot', self.model.load_snapshot, on_result=on_result, on_error=on_error)
+    
+    def drop_snapshot(self):
+        self.model.drop_snapshot()
+    
+    def load_snapshot_rows(self, channel, offset, limit, search_term, sort_column, descending,
+                           on_result, on_error=None):
+        # channel is 'load' for pages or 'scroll' for infinite scroll batches
+        return self.tasks.submit(
+            channel, self.model.get_snapshot_rows,
+            offset, limit, search_term, sort_column, descending,
+            on_result=on_result, on_error=on_error
+        )
+    
+    def load_summary(self, on_result):
+        # Running totals; only the first call (and a periodic recount) scans
+        return self.tasks.submit('summary', self.model.get_summary, on_result=on_result)
+    
+    def fetch_customer(self, idx, on_result):
+        return self.tasks.submit('customer', self.model.get_customer_by_id, idx, on_result=on_result)
+    
+    def create_search_indexes(self, on_done=None):
+        reply = self.show_confirmation_message(
+            "Buat Indeks Pencarian",
+            "Buat indeks pencarian pada tabel customer?\n"
+            "Pada tabel besar proses ini bisa memakan waktu beberapa menit."
+        )
+        if reply != QMessageBox.StandardButton.Yes:
+            return
+        
+        def finished(success):
+            if success:
+                self.show_success_message("Indeks pencarian berhasil dibuat!")
             else:
-                self.show_error_message("Gagal mengubah data!")
-                return False
-        return False
+                self.show_error_message("Gagal membuat indeks pencarian!")
+            if on_done:
+                on_done(success)
+        
+        self.tasks.submit(None, self.model.create_search_indexes,
+                          on_result=finished, on_error=lambda message: finished(False))
     
-    def delete_customer(self, idx):
+    def _run_write(self, fn, args, changed, success_message, error_message, on_done=None):
+        # A raised error (e.g. a NIK the unique index rejects) adds its message
+        def finished(success, message=None):
+            if success:
+                changed(success)
+                self.show_success_message(success_message)
+            else:
+                self.show_error_message(f"{error_message}\n{message}" if message else error_message)
+            if on_done:
+                on_done(bool(success))
+        
+        # Channel None: a later write must not drop this one's result
+        self.tasks.submit(None, fn, *args, on_result=finished, on_error=lambda message: finished(False, message))
+    
+    def create_customer(self, nik, name, born, active, salary, on_done=None):
+        self._run_write(
+            self.model.create_customer, (nik, name, born, active, salary),
+            self.customer_created.emit,
+            "Data berhasil disimpan!", "Gagal menyimpan data!", on_done
+        )
+    
+    def update_customer(self, idx, nik, name, born, active, salary, on_done=None):
+        reply = self.show_confirmation_message("Konfirmasi", "Apakah Anda yakin ingin mengubah data ini?")
+        if reply != QMessageBox.StandardButton.Yes:
+            if on_done:
+                on_done(False)
+            return
+        
+        self._run_write(
+            self.model.update_customer, (idx, nik, name, born, active, salary),
+            self.customer_updated.emit,
+            "Data berhasil diubah!", "Gagal mengubah data!", on_done
+        )
+    
+    def delete_customer(self, idx, on_done=None):
         reply = self.show_confirmation_message("Konfirmasi", "Apakah Anda yakin ingin menghapus data ini?")
-        if reply == QMessageBox.StandardButton.Yes:
-            if self.model.delete_customer(idx):
-                self.data_changed.emit()
-                self.show_success_message("Data berhasil dihapus!")
-                return True
+        if reply != QMessageBox.StandardButton.Yes:
+            if on_done:
+                on_done(False)
+            return
+        
+        self._run_write(
+            self.model.delete_customer, (idx,),
+            lambda deleted: self.customer_deleted.emit(idx),
+            "Data berhasil dihapus!", "Gagal menghapus data!", on_done
+        )
+    
+    # Bulk operations work on a list of idx, or with idxs=None on every row
+    # matching search_term. They reload the grid afterwards.
+    
+    def _bulk_scope(self, idxs, search_term):
+        if idxs is not None:
+            return f"{len(idxs)} data terpilih"
+        return "semua data hasil pencarian" if search_term else "semua data"
+    
+    def _run_bulk(self, fn, args, question, success_message, error_message, on_done=None):
+        reply = self.show_confirmation_message("Konfirmasi", question)
+        if reply != QMessageBox.StandardButton.Yes:
+            if on_done:
+                on_done(False)
+            return
+        
+        def finished(affected):
+            if affected is None:
+                self.show_error_message(error_message)
             else:
-                self.show_error_message("Gagal menghapus data!")
-                return False
-        return False
+                self.data_changed.emit()
+                self.show_success_message(success_message.format(affected))
+            if on_done:
+                on_done(affected is not None)
+        
+        self.tasks.submit(None, fn, *args, on_result=finished, on_error=lambda message: finished(None))
+    
+    def delete_customers(self, idxs, on_done=None):
+        self._run_bulk(
+            self.model.delete_customers, (list(idxs),),
+            f"Apakah Anda yakin ingin menghapus {len(idxs)} data?",
+            "{} data berhasil dihapus!", "Gagal menghapus data!", on_done
+        )
+    
+    def set_customers_active(self, active, idxs=None, search_term="", on_done=None):
+        verb = "mengaktifkan" if active else "menonaktifkan"
+        self._run_bulk(
+            self.model.set_customers_active, (active, idxs, search_term),
+            f"Apakah Anda yakin ingin {verb} {self._bulk_scope(idxs, search_term)}?",
+            "Status {} data berhasil diubah!", "Gagal mengubah status data!", on_done
+        )
+    
+    def adjust_salaries(self, percent, idxs=None, search_term="", on_done=None):
+        self._run_bulk(
+            self.model.adjust_salaries, (percent, idxs, search_term),
+            f"Apakah Anda yakin ingin mengubah gaji {self._bulk_scope(idxs, search_term)} "
+            f"sebesar {percent:+g}%?",
+            "Gaji {} data berhasil diubah!", "Gagal mengubah gaji!", on_done
+        )
     
     def import_csv(self, parent_widget):
         file_path, _ = QFileDialog.getOpenFileName(
@@ -57,29 +220,134 @@ class CustomerController(QObject):
         )
         
         if file_path:
-            reply = self.show_confirmation_message("Konfirmasi", "Apakah Anda yakin ingin mengimpor data dari CSV?")
-            if reply == QMessageBox.StandardButton.Yes:
-                success_count, error_count = self.model.import_from_csv(file_path)
-                self.data_changed.emit()
-                message = f"Import selesai!\nBerhasil: {success_count} data\nGagal: {error_count} data"
-                self.show_success_message(message)
-                return True
+            # The choices depend on whether NIKs are unique already
+            self.tasks.submit(
+                None, self.model.has_nik_unique_index,
+                on_result=lambda unique: self.confirm_import(parent_widget, file_path, unique),
+                on_error=lambda message: self.show_error_message(f"Import gagal: {message}")
+            )
+            return True
         return False
     
+    def confirm_import(self, parent_widget, file_path, nik_unique):
+        # Confirming also picks how rows with an existing NIK are handled
+        choices = [(mode, label) for mode, label in DUPLICATE_CHOICES
+                   if not (nik_unique and mode == DUPLICATE_INSERT)]
+        modes = [mode for mode, _ in choices]
+        labels = [label for _, label in choices]
+        current = modes.index(self.import_on_duplicate) if self.import_on_duplicate in modes else 0
+        label, ok = QInputDialog.getItem(
+            parent_widget,
+            "Konfirmasi",
+            "Apakah Anda yakin ingin mengimpor data dari CSV?\nData dengan NIK yang sudah ada:",
+            labels, current, False
+        )
+        if not ok:
+            return
+        self.import_on_duplicate = modes[labels.index(label)]
+        
+        def find_checkpoint(_=None):
+            # Hashing the file to find its checkpoint reads all of it, so
+            # that happens off the GUI thread too
+            self.tasks.submit(
+                None, self.model.find_import_checkpoint, file_path,
+                on_result=lambda checkpoint: self.start_import(parent_widget, file_path, checkpoint),
+                on_error=lambda message: self.show_error_message(f"Import gagal: {message}")
+            )
+        
+        if self.import_on_duplicate not in UPSERT_MODES or nik_unique:
+            find_checkpoint()
+            return
+        
+        # Overwriting by NIK needs a unique index on it, a lasting change
+        reply = self.show_confirmation_message(
+            "Indeks Unik NIK",
+            "Mode ini membutuhkan indeks unik pada kolom NIK.\n"
+            "Setelah dibuat, NIK yang sama tidak bisa disimpan dua kali, "
+            "baik lewat form maupun import.\nBuat indeks sekarang?"
+        )
+        if reply != QMessageBox.StandardButton.Yes:
+            return
+        self.tasks.submit(
+            None, self.model.create_nik_unique_index,
+            on_result=find_checkpoint,
+            on_error=lambda message: self.show_error_message(f"Import gagal: {message}")
+        )
+    
+    def start_import(self, parent_widget, file_path, checkpoint=None):
+        resume = False
+        if checkpoint:
+            done = checkpoint.success + checkpoint.error + checkpoint.skipped
+            reply = self.show_confirmation_message(
+                "Lanjutkan Import",
+                f"Import file ini sebelumnya terhenti setelah {done} baris.\n"
+                "Lanjutkan dari titik terakhir? Pilih No untuk mengimpor ulang dari awal."
+            )
+            resume = reply == QMessageBox.StandardButton.Yes
+        
+        cancel_event = threading.Event()
+        dialog = ImportProgressDialog(os.path.basename(file_path), resume, parent_widget)
+        dialog.cancel_requested.connect(cancel_event.set)
+        
+        def finished(result):
+            dialog.accept()
+            self.data_changed.emit()
+            title = "Import dibatalkan!" if result.cancelled else "Import selesai!"
+            message = f"{title}\nBerhasil: {result.success} data\nGagal: {result.error} data"
+            if result.skipped:
+                message += f"\nDilewati: {result.skipped} data"
+            if result.cancelled:
+                message += "\nPilih file yang sama untuk melanjutkan import."
+            self.show_success_message(message)
+        
+        def failed(message):
+            dialog.accept()
+            self.show_error_message(f"Import gagal: {message}")
+        
+        self.tasks.submit(
+            None, self.model.import_from_csv, file_path,
+            chunk_size=self.import_chunk_size,
+            method=self.import_method,
+            parse_workers=self.import_parse_workers,
+            writer_threads=self.import_writer_threads,
+            on_duplicate=self.import_on_duplicate,
+            fast_parse=self.import_fast_parse,
+            resume=resume,
+            cancel_event=cancel_event,
+            on_progress=dialog.update_progress,
+            on_result=finished,
+            on_error=failed
+        )
+        dialog.show()
+    
     def export_csv(self, parent_widget):
-        file_path, _ = QFileDialog.getSaveFileName(
+        # Every export format is offered; the chosen filter decides the format
+        filters = [f"{export_format.label} (*{export_format.extension})" for export_format in EXPORT_FORMATS]
+        file_path, selected_filter = QFileDialog.getSaveFileName(
             parent_widget, 
-            "Simpan File CSV", 
+            "Simpan File Export", 
             "customers.csv", 
-            "CSV Files (*.csv)"
+            ";;".join(filters)
         )
         
         if file_path:
-            reply = self.show_confirmation_message("Konfirmasi", "Apakah Anda yakin ingin mengekspor data ke CSV?")
+            export_format = EXPORT_FORMATS[filters.index(selected_filter)] if selected_filter in filters else format_for_path(file_path)
+            if not file_path.lower().endswith(export_format.extension):
+                file_path += export_format.extension
+            
+            reply = self.show_confirmation_message("Konfirmasi", f"Apakah Anda yakin ingin mengekspor data ke {export_format.label}?")
             if reply == QMessageBox.StandardButton.Yes:
-                success_count, error_count = self.model.export_to_csv(file_path)
-                message = f"Export selesai!\nBerhasil: {success_count} data\nGagal: {error_count} data"
-                self.show_success_message(message)
+                def finished(result):
+                    success_count, error_count = result
+                    message = f"Export selesai!\nBerhasil: {success_count} data\nGagal: {error_count} data"
+                    self.show_success_message(message)
+                
+                self.tasks.submit(
+                    None, self.model.export_to_file, file_path, export_format.name,
+                    threaded_compression=self.export_threaded_compression,
+                    on_result=finished,
+                    on_error=lambda message: self.show_error_message(f"Export gagal: {message}")
+                )
                 return True
         return False
     
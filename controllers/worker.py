@@ -0,0 +1,126 @@
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+
+class WorkerSignals(QObject):
+    finished = pyqtSignal(object)
+    error = pyqtSignal(str)
+    progress = pyqtSignal(object)
+
+
+class Worker(QRunnable):
+    def __init__(self, fn, *args, **kwargs):
+        super().__init__()
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.signals = WorkerSignals()
+
+    def run(self):
+        try:
+            result = self.fn(*self.args, **self.kwargs)
+        except Exception as e:
+            self.signals.error.emit(str(e))
+            return
+        self.signals.finished.emit(result)
+
+
+# Workers stay referenced until their result has been delivered, otherwise
+# Python may collect the signals object while the queued signal is in flight
+_running = set()
+
+
+def run_in_background(fn, *args, on_result=None, on_error=None, **kwargs):
+    worker = Worker(fn, *args, **kwargs)
+
+    def finish(result):
+        _running.discard(worker)
+        if on_result:
+            on_result(result)
+
+    def fail(message):
+        _running.discard(worker)
+        if on_error:
+            on_error(message)
+        else:
+            print(f"Background task failed: {message}")
+
+    worker.signals.finished.connect(finish)
+    worker.signals.error.connect(fail)
+    _running.add(worker)
+    QThreadPool.globalInstance().start(worker)
+    return worker
+
+
+class TaskRunner(QObject):
+    # Runs model calls on a thread pool and hands results back on the GUI
+    # thread. Tasks submitted on the same channel supersede each other: only
+    # the newest one's result is delivered, older ones are ignored. Tasks on
+    # channel None (writes, imports, exports) never supersede anything and
+    # always get their result delivered.
+    busy_changed = pyqtSignal(bool)
+
+    def __init__(self, parent=None, thread_pool=None):
+        super().__init__(parent)
+        self.thread_pool = thread_pool or QThreadPool.globalInstance()
+        self._latest = {}  # channel -> sequence number of the newest task
+        self._pending = 0
+
+    @property
+    def busy(self):
+        return self._pending > 0
+
+    def submit(self, channel, fn, *args, on_result=None, on_error=None, on_progress=None, **kwargs):
+        # With on_progress, fn gets a progress= callable it may call from the
+        # worker thread; each value is delivered to on_progress on this thread
+        if channel is None:
+            sequence = None
+        else:
+            sequence = self._latest.get(channel, 0) + 1
+            self._latest[channel] = sequence
+
+        def current():
+            return sequence is None or self._latest.get(channel) == sequence
+
+        worker = Worker(fn, *args, **kwargs)
+        if on_progress:
+            worker.kwargs['progress'] = worker.signals.progress.emit
+
+            def report(value):
+                if current():
+                    on_progress(value)
+
+            worker.signals.progress.connect(report)
+
+        def finish(result):
+            self._task_done(worker)
+            if current() and on_result:
+                on_result(result)
+
+        def fail(message):
+            self._task_done(worker)
+            if not current():
+                return
+            if on_error:
+                on_error(message)
+            else:
+                print(f"Background task failed: {message}")
+
+        worker.signals.finished.connect(finish)
+        worker.signals.error.connect(fail)
+        _running.add(worker)
+
+        self._pending += 1
+        if self._pending == 1:
+            self.busy_changed.emit(True)
+        self.thread_pool.start(worker)
+        return worker
+
+    def cancel(self, channel):
+        # Whatever is still running on this channel will be ignored
+        self._latest[channel] = self._latest.get(channel, 0) + 1
+
+    def _task_done(self, worker):
+        _running.discard(worker)
+        self._pending -= 1
+        if self._pending == 0:
+            self.busy_changed.emit(False)
@@ -1,19 +1,59 @@
+import time
+
+# Taken before any other import, so the startup report includes import time
+STARTED = time.perf_counter()
+
+import importlib
 import sys
+import threading
+from collections import OrderedDict
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QVBoxLayout, QHBoxLayout, 
-    QWidget, QTableWidget, QTableWidgetItem, QPushButton, 
-    QLineEdit, QComboBox, QLabel, QMessageBox, QHeaderView
+    QWidget, QTableView, QPushButton, QCheckBox,
+    QLineEdit, QComboBox, QLabel, QMessageBox, QHeaderView, QProgressBar, QInputDialog,
+    QDockWidget
 )
-from PyQt6.QtCore import Qt, QTimer
-from PyQt6.QtGui import QFont, QIcon
-from controllers.customer_controller import CustomerController
-from views.customer_form import CustomerForm
+from PyQt6.QtCore import Qt, QTimer, QModelIndex
+from PyQt6.QtGui import QFont, QIcon, QKeySequence, QShortcut
+from config.instrumentation import StartupTimer, instrumentation
+from controllers.worker import run_in_background
+from models.customer_record import CUSTOMER_COLUMNS
+from models.paging import PAGE_FIRST, PAGE_PREV, PAGE_CURRENT, PAGE_NEXT, PAGE_LAST
+from views.customer_table_model import CustomerTableModel
+
+# Pages fetched ahead of time, per search term and page size
+PAGE_CACHE_SIZE = 8
+
+# Rows pulled per batch when scrolling without pagination
+SCROLL_BATCH_SIZE = 200
+
+# The database layer (controller, model, DB driver, NumPy) is imported off the
+# GUI thread while the window is built, and used once it has been painted
+DATABASE_LAYER = 'controllers.customer_controller'
+
+# Start anyway if no paint event arrives (e.g. the window starts minimized)
+START_FALLBACK_MS = 500
+
+STARTUP_REPORT_FLAG = '--startup-report'
+
+# How often the open summary panel re-reads the running totals
+SUMMARY_REFRESH_MS = 30000
+
+def preload_database_layer():
+    try:
+        importlib.import_module(DATABASE_LAYER)
+    except ImportError:
+        pass  # start() imports it again and reports the error
 
 class MainWindow(QMainWindow):
-    def __init__(self):
+    def __init__(self, startup=None):
         super().__init__()
-        self.controller = CustomerController()
-        self.controller.data_changed.connect(self.load_data)
+        self.startup = startup or StartupTimer()
+        self.print_startup_report = STARTUP_REPORT_FLAG in sys.argv
+        
+        # Created by start() after the first paint
+        self.controller = None
+        self.start_scheduled = False
         
         self.current_page = 1
         self.per_page = 10
@@ -21,9 +61,68 @@ class MainWindow(QMainWindow):
         self.total_pages = 0
         self.search_term = ""
         
+        # Keyset pagination state: the idx bounds of the page currently shown
+        self.first_idx = None
+        self.last_idx = None
+        
+        # Adjacent pages fetched in the background; the generation changes
+        # whenever cached pages stop being valid, so late prefetches are dropped
+        self.page_cache = OrderedDict()
+        self.page_cache_generation = 0
+        self.prefetching = set()
+        
+        # Infinite scroll replaces the pagination buttons when switched on
+        self.infinite_scroll = False
+        self.scroll_generation = 0
+        
+        # Snapshot mode serves pages from an in-memory copy of the table,
+        # which the column headers can sort by any column
+        self.snapshot_mode = False
+        self.sort_column = 'idx'
+        self.sort_descending = False
+        
+        self.diagnostics_panel = None
+        
+        # Summary dock, created the first time it is opened
+        self.summary_dock = None
+        self.summary_panel = None
+        
         self.setup_ui()
+        self.startup.mark('window')
+        QTimer.singleShot(START_FALLBACK_MS, self.start)
+    
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if not self.start_scheduled:
+            # The window is on screen with its empty grid; load data next
+            self.start_scheduled = True
+            self.startup.mark('first_paint')
+            QTimer.singleShot(0, self.start)
+    
+    def start(self):
+        if self.controller is not None:
+            return
+        
+        controller_module = importlib.import_module(DATABASE_LAYER)
+        self.controller = controller_module.CustomerController()
+        self.controller.data_changed.connect(self.on_data_changed)
+        self.controller.customer_created.connect(self.on_customer_created)
+        self.controller.customer_updated.connect(self.on_customer_updated)
+        self.controller.customer_deleted.connect(self.on_customer_deleted)
+        self.controller.tasks.busy_changed.connect(self.on_busy_changed)
+        self.startup.mark('ready')
+        
+        for button in (self.add_button, self.upload_button, self.download_button, self.summary_button):
+            button.setEnabled(True)
+        self.snapshot_check.setEnabled(self.controller.snapshot_available)
+        if not self.controller.snapshot_available:
+            self.snapshot_check.setToolTip("Mode memori membutuhkan NumPy")
         self.load_data()
     
+    def first_data_shown(self):
+        if self.startup.mark('first_data') and self.print_startup_report:
+            print(self.startup.report())
+    
     def setup_ui(self):
         self.setWindowTitle("Customer Management System")
         self.setGeometry(100, 100, 1200, 700)
@@ -33,7 +132,7 @@ class MainWindow(QMainWindow):
             QMainWindow {
                 background-color: #f5f5f5;
             }
-            QTableWidget {
+            QTableView {
                 background-color: white;
                 border: 1px solid #ddd;
                 border-radius: 8px;
@@ -41,15 +140,15 @@ class MainWindow(QMainWindow):
                 font-size: 12px;
                 color: black;
             }
-            QTableWidget::item {
+            QTableView::item {
                 padding: 8px;
                 border-bottom: 1px solid #e0e0e0;
             }
-            QTableWidget::item:selected {
+            QTableView::item:selected {
                 background-color: #e3f2fd;
                 color: #1976d2;
             }
-            QTableWidget QHeaderView::section {
+            QTableView QHeaderView::section {
                 background-color: #2196f3;
                 color: white;
                 padding: 10px;
@@ -154,7 +253,12 @@ class MainWindow(QMainWindow):
         search_layout = QHBoxLayout()
         search_layout.addWidget(QLabel("Pencarian:"))
         self.search_input = QLineEdit()
-        self.search_input.setPlaceholderText("Cari berdasarkan NIK, Nama, Tanggal Lahir, Status, atau Gaji...")
+        self.search_input.setPlaceholderText("Cari nama, atau nik:123, born:1990, active:1, salary>5000000...")
+        self.search_input.setToolTip(
+            "Nama atau NIK langsung diketik, atau gunakan filter:\n"
+            "nik:12345  name:budi  born:1990-05  active:aktif\n"
+            "salary>5000000  salary:1000000..2000000"
+        )
         self.search_input.textChanged.connect(self.on_search_changed)
         search_layout.addWidget(self.search_input)
         
@@ -171,6 +275,19 @@ class MainWindow(QMainWindow):
         per_page_layout.addWidget(self.per_page_combo)
         per_page_layout.addWidget(QLabel("baris"))
         
+        self.infinite_scroll_check = QCheckBox("Gulir tanpa halaman")
+        self.infinite_scroll_check.toggled.connect(self.on_infinite_scroll_toggled)
+        per_page_layout.addWidget(self.infinite_scroll_check)
+        
+        self.snapshot_check = QCheckBox("Mode memori")
+        self.snapshot_check.setToolTip(
+            "Muat seluruh tabel ke memori: urutkan dengan klik judul kolom,\n"
+            "cari dan pindah halaman tanpa query ke database"
+        )
+        self.snapshot_check.setEnabled(False)  # until start()
+        self.snapshot_check.toggled.connect(self.on_snapshot_toggled)
+        per_page_layout.addWidget(self.snapshot_check)
+        
         top_layout.addLayout(per_page_layout)
         main_layout.addLayout(top_layout)
         
@@ -206,12 +323,52 @@ class MainWindow(QMainWindow):
         self.download_button.clicked.connect(self.download_csv)
         button_layout.addWidget(self.download_button)
         
+        self.summary_button = QPushButton("Ringkasan")
+        self.summary_button.setCheckable(True)
+        self.summary_button.toggled.connect(self.toggle_summary)
+        button_layout.addWidget(self.summary_button)
+        
+        # Enabled by start() once the database layer is ready
+        for button in (self.add_button, self.upload_button, self.download_button, self.summary_button):
+            button.setEnabled(False)
+        
         main_layout.addLayout(button_layout)
         
+        # Bulk actions on the selected rows, or on every row matching the search
+        bulk_layout = QHBoxLayout()
+        bulk_layout.addWidget(QLabel("Aksi massal:"))
+        
+        self.activate_button = QPushButton("Aktifkan")
+        self.activate_button.clicked.connect(lambda: self.set_active_in_bulk(True))
+        bulk_layout.addWidget(self.activate_button)
+        
+        self.deactivate_button = QPushButton("Nonaktifkan")
+        self.deactivate_button.clicked.connect(lambda: self.set_active_in_bulk(False))
+        bulk_layout.addWidget(self.deactivate_button)
+        
+        self.salary_button = QPushButton("Ubah Gaji (%)")
+        self.salary_button.clicked.connect(self.adjust_salaries_in_bulk)
+        bulk_layout.addWidget(self.salary_button)
+        
+        self.bulk_all_check = QCheckBox("Semua hasil pencarian")
+        self.bulk_all_check.setToolTip("Terapkan ke semua data yang cocok dengan pencarian, bukan hanya baris terpilih")
+        self.bulk_all_check.toggled.connect(self.on_selection_changed)
+        bulk_layout.addWidget(self.bulk_all_check)
+        
+        bulk_layout.addStretch()
+        self.selection_label = QLabel()
+        bulk_layout.addWidget(self.selection_label)
+        
+        for button in (self.activate_button, self.deactivate_button, self.salary_button):
+            button.setEnabled(False)
+        
+        main_layout.addLayout(bulk_layout)
+        
         # Table
-        self.table = QTableWidget()
-        self.table.setColumnCount(6)
-        self.table.setHorizontalHeaderLabels(["ID", "NIK", "Nama", "Tanggal Lahir", "Status", "Gaji"])
+        self.table_model = CustomerTableModel(self)
+        self.table = QTableView()
+        self.table.setModel(self.table_model)
+        self.table.verticalHeader().setVisible(False)
         
         # Set column widths
         header = self.table.horizontalHeader()
@@ -222,10 +379,14 @@ class MainWindow(QMainWindow):
         header.setSectionResizeMode(4, QHeaderView.ResizeMode.ResizeToContents)
         header.setSectionResizeMode(5, QHeaderView.ResizeMode.ResizeToContents)
         
-        self.table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
-        self.table.setSelectionMode(QTableWidget.SelectionMode.SingleSelection)
-        self.table.itemSelectionChanged.connect(self.on_selection_changed)
-        self.table.itemDoubleClicked.connect(self.edit_customer)
+        # Clicking a header sorts by that column in snapshot mode
+        header.setSectionsClickable(True)
+        header.sectionClicked.connect(self.on_header_clicked)
+        
+        self.table.setSelectionBehavior(QTableView.SelectionBehavior.SelectRows)
+        self.table.setSelectionMode(QTableView.SelectionMode.ExtendedSelection)
+        self.table.selectionModel().selectionChanged.connect(self.on_selection_changed)
+        self.table.doubleClicked.connect(self.edit_customer)
         
         main_layout.addWidget(self.table)
         
@@ -237,6 +398,10 @@ class MainWindow(QMainWindow):
         
         pagination_layout.addStretch()
         
+        self.first_button = QPushButton("⏮ Pertama")
+        self.first_button.clicked.connect(self.first_page)
+        pagination_layout.addWidget(self.first_button)
+        
         self.prev_button = QPushButton("◀ Sebelumnya")
         self.prev_button.clicked.connect(self.prev_page)
         pagination_layout.addWidget(self.prev_button)
@@ -248,63 +413,365 @@ class MainWindow(QMainWindow):
         self.next_button.clicked.connect(self.next_page)
         pagination_layout.addWidget(self.next_button)
         
+        self.last_button = QPushButton("Terakhir ⏭")
+        self.last_button.clicked.connect(self.last_page)
+        pagination_layout.addWidget(self.last_button)
+        
         main_layout.addLayout(pagination_layout)
         
+        # Busy indicator while database work runs in the background
+        self.busy_label = QLabel("Memuat...")
+        self.busy_bar = QProgressBar()
+        self.busy_bar.setRange(0, 0)
+        self.busy_bar.setMaximumWidth(150)
+        self.statusBar().addPermanentWidget(self.busy_label)
+        self.statusBar().addPermanentWidget(self.busy_bar)
+        
+        # Placeholder until the first page arrives
+        self.info_label.setText("Memuat data...")
+        self.on_busy_changed(True)
+        
         # Search timer for delayed search
         self.search_timer = QTimer()
         self.search_timer.setSingleShot(True)
         self.search_timer.timeout.connect(self.perform_search)
+        
+        self.summary_timer = QTimer()
+        self.summary_timer.timeout.connect(self.refresh_summary)
+        
+        # Hidden diagnostics panel with query and render timings
+        self.diagnostics_shortcut = QShortcut(QKeySequence("Ctrl+Shift+D"), self)
+        self.diagnostics_shortcut.activated.connect(self.show_diagnostics)
+        
+        # Search indexes are a one-off setup step, never created implicitly
+        self.indexes_shortcut = QShortcut(QKeySequence("Ctrl+Shift+I"), self)
+        self.indexes_shortcut.activated.connect(self.create_search_indexes)
     
     def load_data(self):
-        customers, total_records = self.controller.get_customers(
-            page=self.current_page, 
-            per_page=self.per_page, 
-            search_term=self.search_term
+        if self.infinite_scroll:
+            self.restart_scroll()
+            return
+        
+        # Reload the page currently shown
+        if self.first_idx is None:
+            self.request_page(1, PAGE_FIRST)
+        else:
+            self.request_page(self.current_page, PAGE_CURRENT, self.first_idx)
+    
+    def request_page(self, page, direction, anchor_idx=None):
+        if self.controller is None:
+            return  # start() loads the current page once ready
+        started = time.perf_counter()
+        
+        def loaded(result):
+            with instrumentation.timer('gui.render'):
+                self.show_page(page, *result, direction=direction)
+            # From the request to the rows being in the grid
+            instrumentation.record('gui.load_data', time.perf_counter() - started)
+        
+        if self.snapshot_mode:
+            self.controller.load_snapshot_rows(
+                'load', (page - 1) * self.per_page, self.per_page, self.search_term,
+                self.sort_column, self.sort_descending, on_result=loaded
+            )
+            return
+        self.controller.load_customers(
+            self.per_page, self.search_term, direction, anchor_idx, on_result=loaded
         )
+    
+    def show_page(self, page, customers, total_records, direction=PAGE_CURRENT):
+        if self.infinite_scroll:
+            return  # a paged load finished after switching to infinite scroll
         
         self.total_records = total_records
         self.total_pages = max(1, (total_records + self.per_page - 1) // self.per_page)
         
-        # Update table
-        self.table.setRowCount(len(customers))
-        
-        for row, customer in enumerate(customers):
-            self.table.setItem(row, 0, QTableWidgetItem(str(customer['idx'])))
-            self.table.setItem(row, 1, QTableWidgetItem(customer['nik']))
-            self.table.setItem(row, 2, QTableWidgetItem(customer['name']))
-            
-            born_str = customer['born'].strftime('%d-%m-%Y') if customer['born'] else ''
-            self.table.setItem(row, 3, QTableWidgetItem(born_str))
-            
-            status_str = "Aktif" if customer['active'] else "Tidak Aktif"
-            self.table.setItem(row, 4, QTableWidgetItem(status_str))
-            
-            salary_str = f"Rp {customer['salary']:,}" if customer['salary'] else "Rp 0"
-            self.table.setItem(row, 5, QTableWidgetItem(salary_str))
+        if not customers and total_records > 0 and direction != PAGE_LAST:
+            # The rows of this page are gone (e.g. deleted); fall back to the last page
+            self.request_page(self.total_pages, PAGE_LAST)
+            return
+        
+        self.current_page = min(page, self.total_pages)
+        self.first_idx = customers[0].idx if customers else None
+        self.last_idx = customers[-1].idx if customers else None
+        
+        # Update table; cells are formatted by the model as they are painted
+        self.table_model.set_rows(customers)
+        self.update_page_info()
+        self.first_data_shown()
+        
+        # Clear selection
+        self.table.clearSelection()
+        self.on_selection_changed()
+        
+        if customers:
+            self.cache_page(self.current_page, customers, total_records)
+            self.prefetch_adjacent_pages()
+    
+    def update_page_info(self):
+        if self.infinite_scroll:
+            self.update_scroll_info()
+            return
         
         # Update pagination info
+        shown = self.table_model.rowCount()
         start_record = (self.current_page - 1) * self.per_page + 1
-        end_record = min(self.current_page * self.per_page, total_records)
+        end_record = start_record + shown - 1
         
-        if total_records > 0:
-            self.info_label.setText(f"Menampilkan {start_record}-{end_record} dari {total_records} data")
+        if self.total_records > 0:
+            self.info_label.setText(f"Menampilkan {start_record}-{end_record} dari {self.total_records} data")
         else:
             self.info_label.setText("Tidak ada data")
         
         self.page_label.setText(f"Halaman {self.current_page} dari {self.total_pages}")
         
         # Update button states
+        self.first_button.setEnabled(self.current_page > 1)
         self.prev_button.setEnabled(self.current_page > 1)
         self.next_button.setEnabled(self.current_page < self.total_pages)
-        
-        # Clear selection
-        self.table.clearSelection()
+        self.last_button.setEnabled(self.current_page < self.total_pages)
+    
+    def cache_page(self, page, customers, total_records):
+        self.page_cache[page] = (customers, total_records)
+        self.page_cache.move_to_end(page)
+        while len(self.page_cache) > PAGE_CACHE_SIZE:
+            self.page_cache.popitem(last=False)
+    
+    def reset_page_cache(self):
+        self.page_cache.clear()
+        self.prefetching.clear()
+        self.page_cache_generation += 1
+    
+    def prefetch_adjacent_pages(self):
+        if self.current_page < self.total_pages:
+            self.prefetch_page(self.current_page + 1, PAGE_NEXT, self.last_idx)
+        if self.current_page > 1:
+            self.prefetch_page(self.current_page - 1, PAGE_PREV, self.first_idx)
+    
+    def prefetch_page(self, page, direction, anchor_idx):
+        if self.controller is None or page in self.page_cache or page in self.prefetching:
+            return
+        if self.snapshot_mode:
+            return  # pages come from memory anyway
+        
+        generation = self.page_cache_generation
+        self.prefetching.add(page)
+        
+        def store(result):
+            if generation != self.page_cache_generation:
+                return  # search, page size or data changed meanwhile
+            self.prefetching.discard(page)
+            customers, total_records = result
+            if customers:
+                self.cache_page(page, customers, total_records)
+        
+        def forget(message):
+            if generation == self.page_cache_generation:
+                self.prefetching.discard(page)
+        
+        run_in_background(
+            self.controller.get_customers_keyset,
+            per_page=self.per_page,
+            search_term=self.search_term,
+            direction=direction,
+            anchor_idx=anchor_idx,
+            on_result=store,
+            on_error=forget
+        )
+    
+    def on_infinite_scroll_toggled(self, checked):
+        self.infinite_scroll = checked
+        for widget in (self.first_button, self.prev_button, self.page_label,
+                       self.next_button, self.last_button):
+            widget.setVisible(not checked)
+        self.per_page_combo.setEnabled(not checked)
+        
+        self.reset_page_cache()
+        if checked:
+            self.restart_scroll()
+        else:
+            self.table_model.set_fetcher(None)
+            self.first_idx = None
+            self.load_data()
+    
+    def restart_scroll(self):
+        self.scroll_generation += 1
+        self.table_model.set_fetcher(self.fetch_scroll_batch)
+        self.on_selection_changed()
+        self.table_model.fetchMore(QModelIndex())
+    
+    def fetch_scroll_batch(self, after_idx):
+        if self.controller is None:
+            return  # start() restarts the scroll once ready
+        generation = self.scroll_generation
+        started = time.perf_counter()
+        
+        def arrived(result):
+            if generation != self.scroll_generation:
+                return  # the list was restarted meanwhile
+            customers, total_records = result
+            self.total_records = total_records
+            with instrumentation.timer('gui.render'):
+                self.table_model.add_batch(customers, exhausted=len(customers) < SCROLL_BATCH_SIZE)
+                self.update_scroll_info()
+            self.first_data_shown()
+            instrumentation.record('gui.scroll_batch', time.perf_counter() - started)
+        
+        def failed(message):
+            if generation == self.scroll_generation:
+                print(f"Error loading more customers: {message}")
+                self.table_model.add_batch([], exhausted=True)
+        
+        if self.snapshot_mode:
+            # A sorted list has no idx to seek from; continue by position
+            self.controller.load_snapshot_rows(
+                'scroll', self.table_model.rowCount(), SCROLL_BATCH_SIZE, self.search_term,
+                self.sort_column, self.sort_descending, on_result=arrived, on_error=failed
+            )
+            return
+        self.controller.load_more_customers(
+            SCROLL_BATCH_SIZE, self.search_term, after_idx, on_result=arrived, on_error=failed
+        )
+    
+    def update_scroll_info(self):
+        loaded = self.table_model.rowCount()
+        if self.total_records > 0:
+            self.info_label.setText(f"Menampilkan {loaded} dari {self.total_records} data")
+        else:
+            self.info_label.setText("Tidak ada data")
+    
+    def on_data_changed(self):
+        self.reset_page_cache()
+        self.load_data()
+        self.refresh_summary()
+    
+    # Single-row writes patch the grid in place. A full reload is only needed
+    # when rows move across page boundaries, or when a search or a column sort
+    # is active and we cannot tell locally where the row belongs.
+    
+    def sorted_by_idx(self):
+        return self.sort_column == 'idx' and not self.sort_descending
+    
+    def on_customer_created(self, customer):
+        if self.search_term or not self.sorted_by_idx():
+            self.on_data_changed()
+            return
+        
+        # New rows get the highest idx, so they always land on the last page
+        self.total_records += 1
+        if self.infinite_scroll:
+            if self.table_model.exhausted:
+                self.table_model.append_rows([customer])
+        elif (self.current_page == self.total_pages
+                and self.table_model.rowCount() < self.per_page):
+            self.table_model.append_rows([customer])
+        self.after_local_change()
+    
+    def on_customer_updated(self, customer):
+        if self.search_term or not self.sorted_by_idx():
+            self.on_data_changed()
+            return
+        
+        row = self.table_model.row_of(customer.idx)
+        if row >= 0:
+            self.table_model.replace_row(row, customer)
+        self.after_local_change()
+    
+    def on_customer_deleted(self, idx):
+        row = self.table_model.row_of(idx)
+        on_last_page = self.current_page == self.total_pages
+        if row < 0 or not (self.infinite_scroll or on_last_page):
+            # The next page's first row has to move up into this one
+            self.on_data_changed()
+            return
+        
+        self.table_model.remove_row(row)
+        self.total_records -= 1
+        if not self.infinite_scroll and self.table_model.rowCount() == 0:
+            self.on_data_changed()  # page emptied; show_page falls back a page
+            return
+        self.after_local_change()
+    
+    def after_local_change(self):
+        self.total_pages = max(1, (self.total_records + self.per_page - 1) // self.per_page)
+        rows = self.table_model.rows
+        self.first_idx = rows[0].idx if rows else None
+        self.last_idx = rows[-1].idx if rows else None
+        self.update_page_info()
         self.on_selection_changed()
+        
+        # Other cached pages may hold shifted rows or stale totals
+        self.reset_page_cache()
+        if rows and not self.infinite_scroll:
+            self.cache_page(self.current_page, list(rows), self.total_records)
+            self.prefetch_adjacent_pages()
+        self.refresh_summary()
+    
+    def on_busy_changed(self, busy):
+        self.busy_label.setVisible(busy)
+        self.busy_bar.setVisible(busy)
     
     def on_selection_changed(self):
-        has_selection = len(self.table.selectedItems()) > 0
-        self.edit_button.setEnabled(has_selection)
-        self.delete_button.setEnabled(has_selection)
+        selected = len(self.table.selectionModel().selectedRows())
+        self.edit_button.setEnabled(selected == 1)
+        self.delete_button.setEnabled(selected > 0)
+        
+        bulk_enabled = self.controller is not None and (selected > 0 or self.bulk_all_check.isChecked())
+        for button in (self.activate_button, self.deactivate_button, self.salary_button):
+            button.setEnabled(bulk_enabled)
+        self.selection_label.setText(f"{selected} baris dipilih" if selected else "")
+    
+    def on_snapshot_toggled(self, checked):
+        if not checked:
+            self.snapshot_mode = False
+            self.sort_column = 'idx'
+            self.sort_descending = False
+            self.controller.drop_snapshot()
+            self.update_sort_indicator()
+            self.reset_page_cache()
+            self.first_idx = None
+            self.load_data()
+            return
+        
+        # The grid keeps reading from the database until the copy is loaded
+        self.snapshot_check.setEnabled(False)
+        
+        def loaded(rows):
+            self.snapshot_check.setEnabled(True)
+            if rows is None:
+                self.snapshot_check.setChecked(False)
+                self.controller.show_error_message("Gagal memuat data ke memori!")
+                return
+            self.snapshot_mode = True
+            self.statusBar().showMessage(f"{rows:,} data dimuat ke memori", 5000)
+            self.update_sort_indicator()
+            self.reset_page_cache()
+            self.load_data()
+        
+        self.controller.load_snapshot(on_result=loaded, on_error=lambda message: loaded(None))
+    
+    def on_header_clicked(self, section):
+        if not self.snapshot_mode:
+            return
+        column = CUSTOMER_COLUMNS[section]
+        if column == self.sort_column:
+            self.sort_descending = not self.sort_descending
+        else:
+            self.sort_column = column
+            self.sort_descending = False
+        self.update_sort_indicator()
+        
+        self.reset_page_cache()
+        if self.infinite_scroll:
+            self.restart_scroll()
+        else:
+            self.first_page()
+    
+    def update_sort_indicator(self):
+        header = self.table.horizontalHeader()
+        header.setSortIndicatorShown(self.snapshot_mode)
+        order = Qt.SortOrder.DescendingOrder if self.sort_descending else Qt.SortOrder.AscendingOrder
+        header.setSortIndicator(CUSTOMER_COLUMNS.index(self.sort_column), order)
     
     def on_search_changed(self):
         self.search_timer.stop()
@@ -312,53 +779,148 @@ class MainWindow(QMainWindow):
     
     def perform_search(self):
         self.search_term = self.search_input.text().strip()
-        self.current_page = 1
-        self.load_data()
+        self.reset_page_cache()
+        if self.infinite_scroll:
+            self.restart_scroll()
+        else:
+            self.first_page()
     
     def on_per_page_changed(self, value):
         self.per_page = int(value)
-        self.current_page = 1
-        self.load_data()
+        self.reset_page_cache()
+        self.first_page()
+    
+    def go_to_page(self, page, direction, anchor_idx=None):
+        cached = self.page_cache.get(page)
+        if cached:
+            with instrumentation.timer('gui.render'):
+                self.show_page(page, *cached)
+            return
+        
+        self.request_page(page, direction, anchor_idx)
+    
+    def first_page(self):
+        self.go_to_page(1, PAGE_FIRST)
+    
+    def last_page(self):
+        self.go_to_page(self.total_pages, PAGE_LAST)
     
     def prev_page(self):
-        if self.current_page > 1:
-            self.current_page -= 1
-            self.load_data()
+        if self.current_page > 1 and self.first_idx is not None:
+            self.go_to_page(self.current_page - 1, PAGE_PREV, self.first_idx)
     
     def next_page(self):
-        if self.current_page < self.total_pages:
-            self.current_page += 1
-            self.load_data()
+        if self.current_page < self.total_pages and self.last_idx is not None:
+            self.go_to_page(self.current_page + 1, PAGE_NEXT, self.last_idx)
     
     def add_customer(self):
+        from views.customer_form import CustomerForm  # Loaded on first use
         form = CustomerForm(self.controller, parent=self)
-        form.data_saved.connect(self.load_data)
         form.exec()
     
+    def selected_customer(self):
+        rows = self.table.selectionModel().selectedRows()
+        return self.table_model.customer_at(rows[0].row()) if rows else None
+    
     def edit_customer(self):
-        current_row = self.table.currentRow()
-        if current_row >= 0:
-            customer_id = int(self.table.item(current_row, 0).text())
-            customer_data = self.controller.get_customer(customer_id)
-            
-            if customer_data:
-                form = CustomerForm(self.controller, customer_data, parent=self)
-                form.data_saved.connect(self.load_data)
-                form.exec()
+        customer = self.selected_customer()
+        if customer:
+            self.controller.fetch_customer(customer.idx, on_result=self.open_edit_form)
+    
+    def open_edit_form(self, customer_data):
+        if customer_data:
+            from views.customer_form import CustomerForm
+            form = CustomerForm(self.controller, customer_data, parent=self)
+            form.exec()
+    
+    def selected_idxs(self):
+        rows = sorted(index.row() for index in self.table.selectionModel().selectedRows())
+        return [self.table_model.customer_at(row).idx for row in rows]
     
     def delete_customer(self):
-        current_row = self.table.currentRow()
-        if current_row >= 0:
-            customer_id = int(self.table.item(current_row, 0).text())
-            self.controller.delete_customer(customer_id)
+        idxs = self.selected_idxs()
+        if len(idxs) == 1:
+            self.controller.delete_customer(idxs[0])  # patched in place
+        elif idxs:
+            self.controller.delete_customers(idxs)
+    
+    def bulk_target(self):
+        # (idxs, search_term) for the bulk model methods
+        if self.bulk_all_check.isChecked():
+            return None, self.search_term
+        return self.selected_idxs(), ""
+    
+    def set_active_in_bulk(self, active):
+        idxs, search_term = self.bulk_target()
+        self.controller.set_customers_active(active, idxs, search_term)
+    
+    def adjust_salaries_in_bulk(self):
+        percent, ok = QInputDialog.getDouble(
+            self, "Ubah Gaji", "Persentase perubahan gaji (mis. 10 atau -5):",
+            0.0, -99.99, 1000.0, 2
+        )
+        if ok and percent:
+            idxs, search_term = self.bulk_target()
+            self.controller.adjust_salaries(percent, idxs, search_term)
     
     def upload_csv(self):
         self.controller.import_csv(self)
     
     def download_csv(self):
         self.controller.export_csv(self)
+    
+    def toggle_summary(self, checked):
+        if checked and self.summary_dock is None:
+            from views.summary_panel import SummaryPanel  # Loaded on first use
+            self.summary_panel = SummaryPanel()
+            self.summary_dock = QDockWidget("Ringkasan", self)
+            self.summary_dock.setWidget(self.summary_panel)
+            self.summary_dock.visibilityChanged.connect(self.summary_button.setChecked)
+            self.addDockWidget(Qt.DockWidgetArea.RightDockWidgetArea, self.summary_dock)
+        if self.summary_dock is None:
+            return
+        
+        self.summary_dock.setVisible(checked)
+        if checked:
+            self.summary_timer.start(SUMMARY_REFRESH_MS)
+            self.refresh_summary()
+        else:
+            self.summary_timer.stop()
+    
+    def refresh_summary(self):
+        # Cheap: the model answers from its running totals
+        if self.controller is None or self.summary_dock is None or not self.summary_dock.isVisible():
+            return
+        self.controller.load_summary(on_result=self.summary_panel.show_summary)
+    
+    def create_search_indexes(self):
+        if self.controller is not None:
+            self.controller.create_search_indexes()
+    
+    def show_diagnostics(self):
+        if self.diagnostics_panel is None:
+            from views.diagnostics_panel import DiagnosticsPanel
+            self.diagnostics_panel = DiagnosticsPanel(self.diagnostic_stats, parent=self)
+        self.diagnostics_panel.show()
+        self.diagnostics_panel.raise_()
+        self.diagnostics_panel.activateWindow()
+    
+    def diagnostic_stats(self):
+        if self.controller is None:
+            return {}
+        model = self.controller.model
+        return {
+            'Pool': model.pool_stats(),
+            'Cache': model.cache_stats(),
+            'Prepared': model.statement_stats(),
+            'Summary': model.summary_stats(),
+            'Snapshot': model.snapshot_stats(),
+        }
 
 def main():
+    startup = StartupTimer(STARTED)
+    startup.mark('imports')
+    
     app = QApplication(sys.argv)
     
     # Set application properties
@@ -366,8 +928,10 @@ def main():
     app.setApplicationVersion("1.0")
     app.setOrganizationName("PyQt6 CRUD")
     
-    # Create and show main window
-    window = MainWindow()
+    threading.Thread(target=preload_database_layer, name="preload", daemon=True).start()
+    
+    # Create and show main window; the first page loads after the first paint
+    window = MainWindow(startup)
     window.show()
     
     # Run application
@@ -1,60 +1,248 @@
-from config.database import DatabaseConfig
-from mysql.connector import Error
-import csv
-from datetime import datetime
+from config.database import DatabaseConfig, DatabaseError
+from models.customer_record import CUSTOMER_SELECT, CustomerRecord, to_records
+from models.customer_import import (
+    DEFAULT_CHUNK_SIZE, DEFAULT_WRITER_THREADS, IMPORT_BATCHED, IMPORT_PIPELINE, IMPORT_LOAD_DATA,
+    DUPLICATE_INSERT, DUPLICATE_SKIP, DUPLICATE_UPDATE_CHANGED, UPSERT_MODES,
+    DuplicateFilter, DuplicateNikError, ImportResult, MissingNikIndexError,
+    insert_query_for, insert_chunk, open_chunks, run_import_pipeline, write_load_data_file
+)
+from models.customer_snapshot import CustomerSnapshot
+from models.customer_summary import Aggregate, SummaryStore
+from models.customer_export import (
+    DEFAULT_EXPORT_FORMAT, EXPORT_FORMATS_BY_NAME, export_records, format_for_path
+)
+from models.import_checkpoint import CheckpointStore, ImportTracker, file_fingerprint
+from models.paging import PAGE_FIRST, PAGE_PREV, PAGE_CURRENT, PAGE_NEXT, PAGE_LAST
+from models.query_cache import MISSING, QueryCache
+from models.search_query import SearchQueryError, compile_search, like_condition
+from models.statement_cache import StatementCache
+import os
+import tempfile
+
+EXPORT_BATCH_SIZE = 5000
+
+# Search modes: the index-friendly query language or the original substring LIKE
+SEARCH_COMPILED = 'compiled'
+SEARCH_LIKE = 'like'
+
+# Page and count results are reused until a write or the TTL (seconds) expires
+QUERY_CACHE_SIZE = 256
+QUERY_CACHE_TTL = 30
+
+# Ids per IN (...) list in bulk writes; SQLite before 3.32 allows 999 parameters
+BULK_CHUNK_SIZE = 500
+
+# Tries at a full snapshot load before giving up on a table that keeps changing
+SNAPSHOT_LOAD_ATTEMPTS = 3
+
+# Server or client refusing LOAD DATA LOCAL INFILE: ER_NOT_ALLOWED_COMMAND,
+# CR_LOAD_DATA_LOCAL_INFILE_REJECTED, ER_CLIENT_LOCAL_FILES_DISABLED
+LOCAL_INFILE_DISABLED_ERRORS = {1148, 2068, 3948}
 
 class Customer:
     def __init__(self):
         self.db_config = DatabaseConfig()
+        # Connection details and the statements that differ per database
+        self.backend = self.db_config.backend
+        self.search_mode = SEARCH_COMPILED
+        self.fulltext_available = self.backend.supports_fulltext
+        self.query_cache = QueryCache(QUERY_CACHE_SIZE, QUERY_CACHE_TTL)
+        # Prepared cursors for the hot statements, per pooled connection
+        self.statements = StatementCache(self.backend.prepared_cursor)
+        # Running totals for the summary panel, kept current by the writes below
+        self.summary = SummaryStore()
+        # In-memory columns for snapshot mode, also kept current by the writes
+        self.snapshot = CustomerSnapshot()
+        self.local_infile_available = True
+        self.checkpoints = CheckpointStore()
+    
+    def _release(self, connection, cursor=None):
+        # Return the borrowed connection to the pool instead of closing it
+        if cursor is not None:
+            try:
+                cursor.close()
+            except DatabaseError:
+                pass
+        self.db_config.release_connection(connection)
+    
+    def pool_stats(self):
+        return self.db_config.pool_stats()
+    
+    def cache_stats(self):
+        return self.query_cache.stats()
+    
+    def statement_stats(self):
+        return self.statements.stats()
+    
+    def snapshot_stats(self):
+        return self.snapshot.stats()
+    
+    def _cache_key(self, kind, search_term, *args):
+        # The search mode changes the compiled SQL, so it is part of the key
+        return (kind, self.search_mode, self.fulltext_available, search_term) + args
+    
+    def _search_condition(self, search_term):
+        # Returns the WHERE predicate (without the keyword) and its params
+        if not search_term:
+            return "", []
+        
+        if self.search_mode == SEARCH_LIKE:
+            return like_condition(search_term, self.backend.born_text)
+        
+        try:
+            return compile_search(search_term, use_fulltext=self.fulltext_available)
+        except SearchQueryError as e:
+            # Input the compiler cannot read still gets the old substring search
+            print(f"Falling back to LIKE search for {search_term!r}: {e}")
+            return like_condition(search_term, self.backend.born_text)
+    
+    def _fulltext_missing(self, error):
+        # ER_FT_MATCHING_KEY_NOT_FOUND: no FULLTEXT index on name yet
+        if getattr(error, 'errno', None) == 1191 and self.fulltext_available:
+            print("FULLTEXT index on customer.name not found, searching names with LIKE "
+                  "(create the search indexes with Ctrl+Shift+I)")
+            self.fulltext_available = False
+            return True
+        return False
+    
+    def create_search_indexes(self):
+        connection = self.db_config.get_connection()
+        if not connection:
+            return False
+        
+        # An explicit setup step (Ctrl+Shift+I in the app, or the benchmarks):
+        # on a large table the FULLTEXT build can take minutes
+        try:
+            self.db_config.create_search_indexes(connection)
+            self.fulltext_available = self.backend.supports_fulltext
+            return True
+        except DatabaseError as e:
+            print(f"Error creating search indexes: {e}")
+            return False
+        finally:
+            self._release(connection)
+    
+    @staticmethod
+    def _where(conditions):
+        conditions = [condition for condition in conditions if condition]
+        return "WHERE " + " AND ".join(conditions) if conditions else ""
+    
+    def _count_customers(self, connection, search_term, search_condition, search_params, generation):
+        # One COUNT per search term serves every page of that search
+        cache_key = self._cache_key('count', search_term)
+        total = self.query_cache.get(cache_key)
+        if total is not MISSING:
+            return total
+        
+        count_query = f"SELECT COUNT(*) as total FROM customer {self._where([search_condition])}"
+        total = self.statements.execute(connection, count_query, search_params).fetchall()[0][0]
+        self.query_cache.put(cache_key, total, generation)
+        return total
     
     def get_all_customers(self, page=1, per_page=10, search_term=""):
+        cache_key = self._cache_key('offset', search_term, page, per_page)
+        cached = self.query_cache.get(cache_key)
+        if cached is not MISSING:
+            return list(cached[0]), cached[1]
+        generation = self.query_cache.generation
+        
         connection = self.db_config.get_connection()
         if not connection:
             return [], 0
         
         try:
-            cursor = connection.cursor(dictionary=True)
-            
-            # Build search condition
-            search_condition = ""
-            search_params = []
-            
-            if search_term:
-                search_condition = """
-                WHERE nik LIKE %s OR name LIKE %s OR 
-                      DATE_FORMAT(born, '%Y-%m-%d') LIKE %s OR 
-                      active LIKE %s OR salary LIKE %s
-                """
-                search_value = f"%{search_term}%"
-                search_params = [search_value] * 5
+            search_condition, search_params = self._search_condition(search_term)
             
             # Get total count
-            count_query = f"SELECT COUNT(*) as total FROM customer {search_condition}"
-            cursor.execute(count_query, search_params)
-            total_records = cursor.fetchone()['total']
+            total_records = self._count_customers(
+                connection, search_term, search_condition, search_params, generation
+            )
             
             # Get paginated data
             offset = (page - 1) * per_page
             data_query = f"""
-                SELECT idx, nik, name, born, active, salary 
-                FROM customer {search_condition}
+                SELECT {CUSTOMER_SELECT} 
+                FROM customer {self._where([search_condition])}
                 ORDER BY idx 
                 LIMIT %s OFFSET %s
             """
             
             params = search_params + [per_page, offset]
-            cursor.execute(data_query, params)
-            customers = cursor.fetchall()
+            customers = to_records(self.statements.execute(connection, data_query, params).fetchall())
             
+            self.query_cache.put(cache_key, (tuple(customers), total_records), generation)
             return customers, total_records
             
-        except Error as e:
-            print(f"Error fetching customers: {e}")
+        except DatabaseError as e:
+            if not self._fulltext_missing(e):
+                print(f"Error fetching customers: {e}")
+                return [], 0
+        finally:
+            self._release(connection)
+        
+        return self.get_all_customers(page, per_page, search_term)
+    
+    def get_customers_keyset(self, per_page=10, search_term="", direction=PAGE_FIRST, anchor_idx=None):
+        # Seeks from a known idx instead of skipping OFFSET rows, so every page
+        # costs the same as the first one
+        cache_key = self._cache_key('keyset', search_term, direction, anchor_idx, per_page)
+        cached = self.query_cache.get(cache_key)
+        if cached is not MISSING:
+            return list(cached[0]), cached[1]
+        generation = self.query_cache.generation
+        
+        connection = self.db_config.get_connection()
+        if not connection:
             return [], 0
+        
+        try:
+            search_condition, search_params = self._search_condition(search_term)
+            total_records = self._count_customers(
+                connection, search_term, search_condition, search_params, generation
+            )
+            
+            limit = per_page
+            seek_condition = ""
+            seek_params = []
+            descending = direction in (PAGE_PREV, PAGE_LAST)
+            
+            if direction == PAGE_NEXT and anchor_idx is not None:
+                seek_condition = "idx > %s"
+                seek_params = [anchor_idx]
+            elif direction == PAGE_CURRENT and anchor_idx is not None:
+                seek_condition = "idx >= %s"
+                seek_params = [anchor_idx]
+            elif direction == PAGE_PREV and anchor_idx is not None:
+                seek_condition = "idx < %s"
+                seek_params = [anchor_idx]
+            elif direction == PAGE_LAST:
+                # Keep the last page aligned with offset paging: it only holds the remainder
+                remainder = total_records % per_page
+                limit = remainder or per_page
+            
+            data_query = f"""
+                SELECT {CUSTOMER_SELECT} 
+                FROM customer {self._where([search_condition, seek_condition])}
+                ORDER BY idx {'DESC' if descending else 'ASC'} 
+                LIMIT %s
+            """
+            
+            params = search_params + seek_params + [limit]
+            customers = to_records(self.statements.execute(connection, data_query, params).fetchall())
+            if descending:
+                customers.reverse()
+            
+            self.query_cache.put(cache_key, (tuple(customers), total_records), generation)
+            return customers, total_records
+            
+        except DatabaseError as e:
+            if not self._fulltext_missing(e):
+                print(f"Error fetching customers: {e}")
+                return [], 0
         finally:
-            if connection.is_connected():
-                cursor.close()
-                connection.close()
+            self._release(connection)
+        
+        return self.get_customers_keyset(per_page, search_term, direction, anchor_idx)
     
     def get_customer_by_id(self, idx):
         connection = self.db_config.get_connection()
@@ -62,62 +250,70 @@ class Customer:
             return None
         
         try:
-            cursor = connection.cursor(dictionary=True)
-            query = "SELECT * FROM customer WHERE idx = %s"
-            cursor.execute(query, (idx,))
-            return cursor.fetchone()
-        except Error as e:
+            query = f"SELECT {CUSTOMER_SELECT} FROM customer WHERE idx = %s"
+            rows = self.statements.execute(connection, query, (idx,)).fetchall()
+            return CustomerRecord._make(rows[0]) if rows else None
+        except DatabaseError as e:
             print(f"Error fetching customer: {e}")
             return None
         finally:
-            if connection.is_connected():
-                cursor.close()
-                connection.close()
+            self._release(connection)
     
     def create_customer(self, nik, name, born, active, salary):
+        # Returns the new CustomerRecord, or None when the insert failed;
+        # raises DuplicateNikError when the unique NIK index rejects nik
         connection = self.db_config.get_connection()
         if not connection:
-            return False
+            return None
         
         try:
-            cursor = connection.cursor()
             query = """
                 INSERT INTO customer (nik, name, born, active, salary) 
                 VALUES (%s, %s, %s, %s, %s)
             """
-            cursor.execute(query, (nik, name, born, active, salary))
+            cursor = self.statements.execute(connection, query, (nik, name, born, active, salary))
             connection.commit()
-            return True
-        except Error as e:
+            customer = CustomerRecord(cursor.lastrowid, nik, name, born, active, salary)
+            self.query_cache.invalidate()
+            self.summary.add(active, salary, born)
+            self.snapshot.apply([customer])
+            return customer
+        except DatabaseError as e:
             print(f"Error creating customer: {e}")
-            return False
+            if self.backend.is_duplicate_key(e):
+                raise DuplicateNikError(f"NIK {nik} sudah terdaftar") from None
+            return None
         finally:
-            if connection.is_connected():
-                cursor.close()
-                connection.close()
+            self._release(connection)
     
     def update_customer(self, idx, nik, name, born, active, salary):
+        # Returns the updated CustomerRecord, or None when the update failed;
+        # raises DuplicateNikError when the unique NIK index rejects nik
         connection = self.db_config.get_connection()
         if not connection:
-            return False
+            return None
         
         try:
-            cursor = connection.cursor()
+            old = self._summary_row(connection, idx)
             query = """
                 UPDATE customer 
                 SET nik = %s, name = %s, born = %s, active = %s, salary = %s 
                 WHERE idx = %s
             """
-            cursor.execute(query, (nik, name, born, active, salary, idx))
+            self.statements.execute(connection, query, (nik, name, born, active, salary, idx))
             connection.commit()
-            return True
-        except Error as e:
+            customer = CustomerRecord(idx, nik, name, born, active, salary)
+            self.query_cache.invalidate()
+            self.summary.replace(old, (active, salary, born))
+            self.snapshot.apply([customer])
+            return customer
+        except DatabaseError as e:
             print(f"Error updating customer: {e}")
-            return False
+            if self.backend.is_duplicate_key(e):
+                raise DuplicateNikError(f"NIK {nik} sudah terdaftar") from None
+            return None
         finally:
-            if connection.is_connected():
-                cursor.close()
-                connection.close()
+            self._release(connection)
     
     def delete_customer(self, idx):
         connection = self.db_config.get_connection()
@@ -125,75 +321,572 @@ class Customer:
             return False
         
         try:
-            cursor = connection.cursor()
+            old = self._summary_row(connection, idx)
             query = "DELETE FROM customer WHERE idx = %s"
-            cursor.execute(query, (idx,))
+            self.statements.execute(connection, query, (idx,))
             connection.commit()
+            self.query_cache.invalidate()
+            if old is not None:
+                self.summary.remove(*old)
+            elif self.summary.tracking:
+                self.summary.invalidate()
+            self.snapshot.apply(deleted=[idx])
             return True
-        except Error as e:
+        except DatabaseError as e:
             print(f"Error deleting customer: {e}")
             return False
         finally:
-            if connection.is_connected():
-                cursor.close()
-                connection.close()
-    
-    def import_from_csv(self, file_path):
-        success_count = 0
-        error_count = 0
-        
-        try:
-            with open(file_path, 'r', encoding='utf-8') as file:
-                csv_reader = csv.reader(file, delimiter=';')
-                next(csv_reader)  # Skip header row
-                
-                for row in csv_reader:
-                    if len(row) >= 5:
-                        try:
-                            nik = row[0]
-                            name = row[1]
-                            born = datetime.strptime(row[2], '%Y-%m-%d').date() if row[3] else None
-                            active = int(row[3]) if row[3] else 0
-                            salary = int(row[4]) if row[4] else 0
-                            
-                            if self.create_customer(nik, name, born, active, salary):
-                                success_count += 1
-                            else:
-                                error_count += 1
-                        except Exception as e:
-                            print(f"Error processing row {row}: {e}")
-                            error_count += 1
-                    else:
-                        error_count += 1
+            self._release(connection)
+    
+    # Bulk writes run set-based statements in one transaction and return the
+    # number of rows affected, or None when nothing was written. idxs is
+    # worked through in BULK_CHUNK_SIZE pieces; without idxs the statement
+    # covers every row matching search_term (every row when it is empty).
+    
+    def delete_customers(self, idxs):
+        return self._bulk_write("DELETE FROM customer", [], idxs, None, "deleting customers")
+    
+    def set_customers_active(self, active, idxs=None, search_term=""):
+        return self._bulk_write(
+            "UPDATE customer SET active = %s", [1 if active else 0],
+            idxs, search_term, "updating customer status"
+        )
+    
+    def adjust_salaries(self, percent, idxs=None, search_term=""):
+        # Rounded to whole rupiah; percent must stay above -100
+        if percent <= -100:
+            raise ValueError("percent must be greater than -100")
+        return self._bulk_write(
+            "UPDATE customer SET salary = ROUND(salary * %s)", [1 + percent / 100],
+            idxs, search_term, "adjusting salaries"
+        )
+    
+    def _bulk_write(self, statement, params, idxs, search_term, action):
+        if idxs is not None:
+            idxs = list(idxs)
+            if not idxs:
+                return 0
+        
+        connection = self.db_config.get_connection()
+        if not connection:
+            return None
+        
+        cursor = None
+        try:
+            cursor = connection.cursor()
+            affected = 0
+            touched = idxs
+            if idxs is not None:
+                for start in range(0, len(idxs), BULK_CHUNK_SIZE):
+                    chunk = idxs[start:start + BULK_CHUNK_SIZE]
+                    placeholders = ", ".join(["%s"] * len(chunk))
+                    cursor.execute(f"{statement} WHERE idx IN ({placeholders})", params + chunk)
+                    affected += cursor.rowcount
+            else:
+                search_condition, search_params = self._search_condition(search_term)
+                where = self._where([search_condition])
+                if self.snapshot.loaded:
+                    # The rows about to change, to re-read into the snapshot
+                    cursor.execute(f"SELECT idx FROM customer {where}", search_params)
+                    touched = [row[0] for row in cursor.fetchall()]
+                cursor.execute(f"{statement} {where}", params + search_params)
+                affected = cursor.rowcount
+            connection.commit()
+        except DatabaseError as e:
+            connection.rollback()
+            if not self._fulltext_missing(e):
+                print(f"Error {action}: {e}")
+                return None
+        else:
+            self.query_cache.invalidate()
+            self.summary.invalidate()  # Recounted the next time it is read
+            self._sync_snapshot(cursor, touched)
+            return affected
+        finally:
+            self._release(connection, cursor)
+        
+        return self._bulk_write(statement, params, idxs, search_term, action)
+    
+    def _sync_snapshot(self, cursor, idxs):
+        # Re-reads the rows a bulk write touched into the snapshot; rows that
+        # are gone are removed from it
+        if idxs is None or not self.snapshot.loaded:
+            self.snapshot.invalidate()  # also drops a load that overlapped the write
+            return
+        
+        records = []
+        try:
+            for start in range(0, len(idxs), BULK_CHUNK_SIZE):
+                chunk = idxs[start:start + BULK_CHUNK_SIZE]
+                placeholders = ", ".join(["%s"] * len(chunk))
+                cursor.execute(f"SELECT {CUSTOMER_SELECT} FROM customer WHERE idx IN ({placeholders})", chunk)
+                records.extend(to_records(cursor.fetchall()))
+        except DatabaseError as e:
+            print(f"Error refreshing snapshot: {e}")
+            self.snapshot.invalidate()
+            return
+        found = {record.idx for record in records}
+        self.snapshot.apply(records, [idx for idx in idxs if idx not in found])
+    
+    # Summary statistics. Reading them costs no query while the running totals
+    # are current; a full recount runs on first use, after bulk writes and
+    # upsert imports, and every SUMMARY_REFRESH_INTERVAL seconds.
+    
+    def get_summary(self):
+        # Returns a CustomerSummary, or None when the database is unreachable
+        if self.summary.needs_recount:
+            self._recount_summary()
+        elif self.summary.bounds_stale:
+            self._refresh_salary_bounds()
+        return self.summary.snapshot()
+    
+    def summary_stats(self):
+        return self.summary.stats()
+    
+    def _summary_row(self, connection, idx):
+        # (active, salary, born) before a write changes it, or None when the
+        # totals are not being tracked (they get recounted anyway)
+        if not self.summary.tracking:
+            return None
+        query = "SELECT active, salary, born FROM customer WHERE idx = %s"
+        rows = self.statements.execute(connection, query, (idx,)).fetchall()
+        return tuple(rows[0]) if rows else None
+    
+    def _aggregate(self, cursor, table):
+        cursor.execute(f"""
+            SELECT COUNT(*), SUM(CASE WHEN active <> 0 THEN 1 ELSE 0 END), 
+                   SUM(salary), MIN(salary), MAX(salary) 
+            FROM {table}
+        """)
+        count, active, salary_sum, salary_min, salary_max = cursor.fetchall()[0]
+        cursor.execute(f"SELECT {self.backend.born_year}, COUNT(*) FROM {table} GROUP BY 1")
+        born_years = {year if year is None else int(year): count for year, count in cursor.fetchall()}
+        return Aggregate(count, int(active or 0), int(salary_sum or 0), salary_min, salary_max, born_years)
+    
+    def _recount_summary(self):
+        generation = self.summary.generation
+        connection = self.db_config.get_connection()
+        if not connection:
+            return
+        
+        cursor = None
+        try:
+            cursor = connection.cursor()
+            self.summary.load(self._aggregate(cursor, "customer"), generation)
+        except DatabaseError as e:
+            print(f"Error computing customer summary: {e}")
+        finally:
+            self._release(connection, cursor)
+    
+    def _refresh_salary_bounds(self):
+        # A removed row held the lowest or highest salary; with the salary
+        # index this is two index lookups, not a scan
+        generation = self.summary.generation
+        connection = self.db_config.get_connection()
+        if not connection:
+            return
+        
+        try:
+            query = "SELECT MIN(salary), MAX(salary) FROM customer"
+            salary_min, salary_max = self.statements.execute(connection, query).fetchall()[0]
+            self.summary.set_salary_bounds(salary_min, salary_max, generation)
+        except DatabaseError as e:
+            print(f"Error reading salary range: {e}")
+        finally:
+            self._release(connection)
+    
+    def _import_counter(self, on_duplicate):
+        # Called with each committed chunk's rows when the mode only inserts
+        if on_duplicate in (DUPLICATE_INSERT, DUPLICATE_SKIP):
+            return self._count_imported
+        return None
+    
+    def _count_imported(self, values, failed):
+        # Rows of a committed import chunk. When the chunk fell back to
+        # row-by-row inserts we do not know which rows made it, so recount.
+        if failed:
+            self.summary.invalidate()
+        else:
+            self.summary.add_rows(values)
+    
+    def import_from_csv(self, file_path, chunk_size=DEFAULT_CHUNK_SIZE, method=IMPORT_BATCHED,
+                        parse_workers=None, writer_threads=DEFAULT_WRITER_THREADS,
+                        on_duplicate=DUPLICATE_INSERT, resume=False, progress=None, cancel_event=None,
+                        fast_parse=True):
+        # Returns ImportResult(success, error, skipped, cancelled) in every mode.
+        # A checkpoint is saved after each committed chunk; resume=True picks up
+        # after the last one (see find_import_checkpoint). progress receives an
+        # ImportProgress per chunk; setting cancel_event stops between chunks.
+        # fast_parse uses the memory-mapped, column-wise parser when the file
+        # has no quoted fields. Upsert modes raise MissingNikIndexError until
+        # the unique NIK index has been created.
+        if on_duplicate in UPSERT_MODES and not self.has_nik_unique_index():
+            raise MissingNikIndexError(
+                "Mode timpa membutuhkan indeks unik NIK; buat indeksnya terlebih dahulu"
+            )
+        try:
+            tracker = ImportTracker(self.checkpoints, file_path, chunk_size, resume, progress, cancel_event)
+        except OSError as e:
+            print(f"Error reading CSV file: {e}")
+            return ImportResult(0, 1)
+        snapshot_from = self.snapshot.max_idx if self.snapshot.loaded else None
+        try:
+            if method == IMPORT_PIPELINE:
+                return self.import_from_csv_pipeline(
+                    file_path, tracker, parse_workers, writer_threads, on_duplicate, fast_parse
+                )
+            if method == IMPORT_LOAD_DATA:
+                return self.bulk_load_csv(file_path, tracker, on_duplicate, fast_parse)
+            return self.import_from_csv_batched(file_path, tracker, on_duplicate, fast_parse)
+        finally:
+            if self._import_counter(on_duplicate) is None:
+                # Upserts change existing rows in place; recount the summary
+                # and load the snapshot again
+                self.summary.invalidate()
+                self.snapshot.invalidate()
+            else:
+                self._catch_up_snapshot(snapshot_from)
+    
+    def _catch_up_snapshot(self, after_idx):
+        # Inserted rows all come after the last idx the snapshot held when
+        # the import started
+        if after_idx is None or not self.snapshot.loaded:
+            self.snapshot.invalidate()
+            return
+        try:
+            self.snapshot.apply(list(self.iter_customers(after_idx=after_idx)))
+        except (ConnectionError, DatabaseError) as e:
+            print(f"Error refreshing snapshot: {e}")
+            self.snapshot.invalidate()
+    
+    def find_import_checkpoint(self, file_path):
+        # The checkpoint an interrupted import of this exact file left, or None
+        try:
+            return self.checkpoints.load(file_fingerprint(file_path))
+        except OSError as e:
+            print(f"Error reading CSV file: {e}")
+            return None
+    
+    def _import_result(self, tracker, completed):
+        tracker.finish(completed)
+        if tracker.success:
+            self.query_cache.invalidate()
+        return ImportResult(tracker.success, tracker.error, tracker.skipped, tracker.cancelled)
+    
+    def import_from_csv_batched(self, file_path, tracker, on_duplicate=DUPLICATE_INSERT, fast_parse=True):
+        connection = self.db_config.get_connection()
+        if not connection:
+            tracker.add_error()
+            return self._import_result(tracker, False)
+        
+        completed = False
+        count_imported = self._import_counter(on_duplicate)
+        try:
+            duplicate_filter = DuplicateFilter.load(connection, on_duplicate)
+            query = insert_query_for(on_duplicate, self.backend.upsert_suffix)
+            chunks, parse = open_chunks(file_path, tracker.chunk_size, tracker.start_offset, fast_parse)
+            for payload, start, end in chunks:
+                if tracker.cancelled:
+                    break
+                if tracker.already_done(start, end):
+                    continue
+                values, parse_errors = parse(payload)
+                skipped = 0
+                if duplicate_filter:
+                    values, skipped = duplicate_filter.split(values)
+                inserted, failed = insert_chunk(connection, values, query)
+                if count_imported:
+                    count_imported(values, failed)
+                tracker.chunk_done(start, end, inserted, parse_errors + failed, skipped)
+            completed = not tracker.cancelled
         except Exception as e:
+            # Chunks committed before the failure stay in the table and in the
+            # checkpoint, so the import can be resumed
             print(f"Error reading CSV file: {e}")
-            return 0, 1
+            tracker.add_error()
+            self.summary.invalidate()
+        finally:
+            self._release(connection)
+        
+        return self._import_result(tracker, completed)
+    
+    def import_from_csv_pipeline(self, file_path, tracker, parse_workers=None,
+                                 writer_threads=DEFAULT_WRITER_THREADS, on_duplicate=DUPLICATE_INSERT,
+                                 fast_parse=True):
+        # Parsing runs in worker processes and inserts on writer_threads pooled
+        # connections; keep writer_threads below the pool size
+        duplicate_filter = self._load_duplicate_filter(on_duplicate)
+        if duplicate_filter is False:
+            tracker.add_error()
+            return self._import_result(tracker, False)
+        
+        completed = run_import_pipeline(
+            file_path,
+            self.db_config.get_connection,
+            self.db_config.release_connection,
+            tracker,
+            parse_workers=parse_workers,
+            writer_threads=writer_threads,
+            query=insert_query_for(on_duplicate, self.backend.upsert_suffix),
+            duplicate_filter=duplicate_filter,
+            fast_parse=fast_parse,
+            on_inserted=self._import_counter(on_duplicate)
+        )
+        return self._import_result(tracker, completed)
+    
+    def _load_duplicate_filter(self, on_duplicate):
+        # Returns the filter, None when the mode needs none, False on error
+        if on_duplicate not in (DUPLICATE_SKIP, DUPLICATE_UPDATE_CHANGED):
+            return None
+        
+        connection = self.db_config.get_connection()
+        if not connection:
+            return False
+        try:
+            return DuplicateFilter.load(connection, on_duplicate)
+        except DatabaseError as e:
+            print(f"Error loading existing NIKs: {e}")
+            return False
+        finally:
+            self._release(connection)
+    
+    def has_nik_unique_index(self):
+        connection = self.db_config.get_connection()
+        if not connection:
+            raise ConnectionError("No database connection available")
         
-        return success_count, error_count
-    
-    def export_to_csv(self, file_path):
-        customers, _ = self.get_all_customers(page=1, per_page=999999)  # Get all records
-        
-        try:
-            with open(file_path, 'w', newline='', encoding='utf-8') as file:
-                csv_writer = csv.writer(file, delimiter=';')
-                
-                # Write header
-                csv_writer.writerow(['idx', 'nik', 'name', 'born', 'active', 'salary'])
-                
-                # Write data
-                for customer in customers:
-                    born_str = customer['born'].strftime('%Y-%m-%d') if customer['born'] else ''
-                    csv_writer.writerow([
-                        customer['idx'],
-                        customer['nik'],
-                        customer['name'],
-                        born_str,
-                        customer['active'],
-                        customer['salary']
-                    ])
+        cursor = None
+        try:
+            cursor = connection.cursor()
+            return self.backend.has_unique_nik_index(cursor)
+        finally:
+            self._release(connection, cursor)
+    
+    def create_nik_unique_index(self):
+        # Lets overwrite/update-if-changed imports update rows in place. Only
+        # done when the user asks: afterwards no NIK can be stored twice, by
+        # imports or by the form. Raises DuplicateNikError while the table
+        # still holds duplicates.
+        connection = self.db_config.get_connection()
+        if not connection:
+            raise ConnectionError("No database connection available")
+        
+        cursor = None
+        try:
+            cursor = connection.cursor()
+            if self.backend.has_unique_nik_index(cursor):
+                return True
+            cursor.execute("""
+                SELECT COUNT(*) FROM (
+                    SELECT nik FROM customer GROUP BY nik HAVING COUNT(*) > 1
+                ) duplicated
+            """)
+            duplicated = cursor.fetchall()[0][0]
+            if duplicated:
+                raise DuplicateNikError(
+                    f"{duplicated:,} NIK muncul lebih dari sekali di tabel; hapus duplikatnya "
+                    "sebelum mengimpor dengan mode timpa atau perbarui"
+                )
+            try:
+                cursor.execute(self.backend.unique_nik_index)
+            except DatabaseError as e:
+                # ER_DUP_KEYNAME: created meanwhile
+                if getattr(e, 'errno', None) != 1061:
+                    raise
+            connection.commit()
+            return True
+        finally:
+            self._release(connection, cursor)
+    
+    def bulk_load_csv(self, file_path, tracker, on_duplicate=DUPLICATE_INSERT, fast_parse=True):
+        # Normalise into a staging file, LOAD DATA it into a temporary table and
+        # merge the rows into customer with one INSERT ... SELECT. Falls back to
+        # batched inserts when local infile is not allowed or the unique NIK
+        # index rejects a row. The merge is all or
+        # nothing, so the whole load is a single checkpointed chunk that can be
+        # cancelled only while the staging file is written.
+        if (not self.backend.supports_load_data or not self.local_infile_available
+                or not self.db_config.local_infile_dir or tracker.skips_chunks):
+            return self.import_from_csv_batched(file_path, tracker, on_duplicate, fast_parse)
+        
+        connection = self.db_config.get_connection()
+        if not connection:
+            tracker.add_error()
+            return self._import_result(tracker, False)
+        
+        staging_path = None
+        cursor = None
+        try:
+            duplicate_filter = DuplicateFilter.load(connection, on_duplicate)
+            with tempfile.NamedTemporaryFile(
+                'w', encoding='utf-8', newline='', suffix='.tsv',
+                dir=self.db_config.local_infile_dir, delete=False
+            ) as staging_file:
+                staging_path = staging_file.name
+                written, error_count, skipped_count = write_load_data_file(
+                    file_path, staging_file, duplicate_filter,
+                    start_offset=tracker.start_offset,
+                    stop=lambda: tracker.cancelled,
+                    fast_parse=fast_parse
+                )
+            if tracker.cancelled:
+                return self._import_result(tracker, False)
+            
+            cursor = connection.cursor()
+            cursor.execute("DROP TEMPORARY TABLE IF EXISTS customer_staging")
+            cursor.execute(self.backend.staging_table)
+            cursor.execute("""
+                LOAD DATA LOCAL INFILE %s INTO TABLE customer_staging 
+                CHARACTER SET utf8mb4 
+                FIELDS TERMINATED BY '\\t' ESCAPED BY '\\\\' 
+                LINES TERMINATED BY '\\n' 
+                (nik, name, born, active, salary)
+            """, (staging_path,))
+            success_count = cursor.rowcount
+            
+            # Summary totals of exactly the rows about to be inserted
+            staged = None
+            if self._import_counter(on_duplicate) and self.summary.tracking:
+                staged = self._aggregate(cursor, "customer_staging")
             
-            return len(customers), 0
+            # One statement: either every staged row is merged or none is
+            merge_query = """
+                INSERT INTO customer (nik, name, born, active, salary) 
+                SELECT nik, name, born, active, salary 
+                FROM customer_staging 
+                ORDER BY idx
+            """
+            if on_duplicate in UPSERT_MODES:
+                merge_query += self.backend.upsert_suffix
+            cursor.execute(merge_query)
+            connection.commit()
+            if staged is not None:
+                self.summary.merge(staged)
+            else:
+                self.summary.invalidate()
+            
+            # Rows LOAD DATA rejected count as failed
+            error_count += written - success_count
+            tracker.chunk_done(tracker.start_offset, tracker.bytes_total,
+                               success_count, error_count, skipped_count)
+            return self._import_result(tracker, True)
+        except DatabaseError as e:
+            if self.backend.is_duplicate_key(e):
+                # The unique NIK index rejected a row and the merge is all or
+                # nothing; batched inserts count such rows one by one
+                print(f"Duplicate NIK in bulk load, using batched inserts: {e}")
+            elif getattr(e, 'errno', None) not in LOCAL_INFILE_DISABLED_ERRORS:
+                print(f"Error bulk loading CSV: {e}")
+                tracker.add_error()
+                return self._import_result(tracker, False)
+            else:
+                print(f"LOAD DATA LOCAL INFILE not allowed, using batched inserts: {e}")
+                self.local_infile_available = False
+        except OSError as e:
+            print(f"Error reading CSV file: {e}")
+            tracker.add_error()
+            return self._import_result(tracker, False)
+        finally:
+            if cursor is not None:
+                try:
+                    cursor.execute("DROP TEMPORARY TABLE IF EXISTS customer_staging")
+                except DatabaseError:
+                    pass
+            self._release(connection, cursor)
+            if staging_path:
+                os.remove(staging_path)
+        
+        return self.import_from_csv_batched(file_path, tracker, on_duplicate, fast_parse)
+    
+    def iter_customers(self, batch_size=EXPORT_BATCH_SIZE, after_idx=0):
+        # Walks the table in idx order from after_idx, one keyset batch per query
+        connection = self.db_config.get_connection()
+        if not connection:
+            raise ConnectionError("No database connection available")
+        
+        cursor = None
+        try:
+            cursor = connection.cursor()
+            query = f"""
+                SELECT {CUSTOMER_SELECT} 
+                FROM customer 
+                WHERE idx > %s 
+                ORDER BY idx 
+                LIMIT %s
+            """
+            last_idx = after_idx
+            while True:
+                cursor.execute(query, (last_idx, batch_size))
+                batch = cursor.fetchall()
+                if not batch:
+                    break
+                yield from map(CustomerRecord._make, batch)
+                if len(batch) < batch_size:
+                    break
+                last_idx = batch[-1][0]
+        finally:
+            self._release(connection, cursor)
+    
+    # Snapshot mode: the whole table in memory, sorted and filtered by any
+    # column without a query. Loading reads every row once; the writes above
+    # keep it current, and upsert imports, which it cannot follow, drop it to
+    # be loaded again on the next read.
+    
+    def load_snapshot(self):
+        # Turns snapshot mode on; returns the number of rows held, or None
+        self.snapshot.enabled = True
+        if not self._ensure_snapshot():
+            return None
+        return self.snapshot.size
+    
+    def drop_snapshot(self):
+        self.snapshot.disable()
+    
+    def _ensure_snapshot(self):
+        if not self.snapshot.available:
+            print("NumPy is not installed, snapshot mode is unavailable")
+            return False
+        
+        with self.snapshot.load_lock:
+            for _ in range(SNAPSHOT_LOAD_ATTEMPTS):
+                if self.snapshot.loaded:
+                    return True
+                if not self.snapshot.enabled:
+                    return False
+                generation = self.snapshot.generation
+                try:
+                    if self.snapshot.load(self.iter_customers(), generation):
+                        return True
+                except (ConnectionError, DatabaseError) as e:
+                    print(f"Error loading snapshot: {e}")
+                    return False
+        print("Customer table kept changing while loading the snapshot")
+        return False
+    
+    def get_snapshot_rows(self, offset, limit, search_term="", sort_column='idx', descending=False):
+        # (customers, total) like the paged reads, answered from memory
+        if not self.snapshot.enabled or not self._ensure_snapshot():
+            return [], 0
+        return self.snapshot.rows(offset, limit, search_term, sort_column, descending,
+                                  like=self.search_mode == SEARCH_LIKE)
+    
+    def export_to_csv(self, file_path, batch_size=EXPORT_BATCH_SIZE):
+        return self.export_to_file(file_path, DEFAULT_EXPORT_FORMAT, batch_size)
+    
+    def export_to_file(self, file_path, export_format=None, batch_size=EXPORT_BATCH_SIZE,
+                       threaded_compression=True):
+        # export_format is a name from EXPORT_FORMATS; None picks it from the
+        # file extension. Returns (exported, error_count) like the imports.
+        if export_format is None:
+            export_format = format_for_path(file_path)
+        else:
+            export_format = EXPORT_FORMATS_BY_NAME[export_format]
+        
+        try:
+            exported = export_records(
+                self.iter_customers(batch_size), file_path, export_format, threaded_compression
+            )
+            return exported, 0
         except Exception as e:
-            print(f"Error exporting to CSV: {e}")
-            return 0, 1
\ No newline at end of file
+            print(f"Error exporting to {export_format.label}: {e}")
+            return 0, 1
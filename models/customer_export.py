@@ -0,0 +1,255 @@
+import bz2
+import csv
+import gzip
+import io
+import json
+import lzma
+import queue
+import re
+import threading
+import zipfile
+from collections import namedtuple
+from datetime import date
+from xml.sax.saxutils import escape
+
+EXPORT_COLUMNS = ['idx', 'nik', 'name', 'born', 'active', 'salary']
+
+# Bytes handed to the compression thread at a time, and how many such blocks
+# may wait for it before the exporting thread blocks
+BACKGROUND_BLOCK_SIZE = 1024 * 1024
+BACKGROUND_QUEUE_SIZE = 8
+
+
+# Every writer takes a binary stream and an iterable of CustomerRecords
+# (normally Customer.iter_customers) and returns the number of rows written.
+
+def write_csv(stream, records):
+    text = io.TextIOWrapper(stream, encoding='utf-8', newline='')
+    csv_writer = csv.writer(text, delimiter=';')
+    csv_writer.writerow(EXPORT_COLUMNS)
+
+    exported = 0
+    for customer in records:
+        csv_writer.writerow((
+            customer.idx,
+            customer.nik,
+            customer.name,
+            customer.born.strftime('%Y-%m-%d') if customer.born else '',
+            customer.active,
+            customer.salary
+        ))
+        exported += 1
+    text.flush()
+    text.detach()  # The caller closes the stream
+    return exported
+
+
+def write_jsonl(stream, records):
+    text = io.TextIOWrapper(stream, encoding='utf-8', newline='\n')
+    exported = 0
+    for customer in records:
+        text.write(json.dumps({
+            'idx': customer.idx,
+            'nik': customer.nik,
+            'name': customer.name,
+            'born': customer.born.isoformat() if customer.born else None,
+            'active': customer.active,
+            'salary': customer.salary,
+        }, ensure_ascii=False))
+        text.write('\n')
+        exported += 1
+    text.flush()
+    text.detach()
+    return exported
+
+
+# Minimal SpreadsheetML package: one sheet, plus a date style for born
+_XLSX_PARTS = {
+    '[Content_Types].xml': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/xl/workbook.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+        '<Override PartName="/xl/worksheets/sheet1.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+        '<Override PartName="/xl/styles.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+        '</Types>'
+    ),
+    '_rels/.rels': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+        'Target="xl/workbook.xml"/>'
+        '</Relationships>'
+    ),
+    'xl/workbook.xml': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+        'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+        '<sheets><sheet name="Customers" sheetId="1" r:id="rId1"/></sheets>'
+        '</workbook>'
+    ),
+    'xl/_rels/workbook.xml.rels': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+        'Target="worksheets/sheet1.xml"/>'
+        '<Relationship Id="rId2" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles" '
+        'Target="styles.xml"/>'
+        '</Relationships>'
+    ),
+    'xl/styles.xml': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<styleSheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+        '<fonts count="1"><font><sz val="11"/><name val="Calibri"/></font></fonts>'
+        '<fills count="2"><fill><patternFill patternType="none"/></fill>'
+        '<fill><patternFill patternType="gray125"/></fill></fills>'
+        '<borders count="1"><border><left/><right/><top/><bottom/><diagonal/></border></borders>'
+        '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+        '<cellXfs count="2"><xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/>'
+        '<xf numFmtId="14" fontId="0" fillId="0" borderId="0" xfId="0" applyNumberFormat="1"/></cellXfs>'
+        '</styleSheet>'
+    ),
+}
+
+_XLSX_EPOCH = date(1899, 12, 30).toordinal()
+_XML_ILLEGAL_RE = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f]')
+
+
+def _xlsx_text(value):
+    return f'<c t="inlineStr"><is><t>{escape(_XML_ILLEGAL_RE.sub("", value))}</t></is></c>'
+
+
+def write_xlsx(stream, records):
+    # The sheet is streamed into the zip entry row by row, so memory stays flat
+    # however many rows there are (unlike building a workbook in memory)
+    exported = 0
+    with zipfile.ZipFile(stream, 'w', zipfile.ZIP_DEFLATED) as archive:
+        for name, content in _XLSX_PARTS.items():
+            archive.writestr(name, content)
+
+        with archive.open('xl/worksheets/sheet1.xml', 'w', force_zip64=True) as sheet:
+            text = io.TextIOWrapper(sheet, encoding='utf-8')
+            text.write(
+                '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+                '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+                '<sheetData><row>'
+            )
+            text.write(''.join(_xlsx_text(column) for column in EXPORT_COLUMNS))
+            text.write('</row>')
+
+            for customer in records:
+                born = (f'<c s="1"><v>{customer.born.toordinal() - _XLSX_EPOCH}</v></c>'
+                        if customer.born else '<c/>')
+                text.write(
+                    f'<row><c><v>{customer.idx}</v></c>{_xlsx_text(customer.nik)}'
+                    f'{_xlsx_text(customer.name)}{born}'
+                    f'<c><v>{customer.active}</v></c><c><v>{customer.salary}</v></c></row>'
+                )
+                exported += 1
+
+            text.write('</sheetData></worksheet>')
+            text.flush()
+            text.detach()
+    return exported
+
+
+ExportFormat = namedtuple('ExportFormat', 'name label extension writer compression')
+
+EXPORT_FORMATS = [
+    ExportFormat('csv', 'CSV', '.csv', write_csv, None),
+    ExportFormat('csv.gz', 'CSV gzip', '.csv.gz', write_csv, 'gzip'),
+    ExportFormat('csv.bz2', 'CSV bzip2', '.csv.bz2', write_csv, 'bz2'),
+    ExportFormat('csv.xz', 'CSV xz', '.csv.xz', write_csv, 'xz'),
+    ExportFormat('jsonl', 'JSON Lines', '.jsonl', write_jsonl, None),
+    ExportFormat('jsonl.gz', 'JSON Lines gzip', '.jsonl.gz', write_jsonl, 'gzip'),
+    ExportFormat('xlsx', 'Excel', '.xlsx', write_xlsx, None),
+]
+EXPORT_FORMATS_BY_NAME = {export_format.name: export_format for export_format in EXPORT_FORMATS}
+DEFAULT_EXPORT_FORMAT = 'csv'
+
+
+def format_for_path(file_path):
+    # Longest matching extension wins, so .csv.gz is not taken for plain .gz
+    for export_format in sorted(EXPORT_FORMATS, key=lambda f: len(f.extension), reverse=True):
+        if file_path.lower().endswith(export_format.extension):
+            return export_format
+    return EXPORT_FORMATS_BY_NAME[DEFAULT_EXPORT_FORMAT]
+
+
+def open_compressor(stream, compression):
+    # Moderate gzip/xz levels: the highest ones cost several times the CPU for
+    # a few percent smaller files
+    if compression == 'gzip':
+        return gzip.GzipFile(fileobj=stream, mode='wb', compresslevel=6)
+    if compression == 'bz2':
+        return bz2.BZ2File(stream, 'wb')
+    if compression == 'xz':
+        return lzma.LZMAFile(stream, 'wb', preset=3)
+    raise ValueError(f"unknown compression: {compression}")
+
+
+class BackgroundWriter(io.RawIOBase):
+    # Hands each block to a thread that feeds the compressor, so compressing
+    # one block overlaps fetching and formatting the next (zlib, bz2 and lzma
+    # release the GIL while they work)
+
+    def __init__(self, target, queue_size=BACKGROUND_QUEUE_SIZE):
+        super().__init__()
+        self.target = target
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._error = None
+        self._thread = threading.Thread(target=self._run, name="export-compressor", daemon=True)
+        self._thread.start()
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        if self._error is not None:
+            raise self._error
+        self._queue.put(bytes(data))
+        return len(data)
+
+    def _run(self):
+        while True:
+            block = self._queue.get()
+            if block is None:
+                break
+            if self._error is None:
+                try:
+                    self.target.write(block)
+                except Exception as e:
+                    self._error = e  # Keep draining; write() reports it
+
+    def close(self):
+        if not self.closed:
+            self._queue.put(None)
+            self._thread.join()
+        super().close()
+        error, self._error = self._error, None
+        if error is not None:
+            raise error
+
+
+def export_records(records, file_path, export_format, threaded_compression=True):
+    with open(file_path, 'wb') as file:
+        if export_format.compression is None:
+            return export_format.writer(file, records)
+
+        with open_compressor(file, export_format.compression) as compressor:
+            if not threaded_compression:
+                return export_format.writer(compressor, records)
+
+            stream = io.BufferedWriter(BackgroundWriter(compressor), BACKGROUND_BLOCK_SIZE)
+            try:
+                exported = export_format.writer(stream, records)
+            finally:
+                stream.close()  # Waits for the compression thread
+            return exported
@@ -0,0 +1,463 @@
+import csv
+import mmap
+import multiprocessing
+import os
+import queue
+import re
+import threading
+from collections import deque, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime
+
+try:
+    import numpy as np
+except ImportError:  # Optional: the fast parse path falls back to plain Python
+    np = None
+
+DEFAULT_CHUNK_SIZE = 1000
+
+# Import methods: one connection with batched inserts, the parallel pipeline,
+# or MySQL's LOAD DATA LOCAL INFILE through a staging table
+IMPORT_BATCHED = 'batched'
+IMPORT_PIPELINE = 'pipeline'
+IMPORT_LOAD_DATA = 'load_data'
+
+# Pipeline mode: parse in worker processes, insert from several writer threads
+DEFAULT_WRITER_THREADS = 2
+DEFAULT_PIPELINE_QUEUE_SIZE = 4
+
+# What to do with rows whose NIK is already in the table (or earlier in the file)
+DUPLICATE_INSERT = 'insert'                  # plain INSERT, duplicates allowed
+DUPLICATE_SKIP = 'skip'                      # keep the existing row
+DUPLICATE_OVERWRITE = 'overwrite'            # upsert every row
+DUPLICATE_UPDATE_CHANGED = 'update_if_changed'  # upsert only rows that differ
+
+INSERT_CUSTOMER_QUERY = """
+    INSERT INTO customer (nik, name, born, active, salary)
+    VALUES (%s, %s, %s, %s, %s)
+"""
+
+UPSERT_MODES = (DUPLICATE_OVERWRITE, DUPLICATE_UPDATE_CHANGED)
+
+ImportResult = namedtuple('ImportResult', 'success error skipped cancelled', defaults=(0, False))
+
+
+def insert_query_for(on_duplicate, upsert_suffix):
+    # upsert_suffix is the backend's own "update on duplicate" clause
+    if on_duplicate in UPSERT_MODES:
+        return INSERT_CUSTOMER_QUERY + upsert_suffix
+    return INSERT_CUSTOMER_QUERY
+
+
+class DuplicateNikError(Exception):
+    # The unique NIK index rejected a NIK that is already stored, or cannot
+    # be created while the table holds duplicate NIKs
+    pass
+
+
+class MissingNikIndexError(Exception):
+    # Upsert imports need the unique NIK index, which is only ever created
+    # on request (Customer.create_nik_unique_index)
+    pass
+
+
+class DuplicateFilter:
+    # Pre-check against the NIKs already in the table, loaded once per import,
+    # so rows that would be skipped never cost a round trip. Skip mode keeps a
+    # set of NIKs; update-if-changed keeps a hash of each row's other columns.
+
+    def __init__(self, on_duplicate, existing):
+        self.on_duplicate = on_duplicate
+        self.existing = existing
+
+    @classmethod
+    def load(cls, connection, on_duplicate, batch_size=10000):
+        if on_duplicate == DUPLICATE_SKIP:
+            existing = set()
+            query = "SELECT nik FROM customer"
+        elif on_duplicate == DUPLICATE_UPDATE_CHANGED:
+            existing = {}
+            query = "SELECT nik, name, born, active, salary FROM customer"
+        else:
+            return None
+
+        cursor = connection.cursor()
+        try:
+            cursor.execute(query)
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                if on_duplicate == DUPLICATE_SKIP:
+                    existing.update(row[0] for row in rows)
+                else:
+                    existing.update((row[0], hash(tuple(row[1:]))) for row in rows)
+        finally:
+            cursor.close()
+        return cls(on_duplicate, existing)
+
+    def split(self, values):
+        # Returns (rows to write, number of rows skipped)
+        to_write = []
+        skipped = 0
+        for row in values:
+            nik = row[0]
+            if self.on_duplicate == DUPLICATE_SKIP:
+                if nik in self.existing:
+                    skipped += 1
+                    continue
+                self.existing.add(nik)
+            else:
+                fingerprint = hash(row[1:])
+                if self.existing.get(nik) == fingerprint:
+                    skipped += 1
+                    continue
+                self.existing[nik] = fingerprint
+            to_write.append(row)
+        return to_write, skipped
+
+
+def parse_customer_row(row):
+    # Returns the (nik, name, born, active, salary) tuple or raises ValueError
+    if len(row) < 5:
+        raise ValueError(f"expected 5 columns, got {len(row)}")
+
+    nik = row[0]
+    name = row[1]
+    born = datetime.strptime(row[2], '%Y-%m-%d').date() if row[2] else None
+    active = int(row[3]) if row[3] else 0
+    salary = int(row[4]) if row[4] else 0
+    return nik, name, born, active, salary
+
+
+def parse_rows(rows):
+    # Module level so worker processes can run it; returns (values, error_count)
+    values = []
+    errors = 0
+    for row in rows:
+        try:
+            values.append(parse_customer_row(row))
+        except ValueError as e:
+            print(f"Error processing row {row}: {e}")
+            errors += 1
+    return values, errors
+
+
+def iter_raw_chunks_at(file_path, chunk_size=DEFAULT_CHUNK_SIZE, start_offset=0):
+    # Yields (rows, start, end): the byte offsets around each chunk, so an
+    # import can checkpoint them and later seek straight back to a boundary.
+    # The first chunk starts at start_offset, header row included.
+    with open(file_path, 'rb') as file:
+        file.seek(start_offset)
+        # csv pulls one line at a time, so tell() is exact after every row
+        lines = (line.decode('utf-8') for line in iter(file.readline, b''))
+        csv_reader = csv.reader(lines, delimiter=';')
+        if start_offset == 0:
+            next(csv_reader, None)  # Skip header row
+
+        start = start_offset
+        chunk = []
+        for row in csv_reader:
+            chunk.append(row)
+            if len(chunk) >= chunk_size:
+                end = file.tell()
+                yield chunk, start, end
+                chunk = []
+                start = end
+        if chunk:
+            yield chunk, start, file.tell()
+
+
+def can_fast_parse(file_path):
+    # The fast path splits on newlines and semicolons, which is only right when
+    # no field is quoted (a quoted field may hold either)
+    with open(file_path, 'rb') as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            return False
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            return mapped.find(b'"') == -1
+
+
+def open_chunks(file_path, chunk_size=DEFAULT_CHUNK_SIZE, start_offset=0, fast_parse=True):
+    # Returns (chunks, parse): chunks yields (payload, start, end) and
+    # parse(payload) returns (values, error_count). Both paths cut the file at
+    # the same byte offsets, so checkpoints work with either.
+    if fast_parse and can_fast_parse(file_path):
+        return iter_mmap_chunks(file_path, chunk_size, start_offset), parse_chunk_fast
+    return iter_raw_chunks_at(file_path, chunk_size, start_offset), parse_rows
+
+
+def iter_mmap_chunks(file_path, chunk_size=DEFAULT_CHUNK_SIZE, start_offset=0):
+    # Like iter_raw_chunks_at, but yields the raw bytes of chunk_size lines
+    # sliced straight out of a memory map
+    with open(file_path, 'rb') as file:
+        size = os.fstat(file.fileno()).st_size
+        if size <= start_offset:
+            return
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            position = start_offset
+            if start_offset == 0:
+                position = _line_end(mapped, 0, size)  # Skip header row
+
+            start = start_offset
+            while position < size:
+                end = position
+                for _ in range(chunk_size):
+                    end = _line_end(mapped, end, size)
+                    if end >= size:
+                        break
+                yield mapped[position:end], start, end
+                start = position = end
+
+
+def _line_end(mapped, position, size):
+    newline = mapped.find(b'\n', position)
+    return size if newline == -1 else newline + 1
+
+
+_FAILED = object()
+
+# The only dates converted in bulk; fromisoformat and datetime64 also take
+# forms such as 2024-W01-1 that strptime('%Y-%m-%d') rejects
+_ISO_DATE_RE = re.compile(r'[0-9]{4}-[0-9]{2}-[0-9]{2}')
+
+
+def parse_chunk_fast(data):
+    # Splits a chunk of unquoted lines into columns and converts whole columns
+    # at once; only rows a bulk conversion rejects go through
+    # parse_customer_row, so errors are counted exactly as in parse_rows
+    text = data.decode('utf-8').replace('\r\n', '\n')
+    if text.endswith('\n'):
+        text = text[:-1]
+    rows = [line.split(';') for line in text.split('\n')]
+
+    columns = [[row[column] if len(row) >= 5 else '' for row in rows] for column in range(5)]
+    niks, names, borns, actives, salaries = columns
+
+    values = []
+    errors = 0
+    for row, nik, name, born, active, salary in zip(
+        rows, niks, names, _convert_dates(borns), _convert_ints(actives), _convert_ints(salaries)
+    ):
+        if len(row) < 5 or born is _FAILED or active is _FAILED or salary is _FAILED:
+            try:
+                values.append(parse_customer_row(row))
+            except ValueError as e:
+                print(f"Error processing row {row}: {e}")
+                errors += 1
+            continue
+        values.append((nik, name, born, active, salary))
+    return values, errors
+
+
+def _convert_dates(strings):
+    # ISO dates only (YYYY-MM-DD); anything else is left to strptime
+    try:
+        if not all(not value or _ISO_DATE_RE.fullmatch(value) for value in strings):
+            raise ValueError("not YYYY-MM-DD")
+        if np is not None:
+            days = np.array([value or 'NaT' for value in strings], dtype='datetime64[D]')
+            if (days < np.datetime64('0001-01-01')).any():
+                raise ValueError("year out of range")
+            return days.astype(object).tolist()  # datetime.date, None for NaT
+        return [date.fromisoformat(value) if value else None for value in strings]
+    except ValueError:
+        return [_convert_date(value) for value in strings]
+
+
+def _convert_date(value):
+    if not value:
+        return None
+    try:
+        return date.fromisoformat(value) if _ISO_DATE_RE.fullmatch(value) else _FAILED
+    except ValueError:
+        return _FAILED
+
+
+def _convert_ints(strings):
+    # Empty means 0, as in parse_customer_row
+    try:
+        if np is not None:
+            return np.array([value or '0' for value in strings]).astype(np.int64).tolist()
+        return [int(value) if value else 0 for value in strings]
+    except (ValueError, OverflowError):
+        return [_convert_int(value) for value in strings]
+
+
+def _convert_int(value):
+    try:
+        return int(value) if value else 0
+    except ValueError:
+        return _FAILED
+
+
+def write_load_data_file(file_path, out_file, duplicate_filter=None, start_offset=0, stop=None,
+                         fast_parse=True):
+    # Rewrites the semicolon CSV as the tab-separated format LOAD DATA reads
+    # by default, with only rows that parse and are not skipped as duplicates;
+    # returns (rows_written, parse_errors, rows_skipped). stop() is checked
+    # between chunks and abandons the file when it returns True.
+    written = 0
+    errors = 0
+    skipped = 0
+    chunks, parse = open_chunks(file_path, DEFAULT_CHUNK_SIZE, start_offset, fast_parse)
+    for payload, _, _ in chunks:
+        if stop and stop():
+            break
+        values, parse_errors = parse(payload)
+        errors += parse_errors
+        if duplicate_filter:
+            values, chunk_skipped = duplicate_filter.split(values)
+            skipped += chunk_skipped
+        for nik, name, born, active, salary in values:
+            out_file.write("\t".join((
+                _load_data_field(nik),
+                _load_data_field(name),
+                born.isoformat() if born else "\\N",
+                str(active),
+                str(salary),
+            )))
+            out_file.write("\n")
+            written += 1
+    return written, errors, skipped
+
+
+def _load_data_field(value):
+    return (value.replace('\\', '\\\\').replace('\t', '\\t')
+            .replace('\n', '\\n').replace('\r', '\\r'))
+
+
+def insert_chunk(connection, values, query=INSERT_CUSTOMER_QUERY):
+    # One multi-row INSERT and one commit per chunk; returns (success, error)
+    if not values:
+        return 0, 0
+
+    cursor = connection.cursor()
+    try:
+        try:
+            cursor.executemany(query, values)
+            connection.commit()
+            return len(values), 0
+        except Exception as e:
+            print(f"Error inserting chunk of {len(values)} rows, retrying row by row: {e}")
+            connection.rollback()
+
+        # Isolate the bad rows so the counts stay per row
+        success_count = 0
+        error_count = 0
+        for row in values:
+            try:
+                cursor.execute(query, row)
+                success_count += 1
+            except Exception as e:
+                print(f"Error creating customer {row[0]}: {e}")
+                error_count += 1
+        connection.commit()
+        return success_count, error_count
+    finally:
+        cursor.close()
+
+
+def run_import_pipeline(file_path, get_connection, release_connection, tracker,
+                        parse_workers=None, writer_threads=DEFAULT_WRITER_THREADS,
+                        queue_size=DEFAULT_PIPELINE_QUEUE_SIZE,
+                        query=INSERT_CUSTOMER_QUERY, duplicate_filter=None, fast_parse=True,
+                        on_inserted=None):
+    # reader -> process pool (parse/validate) -> bounded queue -> N writers,
+    # each holding one pooled connection. At most queue_size chunks wait at
+    # each stage, so a slow database throttles the reader instead of the whole
+    # file piling up in memory. parse_workers=0 parses in the reader thread.
+    # Chunks commit out of order; tracker (an ImportTracker) keeps the
+    # checkpoint consistent and says when to stop. on_inserted(values, failed)
+    # is called from the writer threads after each chunk is written.
+    if parse_workers is None:
+        parse_workers = os.cpu_count() or 1
+    writer_threads = max(1, writer_threads)
+
+    parsed = queue.Queue(maxsize=queue_size)
+    done = object()
+
+    def hand_over(result, start, end):
+        # Runs on the reader thread only, so the filter needs no lock
+        values, parse_errors = result
+        skipped = 0
+        if duplicate_filter:
+            values, skipped = duplicate_filter.split(values)
+        parsed.put((values, parse_errors, skipped, start, end))
+
+    def writer():
+        connection = get_connection()
+        try:
+            while True:
+                item = parsed.get()
+                if item is done:
+                    break
+                values, parse_errors, skipped, start, end = item
+                if connection is None:
+                    # Keep draining so the reader never blocks on a full queue
+                    tracker.chunk_failed(parse_errors + len(values))
+                    continue
+                if tracker.cancelled:
+                    continue  # Left for a resumed run
+                try:
+                    inserted, failed = insert_chunk(connection, values, query)
+                except Exception as e:
+                    # Not committed, so the checkpoint must not move past it
+                    print(f"Error writing chunk: {e}")
+                    tracker.chunk_failed(parse_errors + len(values))
+                    if on_inserted:
+                        on_inserted(values, len(values))
+                    continue
+                if on_inserted:
+                    on_inserted(values, failed)
+                tracker.chunk_done(start, end, inserted, parse_errors + failed, skipped)
+        finally:
+            if connection is not None:
+                release_connection(connection)
+
+    writers = [threading.Thread(target=writer, name=f"csv-import-writer-{n}", daemon=True)
+               for n in range(writer_threads)]
+    for thread in writers:
+        thread.start()
+
+    executor = None
+    completed = False
+    try:
+        if parse_workers > 0:
+            # spawn keeps the children clear of the GUI and writer threads
+            executor = ProcessPoolExecutor(
+                max_workers=parse_workers,
+                mp_context=multiprocessing.get_context('spawn')
+            )
+
+        pending = deque()
+        chunks, parse = open_chunks(file_path, tracker.chunk_size, tracker.start_offset, fast_parse)
+        for payload, start, end in chunks:
+            if tracker.cancelled:
+                break
+            if tracker.already_done(start, end):
+                continue
+            if executor is None:
+                hand_over(parse(payload), start, end)
+                continue
+            pending.append((executor.submit(parse, payload), start, end))
+            if len(pending) >= parse_workers + queue_size:
+                future, start, end = pending.popleft()
+                hand_over(future.result(), start, end)
+        while pending and not tracker.cancelled:
+            future, start, end = pending.popleft()
+            hand_over(future.result(), start, end)
+        completed = not tracker.cancelled
+    except Exception as e:
+        # Chunks already handed to the writers still get committed
+        print(f"Error reading CSV file: {e}")
+        tracker.add_error()
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+        for _ in writers:
+            parsed.put(done)
+        for thread in writers:
+            thread.join()
+
+    return completed
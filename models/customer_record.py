@@ -0,0 +1,14 @@
+from collections import namedtuple
+
+CUSTOMER_COLUMNS = ('idx', 'nik', 'name', 'born', 'active', 'salary')
+CUSTOMER_SELECT = ", ".join(CUSTOMER_COLUMNS)
+
+
+class CustomerRecord(namedtuple('CustomerRecord', CUSTOMER_COLUMNS)):
+    # A plain tuple underneath: no per-row __dict__, built straight from the
+    # cursor's tuple rows and safe to share between threads and caches
+    __slots__ = ()
+
+
+def to_records(rows):
+    return list(map(CustomerRecord._make, rows))
@@ -0,0 +1,470 @@
+import bisect
+import operator
+import threading
+from collections import OrderedDict
+from datetime import date
+from itertools import islice
+
+from config.instrumentation import instrumentation
+from models.customer_record import CUSTOMER_COLUMNS, CustomerRecord
+from models.search_query import SearchQueryError, parse_search
+
+try:
+    import numpy as np
+except ImportError:  # Optional: snapshot mode is unavailable without it
+    np = None
+
+SNAPSHOT_AVAILABLE = np is not None
+
+# Records turned into column arrays per batch while loading
+SNAPSHOT_LOAD_BATCH = 10000
+
+# Filtered and sorted row orders kept for paging and scrolling through them
+VIEW_CACHE_SIZE = 8
+
+# Writes touching at most this many rows move them within the cached sort
+# orders; larger ones drop the orders of the columns they changed, which are
+# sorted again on next use
+INCREMENTAL_SORT_LIMIT = 64
+
+SORT_COLUMNS = CUSTOMER_COLUMNS
+
+# Column holding the sort and filter key of each grid column. Names compare
+# lower-cased, like the database collation; unknown birth dates sort first.
+KEY_COLUMNS = {
+    'idx': 'idx',
+    'nik': 'nik',
+    'name': 'name_key',
+    'born': 'born',
+    'active': 'active',
+    'salary': 'salary',
+}
+
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+_COMPARISONS = {
+    '=': operator.eq,
+    '!=': operator.ne,
+    '<': operator.lt,
+    '<=': operator.le,
+    '>': operator.gt,
+    '>=': operator.ge,
+}
+
+
+def _encode(values):
+    # UTF-8 bytes take a quarter of the memory of NumPy's unicode strings,
+    # and byte order is code point order
+    return np.array([value.encode('utf-8') for value in values], dtype=np.bytes_)
+
+
+def _dates(values):
+    # datetime64[D] with NaT for None, through day numbers: several times
+    # faster than NumPy converting the date objects itself
+    nat = np.datetime64('NaT', 'D').astype(np.int64)
+    try:
+        days = [nat if value is None else value.toordinal() - _EPOCH_ORDINAL for value in values]
+    except AttributeError:  # dates given as text
+        return np.array(values, dtype='datetime64[D]')
+    return np.array(days, dtype=np.int64).view('datetime64[D]')
+
+
+def _batch_columns(rows):
+    idx, nik, name, born, active, salary = zip(*rows) if rows else ((),) * len(CUSTOMER_COLUMNS)
+    return {
+        'idx': np.array(idx, dtype=np.int64),
+        'nik': _encode(nik),
+        'name': _encode(name),
+        'name_key': _encode([value.lower() for value in name]),
+        'born': _dates(born),
+        'active': np.array(active, dtype=np.int8),
+        'salary': np.array(salary, dtype=np.int64),
+    }
+
+
+def build_columns(records, batch_size=SNAPSHOT_LOAD_BATCH):
+    # CustomerRecords in idx order -> {column: array}, converted a batch at a
+    # time so the whole table never exists as Python objects at once
+    records = iter(records)
+    parts = []
+    while True:
+        batch = list(islice(records, batch_size))
+        if not batch:
+            break
+        parts.append(_batch_columns(batch))
+    if not parts:
+        return _batch_columns([])
+    if len(parts) == 1:
+        return parts[0]
+    return {name: np.concatenate([part[name] for part in parts]) for name in parts[0]}
+
+
+def _comparable(name, values):
+    # NaT never equals itself; compared as integers it does
+    return values.view(np.int64) if name == 'born' else values
+
+
+def _fit(column, values):
+    # Widens a bytes column so longer values are not cut off when stored
+    if values.dtype.kind == 'S' and values.dtype.itemsize > column.dtype.itemsize:
+        return column.astype(values.dtype)
+    return column
+
+
+class _SortedPositions:
+    # A sort order seen as the sorted sequence of (key, position) pairs, so
+    # bisect finds where a row belongs without gathering every key. The
+    # entry at rank skip, the row being moved, is left out.
+
+    def __init__(self, keys, order, skip=None):
+        self.keys = keys
+        self.order = order
+        self.skip = skip
+
+    def __len__(self):
+        return len(self.order) - (self.skip is not None)
+
+    def __getitem__(self, rank):
+        if self.skip is not None and rank >= self.skip:
+            rank += 1
+        position = self.order[rank]
+        return self.keys[position], position
+
+
+class CustomerSnapshot:
+    # The customer table held in memory as NumPy columns, in idx order, so
+    # the grid can sort and filter without a query. A sort order (argsort
+    # permutation) is computed per column on first use and kept; writes are
+    # applied to the columns and moved into place in the cached orders
+    # instead of sorting again. Like SummaryStore, every write bumps the
+    # generation, and a load that overlapped a write is dropped.
+
+    available = SNAPSHOT_AVAILABLE
+
+    def __init__(self):
+        self.enabled = False  # set while the grid uses snapshot mode
+        self.load_lock = threading.Lock()  # one full load at a time
+        self._lock = threading.RLock()
+        self._generation = 0
+        self._columns = None  # None until loaded
+        self._orders = {}  # key column -> positions in ascending key order
+        self._views = OrderedDict()  # (search, like, sort, descending) -> positions
+        self._texts = {}  # column -> values as text for the LIKE search, built on first use
+
+        self.loads = 0
+        self.sorts = 0
+        self.incremental_updates = 0
+
+    @property
+    def generation(self):
+        return self._generation
+
+    @property
+    def loaded(self):
+        return self._columns is not None
+
+    @property
+    def size(self):
+        columns = self._columns
+        return len(columns['idx']) if columns is not None else 0
+
+    @property
+    def max_idx(self):
+        with self._lock:
+            idx = self._columns['idx'] if self._columns is not None else None
+            return int(idx[-1]) if idx is not None and len(idx) else 0
+
+    def load(self, records, generation):
+        # Builds the columns from every CustomerRecord in idx order, outside
+        # the lock so writes are not held up; False when one happened meanwhile
+        with instrumentation.timer('snapshot.load'):
+            columns = build_columns(records)
+        with self._lock:
+            if generation != self._generation or not self.enabled:
+                return False
+            self._columns = columns
+            self._orders = {}
+            self._views.clear()
+            self._texts = {}
+            self.loads += 1
+            return True
+
+    def invalidate(self):
+        # Dropped, and loaded again on the next read while enabled
+        with self._lock:
+            self._changed()
+            self._columns = None
+            self._orders = {}
+
+    def disable(self):
+        with self._lock:
+            self.enabled = False
+            self.invalidate()
+
+    def clear_views(self):
+        # Forgets filtered results but keeps the sort orders (benchmarks)
+        with self._lock:
+            self._views.clear()
+
+    def _changed(self):
+        self._generation += 1
+        self._views.clear()
+        self._texts = {}
+
+    # Writes. Rows whose idx is already in the snapshot are updated, others
+    # inserted; deleted is a list of idx.
+
+    def apply(self, records=(), deleted=()):
+        with self._lock:
+            self._changed()
+            if self._columns is None:
+                return
+            if len(deleted):
+                self._delete(np.asarray(deleted, dtype=np.int64))
+            if records:
+                incoming = build_columns(sorted(records))
+                idx = self._columns['idx']
+                positions = np.searchsorted(idx, incoming['idx'])
+                found = positions < len(idx)
+                found[found] = idx[positions[found]] == incoming['idx'][found]
+                if found.any():
+                    self._update(positions[found], {name: values[found] for name, values in incoming.items()})
+                if not found.all():
+                    self._insert({name: values[~found] for name, values in incoming.items()})
+            self.incremental_updates += 1
+
+    def _keys(self, name):
+        return _comparable(name, self._columns[name])
+
+    def _rank(self, name, order, position, skip=None):
+        # Where position belongs in order by its current key
+        keys = self._keys(name)
+        return bisect.bisect_left(_SortedPositions(keys, order, skip), (keys[position], position))
+
+    def _update(self, positions, values):
+        for name, new in values.items():
+            if name == 'idx':
+                continue
+            column = self._columns[name]
+            changed = _comparable(name, column[positions]) != _comparable(name, new)
+            if not changed.any():
+                continue
+            column = self._columns[name] = _fit(column, new)
+            moved = positions[changed]
+            column[moved] = new[changed]
+
+            order = self._orders.get(name)
+            if order is None:
+                continue
+            if len(moved) > INCREMENTAL_SORT_LIMIT:
+                del self._orders[name]
+                continue
+            if len(moved) == 1:
+                # Shift the entries in between by one, in place
+                position = moved[0]
+                old = int(np.flatnonzero(order == position)[0])
+                new = self._rank(name, order, position, skip=old)
+                if new > old:
+                    order[old:new] = order[old + 1:new + 1]
+                elif new < old:
+                    order[new + 1:old + 1] = order[new:old]
+                order[new] = position
+                continue
+            # Take every moved row out first, so each bisect sees sorted keys
+            order = order[~np.isin(order, moved)]
+            for position in moved:
+                order = np.insert(order, self._rank(name, order, position), position)
+            self._orders[name] = order
+
+    def _insert(self, values):
+        # Insertion points in the old arrays; new rows normally go at the end
+        idx = self._columns['idx']
+        points = np.searchsorted(idx, values['idx'])
+        appended = points[0] == len(idx)
+        for name, new in values.items():
+            self._columns[name] = np.insert(_fit(self._columns[name], new), points, new)
+        new_positions = points + np.arange(len(points))
+
+        for name, order in list(self._orders.items()):
+            if len(points) > INCREMENTAL_SORT_LIMIT:
+                del self._orders[name]
+                continue
+            if not appended:
+                # Rows after an insertion point moved up
+                order = order + np.searchsorted(points, order, side='right')
+            for position in new_positions:
+                order = np.insert(order, self._rank(name, order, position), position)
+            self._orders[name] = order
+
+    def _delete(self, idxs):
+        idx = self._columns['idx']
+        positions = np.searchsorted(idx, idxs)
+        inside = positions < len(idx)
+        positions = positions[inside]
+        positions = positions[idx[positions] == idxs[inside]]
+        if not len(positions):
+            return
+
+        keep = np.ones(len(idx), dtype=bool)
+        keep[positions] = False
+        for name, column in self._columns.items():
+            self._columns[name] = column[keep]
+        # Old position -> new position, keeping every order's sequence
+        renumbered = np.cumsum(keep) - 1
+        for name, order in self._orders.items():
+            self._orders[name] = renumbered[order[keep[order]]]
+
+    # Reads
+
+    def rows(self, offset, limit, search_term="", sort_column='idx', descending=False, like=False):
+        # (records, total) for one page of the filtered and sorted table;
+        # like=True reads search_term as a plain substring
+        if sort_column not in KEY_COLUMNS:
+            raise ValueError(f"unknown sort column: {sort_column}")
+        with self._lock:
+            if self._columns is None:
+                return [], 0
+            view = self._view(search_term, like, sort_column, descending)
+            return self._records(view[offset:offset + limit]), len(view)
+
+    def _view(self, search_term, like, sort_column, descending):
+        key = (search_term, like, sort_column, descending)
+        view = self._views.get(key)
+        if view is not None:
+            self._views.move_to_end(key)
+            return view
+
+        with instrumentation.timer('snapshot.query'):
+            mask = self._mask(search_term, like) if search_term else None
+            if sort_column == 'idx':
+                # Positions are already in idx order
+                view = np.arange(len(self._columns['idx'])) if mask is None else np.flatnonzero(mask)
+            else:
+                order = self._order(KEY_COLUMNS[sort_column])
+                view = order if mask is None else order[mask[order]]
+            if descending:
+                view = view[::-1]
+
+        self._views[key] = view
+        while len(self._views) > VIEW_CACHE_SIZE:
+            self._views.popitem(last=False)
+        return view
+
+    def _order(self, name):
+        order = self._orders.get(name)
+        if order is None:
+            with instrumentation.timer('snapshot.sort'):
+                # Stable, so equal keys stay in idx order
+                order = self._orders[name] = np.argsort(self._keys(name), kind='stable')
+            self.sorts += 1
+        return order
+
+    def _mask(self, search_term, like):
+        if not like:
+            try:
+                predicates, name_words = parse_search(search_term)
+            except SearchQueryError as e:
+                print(f"Falling back to substring search for {search_term!r}: {e}")
+            else:
+                mask = np.ones(len(self._columns['idx']), dtype=bool)
+                for predicate in predicates:
+                    mask &= self._predicate_mask(*predicate)
+                for word in name_words:
+                    self._match_word(mask, word)
+                return mask
+
+        # Substring over every column as text, as like_condition searches
+        needle = search_term.lower().encode('utf-8')
+        mask = ((np.char.find(self._columns['nik'], needle) >= 0)
+                | (np.char.find(self._columns['name_key'], needle) >= 0))
+        # Dates and numbers as text hold nothing but digits and '-'
+        if not needle.strip(b'0123456789-'):
+            for name in ('born', 'active', 'salary'):
+                mask |= np.char.find(self._text(name), needle) >= 0
+        return mask
+
+    def _text(self, name):
+        # Birth dates as YYYY-MM-DD and numbers in decimal, as the database
+        # renders them for LIKE; unknown birth dates are empty and never match
+        text = self._texts.get(name)
+        if text is None:
+            column = self._columns[name]
+            if name == 'born':
+                text = column.astype('S10')
+                text[np.isnat(column)] = b''
+            elif name == 'active':
+                # A handful of distinct values; converting those is far cheaper
+                values, inverse = np.unique(column, return_inverse=True)
+                text = values.astype(np.bytes_)[inverse]
+            else:
+                text = column.astype(np.bytes_)
+            self._texts[name] = text
+        return text
+
+    def _predicate_mask(self, field, op, value):
+        column = self._columns[KEY_COLUMNS[field]]
+        if field == 'nik':
+            convert = lambda item: item.encode('utf-8')
+        elif field == 'name':
+            convert = lambda item: item.lower().encode('utf-8')
+        elif field == 'born':
+            convert = lambda item: np.datetime64(item, 'D')
+        else:
+            convert = int
+        value = tuple(map(convert, value)) if op in ('range', 'outside', 'between') else convert(value)
+
+        if op == 'prefix':
+            return np.char.startswith(column, value)
+        if op == 'range':
+            mask = (column >= value[0]) & (column < value[1])
+        elif op == 'outside':
+            mask = (column < value[0]) | (column >= value[1])
+        elif op == 'between':
+            mask = (column >= value[0]) & (column <= value[1])
+        else:
+            mask = _COMPARISONS[op](column, value)
+        if field == 'born':
+            mask &= ~np.isnat(column)  # NULL matches no comparison, as in SQL
+        return mask
+
+    def _match_word(self, mask, word):
+        # Narrows mask to names with a word starting with word, as the
+        # FULLTEXT prefix search does. Only rows still in mask are looked at,
+        # and only names containing it at all get the word boundary check.
+        needle = word.lower().encode('utf-8')
+        names = self._columns['name_key']
+        rows = np.flatnonzero(mask)
+        if len(rows) < len(names):
+            names = names[rows]
+        found = np.char.find(names, needle) >= 0
+        rows, names = rows[found], names[found]
+        found = np.char.startswith(names, needle) | (np.char.find(names, b' ' + needle) >= 0)
+        mask[:] = False
+        mask[rows[found]] = True
+
+    def _records(self, positions):
+        columns = self._columns
+        return list(map(CustomerRecord._make, zip(
+            columns['idx'][positions].tolist(),
+            [value.decode('utf-8') for value in columns['nik'][positions].tolist()],
+            [value.decode('utf-8') for value in columns['name'][positions].tolist()],
+            columns['born'][positions].tolist(),
+            columns['active'][positions].tolist(),
+            columns['salary'][positions].tolist(),
+        )))
+
+    def stats(self):
+        with self._lock:
+            columns = self._columns or {}
+            arrays = list(columns.values()) + list(self._orders.values()) + list(self._texts.values())
+            return {
+                'enabled': self.enabled,
+                'loaded': self._columns is not None,
+                'rows': self.size,
+                'memory_mb': sum(array.nbytes for array in arrays) / 1e6,
+                'sorted_columns': len(self._orders),
+                'views': len(self._views),
+                'loads': self.loads,
+                'sorts': self.sorts,
+                'incremental_updates': self.incremental_updates,
+            }
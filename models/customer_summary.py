@@ -0,0 +1,229 @@
+import threading
+import time
+from collections import Counter, namedtuple
+from datetime import date, datetime
+
+# Seconds before the running totals are thrown away and recounted from the
+# table, in case a write slipped past the incremental updates
+SUMMARY_REFRESH_INTERVAL = 600
+
+# (label, lowest age, highest age); None for open ends
+AGE_BANDS = [
+    ("< 20", None, 19),
+    ("20-29", 20, 29),
+    ("30-39", 30, 39),
+    ("40-49", 40, 49),
+    ("50-59", 50, 59),
+    ("60+", 60, None),
+]
+UNKNOWN_AGE = "Tidak diketahui"
+
+
+class Aggregate:
+    # Running totals over a set of customer rows. Ages are kept as a count
+    # per birth year, which stays exact as rows come and go and is turned
+    # into age bands only for display.
+
+    def __init__(self, count=0, active=0, salary_sum=0, salary_min=None, salary_max=None,
+                 born_years=None):
+        self.count = count
+        self.active = active
+        self.salary_sum = salary_sum
+        self.salary_min = salary_min
+        self.salary_max = salary_max
+        self.born_years = Counter(born_years or {})
+
+    @classmethod
+    def from_rows(cls, rows):
+        # rows are (nik, name, born, active, salary) tuples, as imports insert them
+        aggregate = cls()
+        for _, _, born, active, salary in rows:
+            aggregate.add(active, salary, born)
+        return aggregate
+
+    def add(self, active, salary, born):
+        self.count += 1
+        self.active += 1 if active else 0
+        self.salary_sum += salary
+        if self.salary_min is None or salary < self.salary_min:
+            self.salary_min = salary
+        if self.salary_max is None or salary > self.salary_max:
+            self.salary_max = salary
+        self.born_years[born.year if born else None] += 1
+
+    def remove(self, active, salary, born):
+        # Returns True when the salary bounds have to be read again
+        self.count -= 1
+        self.active -= 1 if active else 0
+        self.salary_sum -= salary
+        year = born.year if born else None
+        self.born_years[year] -= 1
+        if self.born_years[year] <= 0:
+            del self.born_years[year]
+        if self.count <= 0:
+            self.salary_min = self.salary_max = None
+            return False
+        return salary == self.salary_min or salary == self.salary_max
+
+    def merge(self, other):
+        self.count += other.count
+        self.active += other.active
+        self.salary_sum += other.salary_sum
+        if other.salary_min is not None:
+            self.salary_min = other.salary_min if self.salary_min is None else min(self.salary_min, other.salary_min)
+        if other.salary_max is not None:
+            self.salary_max = other.salary_max if self.salary_max is None else max(self.salary_max, other.salary_max)
+        self.born_years.update(other.born_years)
+
+
+CustomerSummary = namedtuple(
+    'CustomerSummary',
+    'total active inactive salary_sum salary_avg salary_min salary_max born_years '
+    'updated_at recounted_at'
+)
+
+
+def age_bands(born_years, today=None):
+    # [(label, count)] in AGE_BANDS order, by age reached this calendar year
+    year = (today or date.today()).year
+    counts = Counter()
+    for born_year, count in born_years.items():
+        if born_year is None:
+            counts[UNKNOWN_AGE] += count
+            continue
+        age = year - born_year
+        for label, lowest, highest in AGE_BANDS:
+            if (lowest is None or age >= lowest) and (highest is None or age <= highest):
+                counts[label] += count
+                break
+    labels = [label for label, _, _ in AGE_BANDS] + [UNKNOWN_AGE]
+    return [(label, counts[label]) for label in labels]
+
+
+class SummaryStore:
+    # Totals kept current by the model's writes, so reading them costs no
+    # query. Every write bumps the generation; a recount that started before
+    # a write is dropped instead of overwriting the newer totals.
+
+    def __init__(self, refresh_interval=SUMMARY_REFRESH_INTERVAL):
+        self.refresh_interval = refresh_interval
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._totals = None  # None until the first recount
+        self._recounted = None  # time.monotonic() of the last recount
+        self._recounted_at = None
+        self._updated_at = None
+        self._bounds_stale = False
+
+        self.recounts = 0
+        self.incremental_updates = 0
+
+    @property
+    def generation(self):
+        return self._generation
+
+    @property
+    def tracking(self):
+        # Whether writes are being applied; otherwise they just force a recount
+        return self._totals is not None
+
+    @property
+    def needs_recount(self):
+        with self._lock:
+            return (self._totals is None
+                    or time.monotonic() - self._recounted >= self.refresh_interval)
+
+    @property
+    def bounds_stale(self):
+        return self._bounds_stale
+
+    def load(self, aggregate, generation):
+        with self._lock:
+            if generation != self._generation:
+                return False
+            self._totals = aggregate
+            self._recounted = time.monotonic()
+            self._recounted_at = self._updated_at = datetime.now()
+            self._bounds_stale = False
+            self.recounts += 1
+            return True
+
+    def set_salary_bounds(self, salary_min, salary_max, generation):
+        with self._lock:
+            if generation != self._generation or self._totals is None:
+                return
+            self._totals.salary_min = salary_min
+            self._totals.salary_max = salary_max
+            self._bounds_stale = False
+
+    def add(self, active, salary, born):
+        with self._lock:
+            self._changed()
+            if self._totals is not None:
+                self._totals.add(active, salary, born)
+
+    def add_rows(self, rows):
+        self.merge(Aggregate.from_rows(rows))
+
+    def merge(self, aggregate):
+        with self._lock:
+            self._changed()
+            if self._totals is not None:
+                self._totals.merge(aggregate)
+
+    def remove(self, active, salary, born):
+        with self._lock:
+            self._changed()
+            if self._totals is not None and self._totals.remove(active, salary, born):
+                self._bounds_stale = True
+
+    def replace(self, old, new):
+        # old and new are (active, salary, born); an unknown old row forces a recount
+        with self._lock:
+            self._changed()
+            if self._totals is None:
+                return
+            if old is None:
+                self._totals = None
+                return
+            if self._totals.remove(*old):
+                self._bounds_stale = True
+            self._totals.add(*new)
+
+    def invalidate(self):
+        with self._lock:
+            self._changed()
+            self._totals = None
+
+    def _changed(self):
+        self._generation += 1
+        self._updated_at = datetime.now()
+        if self._totals is not None:
+            self.incremental_updates += 1
+
+    def snapshot(self):
+        with self._lock:
+            totals = self._totals
+            if totals is None:
+                return None
+            return CustomerSummary(
+                total=totals.count,
+                active=totals.active,
+                inactive=totals.count - totals.active,
+                salary_sum=totals.salary_sum,
+                salary_avg=totals.salary_sum / totals.count if totals.count else None,
+                salary_min=totals.salary_min,
+                salary_max=totals.salary_max,
+                born_years=dict(totals.born_years),
+                updated_at=self._updated_at,
+                recounted_at=self._recounted_at,
+            )
+
+    def stats(self):
+        with self._lock:
+            return {
+                'tracking': self._totals is not None,
+                'recounts': self.recounts,
+                'incremental_updates': self.incremental_updates,
+                'bounds_stale': self._bounds_stale,
+            }
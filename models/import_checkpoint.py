@@ -0,0 +1,229 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import namedtuple
+
+DEFAULT_CHECKPOINT_DIR = os.path.join(os.path.expanduser('~'), '.customer_app', 'import_checkpoints')
+
+HASH_BLOCK_SIZE = 1024 * 1024
+
+# Hashes already computed in this process, keyed by (path, size, mtime)
+_fingerprints = {}
+_fingerprints_lock = threading.Lock()
+
+
+def file_fingerprint(file_path):
+    # SHA-256 of the file contents; a checkpoint only applies to the exact file
+    # it was taken from
+    stat = os.stat(file_path)
+    key = (os.path.abspath(file_path), stat.st_size, stat.st_mtime_ns)
+    with _fingerprints_lock:
+        if key in _fingerprints:
+            return _fingerprints[key]
+
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as file:
+        for block in iter(lambda: file.read(HASH_BLOCK_SIZE), b''):
+            digest.update(block)
+    file_hash = digest.hexdigest()
+
+    with _fingerprints_lock:
+        _fingerprints[key] = file_hash
+    return file_hash
+
+
+# offset is the byte position before which every row is committed; done_after
+# holds the start offsets of chunks past it that were committed out of order
+# (pipeline mode). Resuming needs the same chunk_size so the chunks line up.
+Checkpoint = namedtuple(
+    'Checkpoint',
+    'file_hash file_path chunk_size offset done_after success error skipped'
+)
+
+
+class ImportProgress(namedtuple('ImportProgress', 'success error skipped run_rows '
+                                'start_offset bytes_done bytes_total elapsed')):
+    __slots__ = ()
+
+    # success/error/skipped include earlier runs of a resumed import; run_rows,
+    # start_offset and elapsed describe this run only
+
+    @property
+    def rows(self):
+        return self.success + self.error + self.skipped
+
+    @property
+    def fraction(self):
+        return min(1.0, self.bytes_done / self.bytes_total) if self.bytes_total else 1.0
+
+    @property
+    def rows_per_sec(self):
+        return self.run_rows / self.elapsed if self.elapsed > 0 else 0.0
+
+    @property
+    def eta(self):
+        # Seconds left, extrapolated from this run's bytes/sec; None until known
+        done = self.bytes_done - self.start_offset
+        if done <= 0 or self.elapsed <= 0:
+            return None
+        return max(0, self.bytes_total - self.bytes_done) * self.elapsed / done
+
+
+class CheckpointStore:
+    # One small JSON file per source file hash
+
+    def __init__(self, directory=DEFAULT_CHECKPOINT_DIR):
+        self.directory = directory
+
+    def _path(self, file_hash):
+        return os.path.join(self.directory, f"{file_hash}.json")
+
+    def load(self, file_hash):
+        try:
+            with open(self._path(file_hash), 'r', encoding='utf-8') as file:
+                return Checkpoint(**json.load(file))
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, TypeError) as e:
+            print(f"Error reading import checkpoint: {e}")
+            return None
+
+    def save(self, checkpoint):
+        # Write then rename, so a crash never leaves a half-written checkpoint
+        path = self._path(checkpoint.file_hash)
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(path + '.tmp', 'w', encoding='utf-8') as file:
+                json.dump(checkpoint._asdict(), file)
+            os.replace(path + '.tmp', path)
+        except OSError as e:
+            print(f"Error saving import checkpoint: {e}")
+
+    def clear(self, file_hash):
+        try:
+            os.remove(self._path(file_hash))
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            print(f"Error removing import checkpoint: {e}")
+
+
+class ImportTracker:
+    # Shared by every import method: counts committed chunks, saves a
+    # checkpoint after each one, reports progress and carries the cancel flag.
+    # Chunks are identified by their byte offsets in the source file.
+    # chunk_done may be called from several writer threads.
+
+    def __init__(self, store, file_path, chunk_size, resume=False, progress=None, cancel_event=None):
+        self.store = store
+        self.file_path = file_path
+        self.chunk_size = chunk_size
+        self.progress = progress
+        self.cancel_event = cancel_event
+        self.bytes_total = os.path.getsize(file_path)
+
+        self.success = 0
+        self.error = 0
+        self.skipped = 0
+        self.start_offset = 0
+        self._pending_skips = set()
+
+        self.file_hash = file_fingerprint(file_path) if store else None
+        checkpoint = store.load(self.file_hash) if store and resume else None
+        if checkpoint:
+            self.chunk_size = checkpoint.chunk_size
+            self.start_offset = checkpoint.offset
+            self._pending_skips = set(checkpoint.done_after)
+            self.success = checkpoint.success
+            self.error = checkpoint.error
+            self.skipped = checkpoint.skipped
+        elif store:
+            store.clear(self.file_hash)
+
+        self._lock = threading.Lock()
+        self._watermark = self.start_offset
+        self._finished = {}  # start -> end of chunks committed past the watermark
+        self._gaps = False
+        self._bytes_done = 0
+        self._run_rows = 0
+        self._started = time.monotonic()
+
+    @property
+    def cancelled(self):
+        return self.cancel_event is not None and self.cancel_event.is_set()
+
+    @property
+    def skips_chunks(self):
+        # Resuming a pipeline import that committed chunks out of order
+        return bool(self._pending_skips)
+
+    def already_done(self, start, end):
+        # True for a chunk a previous run committed; it is skipped, not re-read
+        with self._lock:
+            if start not in self._pending_skips:
+                return False
+            self._pending_skips.discard(start)
+            self._mark_done(start, end)
+        return True
+
+    def chunk_done(self, start, end, success, error, skipped=0):
+        with self._lock:
+            self.success += success
+            self.error += error
+            self.skipped += skipped
+            self._run_rows += success + error + skipped
+            self._mark_done(start, end)
+            self._save()
+            progress = self._snapshot()
+        if self.progress:
+            self.progress(progress)
+
+    def chunk_failed(self, count):
+        # A chunk that was not committed; it stays in the checkpoint's gap
+        with self._lock:
+            self.error += count
+            self._gaps = True
+
+    def add_error(self, count=1):
+        # Failures outside any chunk (e.g. the file becoming unreadable)
+        with self._lock:
+            self.error += count
+
+    def finish(self, completed):
+        # A completed import needs no checkpoint; otherwise it stays for resume
+        if completed and not self._gaps and self.store:
+            self.store.clear(self.file_hash)
+
+    def _mark_done(self, start, end):
+        self._bytes_done += end - start
+        self._finished[start] = end
+        while self._watermark in self._finished:
+            self._watermark = self._finished.pop(self._watermark)
+
+    def _save(self):
+        if not self.store:
+            return
+        self.store.save(Checkpoint(
+            file_hash=self.file_hash,
+            file_path=os.path.abspath(self.file_path),
+            chunk_size=self.chunk_size,
+            offset=self._watermark,
+            done_after=sorted(set(self._finished) | self._pending_skips),
+            success=self.success,
+            error=self.error,
+            skipped=self.skipped,
+        ))
+
+    def _snapshot(self):
+        return ImportProgress(
+            success=self.success,
+            error=self.error,
+            skipped=self.skipped,
+            run_rows=self._run_rows,
+            start_offset=self.start_offset,
+            bytes_done=self.start_offset + self._bytes_done,
+            bytes_total=self.bytes_total,
+            elapsed=time.monotonic() - self._started,
+        )
@@ -0,0 +1,7 @@
+# Keyset pagination directions. Kept apart from models.customer so the window
+# can use them without importing the database layer.
+PAGE_FIRST = 'first'
+PAGE_PREV = 'prev'
+PAGE_CURRENT = 'current'
+PAGE_NEXT = 'next'
+PAGE_LAST = 'last'
@@ -0,0 +1,220 @@
+import re
+from collections import namedtuple
+from datetime import date
+
+# Search syntax understood by compile_search:
+#   nik:12345          NIK prefix match
+#   name:budi          name prefix match (nama: works too)
+#   born:1990          birth date range; also 1990-05, 1990-05-17 or 17-05-1990
+#   born<1990-06       comparisons: > >= < <= and = for exact values
+#   salary>5000000     salary range; salary:1000000..2000000 for BETWEEN
+#   active:1           status; accepts 1/0, aktif/tidak, ya/tidak, true/false
+#   budi santoso       free text: names via the FULLTEXT index, digits as NIK
+#                      prefix, dates as birth date
+# Values with spaces can be quoted: name:"budi san"
+
+FIELD_ALIASES = {
+    'idx': 'idx',
+    'id': 'idx',
+    'nik': 'nik',
+    'name': 'name',
+    'nama': 'name',
+    'born': 'born',
+    'lahir': 'born',
+    'active': 'active',
+    'status': 'active',
+    'salary': 'salary',
+    'gaji': 'salary',
+}
+
+ACTIVE_VALUES = {
+    '1': 1, 'aktif': 1, 'active': 1, 'ya': 1, 'yes': 1, 'true': 1, 'y': 1,
+    '0': 0, 'tidak': 0, 'nonaktif': 0, 'inactive': 0, 'no': 0, 'false': 0, 'n': 0,
+}
+
+# InnoDB ignores shorter words in FULLTEXT indexes (innodb_ft_min_token_size)
+FULLTEXT_MIN_WORD = 3
+
+_TOKEN_RE = re.compile(
+    r'(?:(?P<field>[A-Za-z]+)(?P<op>>=|<=|!=|:|=|>|<))?'
+    r'(?:"(?P<quoted>[^"]*)"?|(?P<value>\S+))'
+)
+_FULLTEXT_OPERATORS_RE = re.compile(r'[+\-<>()~*"@]')
+
+
+class SearchQueryError(ValueError):
+    pass
+
+
+def like_condition(search_term, born_text="DATE_FORMAT(born, '%Y-%m-%d')"):
+    # The original substring search over every column; no index can serve it.
+    # born_text renders the birth date as YYYY-MM-DD in the database's dialect.
+    condition = f"""
+        (nik LIKE %s OR name LIKE %s OR
+         {born_text} LIKE %s OR
+         active LIKE %s OR salary LIKE %s)
+    """
+    search_value = f"%{search_term}%"
+    return condition, [search_value] * 5
+
+
+SearchPredicate = namedtuple('SearchPredicate', 'field op value')
+
+
+def parse_search(search_term):
+    # Returns ([SearchPredicate], name_words). Bare digits become NIK prefixes
+    # and bare dates birth dates; op is a comparison operator, 'prefix',
+    # 'range' (half-open [start, end)), 'outside' or 'between' (inclusive)
+    predicates = []
+    words = []
+
+    for match in _TOKEN_RE.finditer(search_term.strip()):
+        field = match.group('field')
+        op = match.group('op')
+        value = match.group('quoted') if match.group('quoted') is not None else match.group('value')
+
+        if field and field.lower() in FIELD_ALIASES:
+            predicates.append(_parse_field(FIELD_ALIASES[field.lower()], op, value))
+        elif field:
+            # Not a known field, so "a:b" is just text
+            words.append(match.group(0).strip('"'))
+        elif value:
+            words.extend(value.split())
+
+    name_words = []
+    for word in words:
+        if word.isdigit():
+            predicates.append(SearchPredicate('nik', 'prefix', word))
+        elif _looks_like_date(word):
+            predicates.append(_parse_field('born', ':', word))
+        else:
+            name_words.append(word)
+    return predicates, name_words
+
+
+def compile_search(search_term, use_fulltext=True):
+    # Returns (condition, params) with every predicate able to use an index
+    predicates, name_words = parse_search(search_term)
+    conditions = []
+    params = []
+
+    for predicate in predicates:
+        condition, condition_params = _predicate_sql(*predicate)
+        conditions.append(condition)
+        params.extend(condition_params)
+
+    if name_words:
+        condition, condition_params = _name_text_condition(name_words, use_fulltext)
+        conditions.append(condition)
+        params.extend(condition_params)
+
+    if not conditions:
+        return "", []
+    return "(" + " AND ".join(conditions) + ")", params
+
+
+def escape_like(value):
+    return value.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+
+def _parse_field(field, op, value):
+    if value == "":
+        raise SearchQueryError(f"missing value for {field}")
+
+    if field in ('nik', 'name'):
+        return SearchPredicate(field, 'prefix' if op == ':' else op, value)
+
+    if field == 'born':
+        start, end = _parse_date_range(value)
+        if op in (':', '='):
+            return SearchPredicate('born', 'range', (start, end))
+        if op == '!=':
+            return SearchPredicate('born', 'outside', (start, end))
+        return {
+            '>': SearchPredicate('born', '>=', end),
+            '>=': SearchPredicate('born', '>=', start),
+            '<': SearchPredicate('born', '<', start),
+            '<=': SearchPredicate('born', '<', end),
+        }[op]
+
+    if field == 'active':
+        try:
+            return SearchPredicate('active', '=' if op == ':' else op, ACTIVE_VALUES[value.lower()])
+        except KeyError:
+            raise SearchQueryError(f"invalid status: {value}") from None
+
+    # idx and salary are integers; salary may be written as 5.000.000 or Rp5,000,000
+    if '..' in value and op == ':':
+        low, high = value.split('..', 1)
+        return SearchPredicate(field, 'between', (_parse_int(low), _parse_int(high)))
+    return SearchPredicate(field, '=' if op == ':' else op, _parse_int(value))
+
+
+def _predicate_sql(field, op, value):
+    if op == 'prefix':
+        return f"{field} LIKE %s", [f"{escape_like(value)}%"]
+    if op == 'range':
+        return f"{field} >= %s AND {field} < %s", list(value)
+    if op == 'outside':
+        return f"({field} < %s OR {field} >= %s)", list(value)
+    if op == 'between':
+        return f"{field} BETWEEN %s AND %s", list(value)
+    return f"{field} {op} %s", [value]
+
+
+def _name_text_condition(words, use_fulltext):
+    conditions = []
+    params = []
+    fulltext_terms = []
+
+    for word in words:
+        cleaned = _FULLTEXT_OPERATORS_RE.sub('', word)
+        if use_fulltext and len(cleaned) >= FULLTEXT_MIN_WORD:
+            fulltext_terms.append(f"+{cleaned}*")
+        elif use_fulltext:
+            conditions.append("name LIKE %s")
+            params.append(f"{escape_like(word)}%")
+        else:
+            conditions.append("name LIKE %s")
+            params.append(f"%{escape_like(word)}%")
+
+    if fulltext_terms:
+        conditions.insert(0, "MATCH(name) AGAINST (%s IN BOOLEAN MODE)")
+        params.insert(0, " ".join(fulltext_terms))
+    return " AND ".join(conditions), params
+
+
+def _parse_int(value):
+    digits = re.sub(r'^rp|[.,_\s]', '', value.strip().lower())
+    if not digits.isdigit():
+        raise SearchQueryError(f"invalid number: {value}")
+    return int(digits)
+
+
+def _looks_like_date(value):
+    return bool(re.fullmatch(r'\d{4}-\d{2}(-\d{2})?|\d{2}-\d{2}-\d{4}', value))
+
+
+def _parse_date_range(value):
+    # Returns the half-open [start, end) range covered by a year, month or day
+    try:
+        if re.fullmatch(r'\d{4}', value):
+            year = int(value)
+            return date(year, 1, 1), date(year + 1, 1, 1)
+        if re.fullmatch(r'\d{4}-\d{1,2}', value):
+            year, month = map(int, value.split('-'))
+            start = date(year, month, 1)
+            end = date(year + 1, 1, 1) if month == 12 else date(year, month + 1, 1)
+            return start, end
+        if re.fullmatch(r'\d{4}-\d{1,2}-\d{1,2}', value):
+            start = date(*map(int, value.split('-')))
+        elif re.fullmatch(r'\d{1,2}-\d{1,2}-\d{4}', value):
+            day, month, year = map(int, value.split('-'))
+            start = date(year, month, day)
+        else:
+            raise SearchQueryError(f"invalid date: {value}")
+        return start, date.fromordinal(start.toordinal() + 1)
+    except ValueError as e:
+        if isinstance(e, SearchQueryError):
+            raise
+        raise SearchQueryError(f"invalid date: {value}") from None
@@ -0,0 +1,84 @@
+import threading
+import weakref
+from collections import OrderedDict
+
+
+class StatementCache:
+    # Prepared cursors kept per pooled connection and reused across calls, so
+    # the server parses each hot statement once per connection instead of on
+    # every execute. A reconnect hands out a new connection object, which
+    # starts with an empty cache; entries for closed connections go away with
+    # the connection.
+
+    def __init__(self, prepare, max_per_connection=32):
+        self._prepare = prepare  # connection -> new prepared cursor
+        self.max_per_connection = max_per_connection
+
+        self._connections = weakref.WeakKeyDictionary()  # connection -> OrderedDict(statement -> cursor)
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def execute(self, connection, statement, params=()):
+        # Returns the cursor holding the result; it stays owned by the cache,
+        # so fetch everything from it and do not close it
+        cursor = self._cursor(connection, statement)
+        try:
+            cursor.execute(statement, params)
+        except Exception:
+            self.discard(connection, statement)
+            raise
+        return cursor
+
+    def _cursor(self, connection, statement):
+        # A pooled connection is only used by one thread at a time, so its own
+        # cursor map needs no lock; the shared map and counters do
+        with self._lock:
+            cursors = self._connections.get(connection)
+            if cursors is None:
+                cursors = self._connections[connection] = OrderedDict()
+            cursor = cursors.get(statement)
+            if cursor is not None:
+                self.hits += 1
+                cursors.move_to_end(statement)
+                return cursor
+            self.misses += 1
+
+        cursor = self._prepare(connection)
+        cursors[statement] = cursor
+        while len(cursors) > self.max_per_connection:
+            _, evicted = cursors.popitem(last=False)
+            self._close_quietly(evicted)
+            with self._lock:
+                self.evictions += 1
+        return cursor
+
+    def discard(self, connection, statement):
+        # After an error the prepared statement may be gone with the session
+        with self._lock:
+            cursors = self._connections.get(connection)
+        if cursors is not None:
+            cursor = cursors.pop(statement, None)
+            if cursor is not None:
+                self._close_quietly(cursor)
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'connections': len(self._connections),
+                'statements': sum(len(cursors) for cursors in self._connections.values()),
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'evictions': self.evictions,
+            }
+
+    @staticmethod
+    def _close_quietly(cursor):
+        try:
+            cursor.close()
+        except Exception:
+            pass
@@ -0,0 +1,84 @@
+import os
+import sqlite3
+import tempfile
+import unittest
+from datetime import date
+
+from config.backends import SQLiteBackend, SQLiteConnection
+from models.customer_record import CUSTOMER_SELECT, CustomerRecord
+from models.customer_snapshot import SNAPSHOT_AVAILABLE, CustomerSnapshot
+from models.search_query import like_condition
+
+ROWS = [
+    ('123456', 'Budi Santoso', date(1990, 5, 17), 1, 5000000),
+    ('234567', 'Ani Lestari', date(1985, 12, 1), 0, 7250000),
+    ('345678', 'Citra Dewi', None, 1, 4500000),
+    ('990501', 'Dedi Kurniawan', date(2001, 1, 30), 0, 15000),
+    ('456789', 'Eka Saputra', date(1990, 11, 5), 1, 0),
+    ('567890', 'Fajar 1990', date(1975, 5, 9), 0, 123456),
+]
+
+# Terms only the born, active or salary text matches, and some that match
+# NIK or name too
+TERMS = ['1990-05', '1990', '5000', '-0', '-1', '0', '1', '99', '2001-01-30', '05-0', 'ani', 'Saputra', 'x']
+
+
+@unittest.skipUnless(SNAPSHOT_AVAILABLE, "snapshot mode needs NumPy")
+class SnapshotLikeSearchTest(unittest.TestCase):
+    # Snapshot mode's substring search has to find the rows like_condition
+    # finds in the database, or turning on "Mode memori" changes the results
+
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(os.rmdir, directory)
+        path = os.path.join(directory, 'customers.db')
+        self.addCleanup(os.remove, path)
+
+        self.backend = SQLiteBackend()
+        self.connection = sqlite3.connect(path, detect_types=sqlite3.PARSE_DECLTYPES,
+                                          factory=SQLiteConnection)
+        self.addCleanup(self.connection.close)
+        self.connection.execute(self.backend.customer_table)
+        self.connection.executemany(
+            "INSERT INTO customer (nik, name, born, active, salary) VALUES (?, ?, ?, ?, ?)", ROWS
+        )
+        self.connection.commit()
+
+        cursor = self.connection.cursor()
+        cursor.execute(f"SELECT {CUSTOMER_SELECT} FROM customer ORDER BY idx")
+        records = [CustomerRecord._make(row) for row in cursor.fetchall()]
+
+        self.snapshot = CustomerSnapshot()
+        self.snapshot.enabled = True
+        self.assertTrue(self.snapshot.load(records, self.snapshot.generation))
+
+    def database_idxs(self, term):
+        condition, params = like_condition(term, self.backend.born_text)
+        cursor = self.connection.cursor()
+        cursor.execute(f"SELECT idx FROM customer WHERE {condition} ORDER BY idx", params)
+        return [row[0] for row in cursor.fetchall()]
+
+    def snapshot_idxs(self, term):
+        records, total = self.snapshot.rows(0, len(ROWS), term, like=True)
+        self.assertEqual(total, len(records))
+        return [record.idx for record in records]
+
+    def test_matches_like_condition(self):
+        for term in TERMS:
+            with self.subTest(term=term):
+                self.assertEqual(self.snapshot_idxs(term), self.database_idxs(term))
+
+    def test_matches_after_writes(self):
+        self.snapshot.apply([CustomerRecord(3, '345678', 'Citra Dewi', date(1990, 5, 1), 0, 5000)])
+        self.snapshot.apply(deleted=[1])
+        self.connection.execute(
+            "UPDATE customer SET born = ?, active = ?, salary = ? WHERE idx = ?", (date(1990, 5, 1), 0, 5000, 3)
+        )
+        self.connection.execute("DELETE FROM customer WHERE idx = ?", (1,))
+        for term in TERMS:
+            with self.subTest(term=term):
+                self.assertEqual(self.snapshot_idxs(term), self.database_idxs(term))
+
+
+if __name__ == '__main__':
+    unittest.main()
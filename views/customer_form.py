@@ -113,14 +113,14 @@ class CustomerForm(QDialog):
     
     def populate_form(self):
         if self.customer_data:
-            self.nik_edit.setText(self.customer_data['nik'])
-            self.name_edit.setText(self.customer_data['name'])
+            self.nik_edit.setText(self.customer_data.nik)
+            self.name_edit.setText(self.customer_data.name)
             
-            if self.customer_data['born']:
-                self.born_edit.setDate(QDate.fromString(str(self.customer_data['born']), "yyyy-MM-dd"))
+            if self.customer_data.born:
+                self.born_edit.setDate(QDate.fromString(str(self.customer_data.born), "yyyy-MM-dd"))
             
-            self.active_combo.setCurrentIndex(self.customer_data['active'])
-            self.salary_spin.setValue(self.customer_data['salary'] or 0)
+            self.active_combo.setCurrentIndex(self.customer_data.active)
+            self.salary_spin.setValue(self.customer_data.salary or 0)
     
     def save_customer(self):
         nik = self.nik_edit.text().strip()
@@ -133,13 +133,20 @@ class CustomerForm(QDialog):
             self.controller.show_error_message("NIK dan Nama harus diisi!")
             return
         
+        # Saving runs in the background; the dialog closes once it succeeded
+        self.save_button.setEnabled(False)
         if self.customer_data:  # Edit mode
-            success = self.controller.update_customer(
-                self.customer_data['idx'], nik, name, born, active, salary
+            self.controller.update_customer(
+                self.customer_data.idx, nik, name, born, active, salary,
+                on_done=self.on_save_finished
             )
         else:  # Add mode
-            success = self.controller.create_customer(nik, name, born, active, salary)
-        
+            self.controller.create_customer(
+                nik, name, born, active, salary, on_done=self.on_save_finished
+            )
+    
+    def on_save_finished(self, success):
+        self.save_button.setEnabled(True)
         if success:
             self.data_saved.emit()
-            self.accept()
\ No newline at end of file
+            self.accept()
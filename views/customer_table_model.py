@@ -0,0 +1,118 @@
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex
+
+HEADERS = ["ID", "NIK", "Nama", "Tanggal Lahir", "Status", "Gaji"]
+
+
+def format_cell(customer, column):
+    if column == 0:
+        return str(customer.idx)
+    if column == 1:
+        return customer.nik
+    if column == 2:
+        return customer.name
+    if column == 3:
+        return customer.born.strftime('%d-%m-%Y') if customer.born else ''
+    if column == 4:
+        return "Aktif" if customer.active else "Tidak Aktif"
+    return f"Rp {customer.salary:,}" if customer.salary else "Rp 0"
+
+
+class CustomerTableModel(QAbstractTableModel):
+    # Holds the raw rows and formats a cell only when the view paints it.
+    # With a fetcher set, the view pulls further rows on demand through
+    # canFetchMore/fetchMore (infinite scroll).
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._rows = []
+        self._fetcher = None
+        self._exhausted = True
+        self._fetching = False
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(HEADERS)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        if role == Qt.ItemDataRole.DisplayRole:
+            return format_cell(self._rows[index.row()], index.column())
+        if role == Qt.ItemDataRole.TextAlignmentRole and index.column() in (0, 5):
+            return Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter
+        return None
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return HEADERS[section]
+        return super().headerData(section, orientation, role)
+
+    def customer_at(self, row):
+        if 0 <= row < len(self._rows):
+            return self._rows[row]
+        return None
+
+    @property
+    def rows(self):
+        return self._rows
+
+    def set_rows(self, rows):
+        self.beginResetModel()
+        self._rows = list(rows)
+        self.endResetModel()
+
+    def append_rows(self, rows):
+        if not rows:
+            return
+        first = len(self._rows)
+        self.beginInsertRows(QModelIndex(), first, first + len(rows) - 1)
+        self._rows.extend(rows)
+        self.endInsertRows()
+
+    def row_of(self, idx):
+        for row, customer in enumerate(self._rows):
+            if customer.idx == idx:
+                return row
+        return -1
+
+    def replace_row(self, row, customer):
+        self._rows[row] = customer
+        self.dataChanged.emit(self.index(row, 0), self.index(row, len(HEADERS) - 1))
+
+    def remove_row(self, row):
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self._rows[row]
+        self.endRemoveRows()
+
+    # Infinite scroll
+
+    @property
+    def exhausted(self):
+        return self._exhausted
+
+    def set_fetcher(self, fetcher):
+        # fetcher(after_idx) starts loading the rows after after_idx (None for
+        # the first batch) and reports back through add_batch()
+        self._fetcher = fetcher
+        self._exhausted = fetcher is None
+        self._fetching = False
+        self.set_rows([])
+
+    def canFetchMore(self, parent=QModelIndex()):
+        if parent.isValid() or self._fetcher is None:
+            return False
+        return not self._exhausted and not self._fetching
+
+    def fetchMore(self, parent=QModelIndex()):
+        if not self.canFetchMore(parent):
+            return
+        self._fetching = True
+        after_idx = self._rows[-1].idx if self._rows else None
+        self._fetcher(after_idx)
+
+    def add_batch(self, rows, exhausted):
+        self._fetching = False
+        self._exhausted = exhausted
+        self.append_rows(rows)
@@ -0,0 +1,112 @@
+from PyQt6.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QTableWidget,
+    QTableWidgetItem, QHeaderView
+)
+from PyQt6.QtCore import Qt, QTimer
+from config.instrumentation import ROWS, instrumentation
+
+HEADERS = ["Operasi", "Jumlah", "p50", "p95", "p99", "Maks", "Total"]
+
+# How often the open panel re-reads the histograms
+REFRESH_INTERVAL_MS = 1000
+
+
+def format_value(value, unit):
+    if value is None:
+        return "-"
+    if unit == ROWS:
+        return f"{value:,.0f}"
+    if value >= 1:
+        return f"{value:.2f} s"
+    return f"{value * 1000:.2f} ms"
+
+
+class DiagnosticsPanel(QDialog):
+    # Hidden panel (Ctrl+Shift+D) with p50/p95/p99 per instrumented operation
+    # and the connection pool and query cache counters
+
+    def __init__(self, stats_source=None, parent=None):
+        super().__init__(parent)
+        self.stats_source = stats_source  # callable returning {label: stats dict}
+        self.setWindowTitle("Diagnostik")
+        self.resize(760, 520)
+
+        layout = QVBoxLayout()
+
+        self.table = QTableWidget(0, len(HEADERS))
+        self.table.setHorizontalHeaderLabels(HEADERS)
+        self.table.verticalHeader().setVisible(False)
+        self.table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        layout.addWidget(self.table)
+
+        self.stats_label = QLabel()
+        self.stats_label.setWordWrap(True)
+        self.stats_label.setTextInteractionFlags(Qt.TextInteractionFlag.TextSelectableByMouse)
+        layout.addWidget(self.stats_label)
+
+        slow_log = instrumentation.slow_log
+        self.slow_log_label = QLabel(
+            f"Log query lambat (>= {slow_log.threshold * 1000:.0f} ms): {slow_log.path}"
+            if slow_log else "Log query lambat: nonaktif"
+        )
+        self.slow_log_label.setTextInteractionFlags(Qt.TextInteractionFlag.TextSelectableByMouse)
+        layout.addWidget(self.slow_log_label)
+
+        button_layout = QHBoxLayout()
+        button_layout.addStretch()
+        reset_button = QPushButton("Reset")
+        reset_button.clicked.connect(self.reset)
+        button_layout.addWidget(reset_button)
+        close_button = QPushButton("Tutup")
+        close_button.clicked.connect(self.close)
+        button_layout.addWidget(close_button)
+        layout.addLayout(button_layout)
+
+        self.setLayout(layout)
+
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.timeout.connect(self.refresh)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.refresh()
+        self.refresh_timer.start(REFRESH_INTERVAL_MS)
+
+    def hideEvent(self, event):
+        self.refresh_timer.stop()
+        super().hideEvent(event)
+
+    def refresh(self):
+        snapshot = instrumentation.snapshot()
+        self.table.setRowCount(len(snapshot))
+        for row, (name, summary) in enumerate(snapshot.items()):
+            unit = summary['unit']
+            values = [
+                name,
+                f"{summary['count']:,}",
+                format_value(summary['p50'], unit),
+                format_value(summary['p95'], unit),
+                format_value(summary['p99'], unit),
+                format_value(summary['max'], unit),
+                format_value(summary['total'], unit),
+            ]
+            for column, value in enumerate(values):
+                item = QTableWidgetItem(value)
+                if column:
+                    item.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+                self.table.setItem(row, column, item)
+
+        if self.stats_source:
+            lines = []
+            for label, stats in self.stats_source().items():
+                values = ", ".join(
+                    f"{key}={value:.3f}" if isinstance(value, float) else f"{key}={value}"
+                    for key, value in stats.items()
+                )
+                lines.append(f"{label}: {values}")
+            self.stats_label.setText("\n".join(lines))
+
+    def reset(self):
+        instrumentation.reset()
+        self.refresh()
@@ -0,0 +1,105 @@
+from PyQt6.QtWidgets import QDialog, QVBoxLayout, QHBoxLayout, QLabel, QProgressBar, QPushButton
+from PyQt6.QtCore import Qt, pyqtSignal
+from PyQt6.QtGui import QFont
+
+
+def format_duration(seconds):
+    if seconds is None:
+        return "-"
+    seconds = int(round(seconds))
+    hours, rest = divmod(seconds, 3600)
+    minutes, seconds = divmod(rest, 60)
+    if hours:
+        return f"{hours}:{minutes:02d}:{seconds:02d}"
+    return f"{minutes:02d}:{seconds:02d}"
+
+
+class ImportProgressDialog(QDialog):
+    # Shows ImportProgress updates; Batal asks the import to stop after the
+    # chunk it is writing
+    cancel_requested = pyqtSignal()
+
+    def __init__(self, file_name, resumed=False, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Import CSV")
+        self.setModal(True)
+        self.setMinimumWidth(420)
+        # Closing the window must go through Batal
+        self.setWindowFlag(Qt.WindowType.WindowCloseButtonHint, False)
+        self.setStyleSheet("""
+            QDialog {
+                background-color: #f5f5f5;
+            }
+            QLabel {
+                color: #333;
+            }
+            QProgressBar {
+                border: 1px solid #ddd;
+                border-radius: 5px;
+                text-align: center;
+                height: 20px;
+            }
+            QProgressBar::chunk {
+                background-color: #4CAF50;
+            }
+            QPushButton {
+                background-color: #f44336;
+                color: white;
+                border: none;
+                padding: 10px 20px;
+                border-radius: 5px;
+                font-weight: bold;
+            }
+            QPushButton:hover {
+                background-color: #da190b;
+            }
+            QPushButton:disabled {
+                background-color: #bbb;
+            }
+        """)
+
+        layout = QVBoxLayout()
+
+        title = QLabel(("Melanjutkan import " if resumed else "Mengimpor ") + file_name)
+        title.setFont(QFont("Arial", 12, QFont.Weight.Bold))
+        layout.addWidget(title)
+
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setRange(0, 1000)
+        self.progress_bar.setFormat("%p%")
+        layout.addWidget(self.progress_bar)
+
+        self.rows_label = QLabel("Baris: 0")
+        self.rate_label = QLabel("Kecepatan: -")
+        self.eta_label = QLabel("Sisa waktu: -")
+        layout.addWidget(self.rows_label)
+        layout.addWidget(self.rate_label)
+        layout.addWidget(self.eta_label)
+
+        button_layout = QHBoxLayout()
+        button_layout.addStretch()
+        self.cancel_button = QPushButton("Batal")
+        self.cancel_button.clicked.connect(self.request_cancel)
+        button_layout.addWidget(self.cancel_button)
+        layout.addLayout(button_layout)
+
+        self.setLayout(layout)
+
+    def update_progress(self, progress):
+        self.progress_bar.setValue(int(progress.fraction * 1000))
+        self.rows_label.setText(
+            f"Baris: {progress.rows:,} (berhasil {progress.success:,}, "
+            f"gagal {progress.error:,}, dilewati {progress.skipped:,})"
+        )
+        self.rate_label.setText(f"Kecepatan: {progress.rows_per_sec:,.0f} baris/detik")
+        self.eta_label.setText(f"Sisa waktu: {format_duration(progress.eta)}")
+
+    def request_cancel(self):
+        self.cancel_button.setEnabled(False)
+        self.cancel_button.setText("Membatalkan...")
+        self.cancel_requested.emit()
+
+    def reject(self):
+        # Esc behaves like Batal instead of hiding a running import
+        if self.cancel_button.isEnabled():
+            self.request_cancel()
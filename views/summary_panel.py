@@ -0,0 +1,100 @@
+from PyQt6.QtWidgets import QWidget, QVBoxLayout, QGridLayout, QLabel, QProgressBar
+from PyQt6.QtGui import QFont
+from models.customer_summary import age_bands
+
+
+def format_rupiah(value):
+    if value is None:
+        return "-"
+    return f"Rp {round(value):,}"
+
+
+class SummaryPanel(QWidget):
+    # Totals and an age histogram from a CustomerSummary; show_summary is
+    # fed by the controller, which reads the model's running totals
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setMinimumWidth(280)
+        self.setStyleSheet("""
+            QProgressBar {
+                border: 1px solid #ddd;
+                border-radius: 3px;
+                text-align: center;
+                height: 14px;
+            }
+            QProgressBar::chunk {
+                background-color: #2196f3;
+            }
+        """)
+
+        layout = QVBoxLayout(self)
+
+        totals_title = QLabel("Pelanggan")
+        totals_title.setFont(QFont("Arial", 11, QFont.Weight.Bold))
+        layout.addWidget(totals_title)
+
+        totals = QGridLayout()
+        self.value_labels = {}
+        for row, (key, text) in enumerate([
+            ('total', "Total"),
+            ('active', "Aktif"),
+            ('inactive', "Tidak aktif"),
+            ('salary_sum', "Total gaji"),
+            ('salary_avg', "Rata-rata gaji"),
+            ('salary_min', "Gaji terendah"),
+            ('salary_max', "Gaji tertinggi"),
+        ]):
+            totals.addWidget(QLabel(text), row, 0)
+            value = QLabel("-")
+            totals.addWidget(value, row, 1)
+            self.value_labels[key] = value
+        layout.addLayout(totals)
+
+        ages_title = QLabel("Kelompok umur")
+        ages_title.setFont(QFont("Arial", 11, QFont.Weight.Bold))
+        layout.addWidget(ages_title)
+
+        self.age_grid = QGridLayout()
+        self.age_rows = {}
+        layout.addLayout(self.age_grid)
+
+        self.updated_label = QLabel("Memuat ringkasan...")
+        self.updated_label.setWordWrap(True)
+        self.updated_label.setStyleSheet("font-weight: normal; color: #666;")
+        layout.addWidget(self.updated_label)
+        layout.addStretch()
+
+    def show_summary(self, summary):
+        if summary is None:
+            self.updated_label.setText("Ringkasan tidak tersedia")
+            return
+
+        self.value_labels['total'].setText(f"{summary.total:,}")
+        self.value_labels['active'].setText(f"{summary.active:,}")
+        self.value_labels['inactive'].setText(f"{summary.inactive:,}")
+        self.value_labels['salary_sum'].setText(format_rupiah(summary.salary_sum))
+        self.value_labels['salary_avg'].setText(format_rupiah(summary.salary_avg))
+        self.value_labels['salary_min'].setText(format_rupiah(summary.salary_min))
+        self.value_labels['salary_max'].setText(format_rupiah(summary.salary_max))
+
+        bands = age_bands(summary.born_years)
+        largest = max([count for _, count in bands] + [1])
+        for row, (label, count) in enumerate(bands):
+            if label not in self.age_rows:
+                bar = QProgressBar()
+                bar.setTextVisible(False)
+                count_label = QLabel()
+                self.age_grid.addWidget(QLabel(label), row, 0)
+                self.age_grid.addWidget(bar, row, 1)
+                self.age_grid.addWidget(count_label, row, 2)
+                self.age_rows[label] = (bar, count_label)
+            bar, count_label = self.age_rows[label]
+            bar.setRange(0, largest)
+            bar.setValue(count)
+            count_label.setText(f"{count:,}")
+
+        self.updated_label.setText(
+            f"Diperbarui {summary.updated_at:%H:%M:%S}, "
+            f"dihitung ulang penuh {summary.recounted_at:%H:%M:%S}"
+        )